@@ -6,6 +6,7 @@ due to configuration issues but can still be run manually via duty tasks.
 
 from __future__ import annotations
 
+import json
 import re
 from pathlib import Path
 
@@ -31,11 +32,18 @@ def get_supported_python_versions() -> list[str]:
     return versions if versions else ["3.10", "3.11", "3.12", "3.13"]
 
 
+def get_project_version() -> str:
+    """Extract the project version from pyproject.toml."""
+    match = re.search(r'^version = "([^"]+)"', (PROJECT_ROOT / "pyproject.toml").read_text(), re.MULTILINE)
+    return match.group(1) if match else "unknown"
+
+
 # Project paths
 PROJECT_ROOT = Path(__file__).parent
 SRC_PATH = PROJECT_ROOT / "src"
 TESTS_PATH = PROJECT_ROOT / "tests"
 DOCS_PATH = PROJECT_ROOT / "docs"
+BENCHMARKS_PATH = PROJECT_ROOT / ".benchmarks"
 
 
 @duty
@@ -210,15 +218,52 @@ def profile(ctx) -> None:
 
 
 @duty
-def benchmark(ctx) -> None:
-    """Run benchmarks if available."""
-    benchmark_files = list(TESTS_PATH.glob("**/bench_*.py"))
+def benchmark(ctx, output: str = "") -> None:
+    """Run benchmarks if available and save their measurements as JSON.
+
+    Args:
+        ctx: The duty context.
+        output: File for the measurements (default: ``.benchmarks/<version>.json``).
+    """
+    benchmark_files = sorted(TESTS_PATH.glob("**/bench_*.py"))
     if benchmark_files:
-        ctx.run("uv run pytest -v -k bench", title="Running benchmarks")
+        # bench_*.py files are not collected by a plain pytest run, so pass them explicitly.
+        files = " ".join(str(path.relative_to(PROJECT_ROOT)) for path in benchmark_files)
+        output = output or str(BENCHMARKS_PATH / f"{get_project_version()}.json")
+        ctx.run(f"uv run pytest -v -s {files} --bench-json {output}", title="Running benchmarks")
+        print(f"Benchmark results written to {output}")
     else:
         print("No benchmark files found (bench_*.py in tests/).")
 
 
+@duty
+def benchmark_compare(ctx, baseline: str, current: str) -> None:
+    """Compare the measurements of two benchmark runs.
+
+    Args:
+        ctx: The duty context.
+        baseline: Results file of the reference run.
+        current: Results file of the run to compare with it.
+    """
+    reports = [json.loads(Path(path).read_text(encoding="utf-8")) for path in (baseline, current)]
+    measurements = [
+        {
+            r["name"] + "[" + ",".join(f"{k}={v}" for k, v in sorted(r["params"].items())) + "]": r["metrics"]
+            for r in report["results"]
+        }
+        for report in reports
+    ]
+    print(f"{'benchmark':<60} {'metric':<24} {reports[0]['version']:>12} {reports[1]['version']:>12} {'change':>8}")
+    for key, before in measurements[0].items():
+        after = measurements[1].get(key)
+        if after is None:
+            continue
+        for metric, value in before.items():
+            if metric in after:
+                change = f"{(after[metric] - value) / value:+.1%}" if value else "n/a"
+                print(f"{key:<60} {metric:<24} {value:>12.4g} {after[metric]:>12.4g} {change:>8}")
+
+
 @duty
 def init_project(ctx) -> None:
     """Initialize project with pre-commit hooks and dev dependencies."""
@@ -1,39 +1,156 @@
-"""A modular Python client library for accessing Semantic MediaWiki (SMW) API endpoints."""
+"""A modular Python client library for accessing Semantic MediaWiki (SMW) API endpoints.
 
-import importlib.metadata
-from typing import Any
+The public names are loaded on first access (PEP 562), so ``import smw_reader``
+stays cheap: the HTTP stack, asyncio, sqlite3 and the optional dependencies
+are imported only by the parts of the library that are actually used.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
 
-from .client import SMWClient
-from .endpoints import AskEndpoint
-from .endpoints.query import QueryBuilder
 from .exceptions import (
     SMWAPIError,
     SMWAuthenticationError,
     SMWConnectionError,
+    SMWResultLimitWarning,
     SMWServerError,
     SMWValidationError,
 )
-from .http_client import RequestsHTTPClient
-from .interfaces import APIEndpoint, HTTPClient
+
+if TYPE_CHECKING:
+    from .async_client import AsyncSMWClient
+    from .async_http_client import AiohttpHTTPClient, HttpxHTTPClient
+    from .cache import CacheStats, MemoryCache, SQLiteCache
+    from .client import SMWClient
+    from .connection_pool import ConnectionPool
+    from .endpoints import AskEndpoint, AsyncAskEndpoint, QueryOutcome
+    from .endpoints.query import QueryBuilder, QueryTemplate
+    from .http_client import PooledHTTPClient, RequestsHTTPClient
+    from .interfaces import (
+        APIEndpoint,
+        AsyncAPIEndpoint,
+        AsyncHTTPClient,
+        ConditionalResponse,
+        ExportSink,
+        HTTPClient,
+        RateLimiter,
+        RequestObserver,
+        ResponseCache,
+    )
+    from .metrics import Histogram, MetricsRecorder, RequestEvent
+    from .mirror import SQLiteMirror, SyncStats
+    from .rate_limit import AdaptiveRateLimiter, RateLimitStats
+    from .results import DateValue, PageValue, QuantityValue, ResultRow, ResultSet
+    from .retry import RetryPolicy
+
+_LAZY_ATTRIBUTES = {
+    "AsyncSMWClient": ".async_client",
+    "AiohttpHTTPClient": ".async_http_client",
+    "HttpxHTTPClient": ".async_http_client",
+    "CacheStats": ".cache",
+    "MemoryCache": ".cache",
+    "SQLiteCache": ".cache",
+    "SMWClient": ".client",
+    "ConnectionPool": ".connection_pool",
+    "AskEndpoint": ".endpoints",
+    "AsyncAskEndpoint": ".endpoints",
+    "QueryOutcome": ".endpoints",
+    "QueryBuilder": ".endpoints.query",
+    "QueryTemplate": ".endpoints.query",
+    "PooledHTTPClient": ".http_client",
+    "RequestsHTTPClient": ".http_client",
+    "APIEndpoint": ".interfaces",
+    "AsyncAPIEndpoint": ".interfaces",
+    "AsyncHTTPClient": ".interfaces",
+    "ConditionalResponse": ".interfaces",
+    "ExportSink": ".interfaces",
+    "HTTPClient": ".interfaces",
+    "RateLimiter": ".interfaces",
+    "RequestObserver": ".interfaces",
+    "ResponseCache": ".interfaces",
+    "Histogram": ".metrics",
+    "MetricsRecorder": ".metrics",
+    "RequestEvent": ".metrics",
+    "SQLiteMirror": ".mirror",
+    "SyncStats": ".mirror",
+    "AdaptiveRateLimiter": ".rate_limit",
+    "RateLimitStats": ".rate_limit",
+    "DateValue": ".results",
+    "PageValue": ".results",
+    "QuantityValue": ".results",
+    "ResultRow": ".results",
+    "ResultSet": ".results",
+    "RetryPolicy": ".retry",
+}
+"""Public names mapped to the submodules defining them."""
 
 __all__ = [
     "SMWClient",
     "AskEndpoint",
+    "QueryOutcome",
     "QueryBuilder",
+    "QueryTemplate",
     "SMWAPIError",
     "SMWConnectionError",
     "SMWAuthenticationError",
     "SMWValidationError",
     "SMWServerError",
+    "SMWResultLimitWarning",
     "APIEndpoint",
     "HTTPClient",
+    "ConditionalResponse",
     "RequestsHTTPClient",
+    "PooledHTTPClient",
+    "ConnectionPool",
+    "AsyncSMWClient",
+    "AsyncAskEndpoint",
+    "AsyncAPIEndpoint",
+    "AsyncHTTPClient",
+    "AiohttpHTTPClient",
+    "HttpxHTTPClient",
+    "ResponseCache",
+    "MemoryCache",
+    "SQLiteCache",
+    "CacheStats",
+    "ExportSink",
+    "RateLimiter",
+    "AdaptiveRateLimiter",
+    "RateLimitStats",
+    "RetryPolicy",
+    "RequestObserver",
+    "RequestEvent",
+    "MetricsRecorder",
+    "Histogram",
+    "ResultSet",
+    "ResultRow",
+    "PageValue",
+    "DateValue",
+    "QuantityValue",
+    "SQLiteMirror",
+    "SyncStats",
 ]
 
-__version__ = importlib.metadata.version("smw-reader")
 
+def __getattr__(name: str) -> Any:
+    """Import a public name, or the package version, on first access."""
+    if name == "__version__":
+        from importlib.metadata import version
+
+        value: Any = version("smw-reader")
+    elif name in _LAZY_ATTRIBUTES:
+        value = getattr(import_module(_LAZY_ATTRIBUTES[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
 
-def create_client(base_url: str, **kwargs: Any) -> SMWClient:
+
+def __dir__() -> list[str]:
+    """List the module's attributes, including those not loaded yet."""
+    return sorted({*globals(), *__all__, "__version__"})
+
+
+def create_client(base_url: str, **kwargs: Any) -> "SMWClient":
     """Create a configured SMW client with common endpoints.
 
     Args:
@@ -43,6 +160,9 @@ def create_client(base_url: str, **kwargs: Any) -> SMWClient:
     Returns:
         Configured SMWClient instance with Ask endpoint registered.
     """
+    from .client import SMWClient
+    from .endpoints import AskEndpoint
+
     client = SMWClient(base_url, **kwargs)
 
     # Register common endpoints
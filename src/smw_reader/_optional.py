@@ -0,0 +1,43 @@
+"""Helpers for optional third-party dependencies."""
+
+from __future__ import annotations
+
+import importlib
+from types import ModuleType
+
+
+def optional_module(*names: str) -> ModuleType | None:
+    """Import the first available module from a list of alternatives.
+
+    Args:
+        *names: Fully qualified module names, in order of preference.
+
+    Returns:
+        The imported module, or None if none of them is installed.
+    """
+    for name in names:
+        try:
+            return importlib.import_module(name)
+        except ImportError:
+            continue
+    return None
+
+
+def require_module(name: str, extra: str, feature: str) -> ModuleType:
+    """Import an optional dependency or explain how to install it.
+
+    Args:
+        name: Fully qualified module name.
+        extra: The package extra that installs the module.
+        feature: What the module is needed for, used in the error message.
+
+    Returns:
+        The imported module.
+
+    Raises:
+        ImportError: If the module is not installed.
+    """
+    module = optional_module(name)
+    if module is None:
+        raise ImportError(f"{name} is required for {feature}. Install it with: pip install 'smw-reader[{extra}]'")
+    return module
@@ -0,0 +1,138 @@
+"""Asyncio SMW API client implementation."""
+
+from __future__ import annotations
+
+import asyncio
+from types import TracebackType
+from typing import Any, Self
+from urllib.parse import urljoin
+
+from .async_http_client import default_async_http_client
+from .client import build_request_params, check_api_error
+from .exceptions import SMWAPIError, SMWValidationError
+from .interfaces import AsyncAPIEndpoint, AsyncHTTPClient
+
+
+class AsyncSMWClient:
+    """Asyncio client for accessing Semantic MediaWiki API.
+
+    The async counterpart of `SMWClient`: requests are awaited instead of
+    blocking, so a single event loop can keep many queries in flight. The
+    number of requests running at the same time is bounded by
+    `max_concurrency`; further requests wait for a free slot.
+
+    Examples:
+        >>> async with AsyncSMWClient("https://example.org/w/", max_concurrency=20) as site:
+        ...     ask = AsyncAskEndpoint(site)
+        ...     results = await asyncio.gather(*(ask.query(q) for q in queries))
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        http_client: AsyncHTTPClient | None = None,
+        api_path: str = "api.php",
+        max_concurrency: int = 10,
+        lean: bool = False,
+    ) -> None:
+        """Initialize the async SMW client.
+
+        Args:
+            base_url: Base URL of the MediaWiki installation (e.g., "https://example.com/wiki/").
+            http_client: Async HTTP client instance. If None, uses httpx or aiohttp,
+                whichever is installed.
+            api_path: Path to the API endpoint (default: "api.php").
+            max_concurrency: Maximum number of requests in flight at the same time.
+            lean: Request smaller responses, as with `SMWClient`.
+
+        Raises:
+            SMWValidationError: If max_concurrency is not positive.
+            ImportError: If no http_client is given and neither httpx nor aiohttp is installed.
+        """
+        if max_concurrency < 1:
+            raise SMWValidationError("max_concurrency must be a positive integer")
+        self.base_url = base_url.rstrip("/") + "/"
+        self.api_url = urljoin(self.base_url, api_path)
+        self.http_client = http_client or default_async_http_client()
+        self.max_concurrency = max_concurrency
+        self.lean = lean
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._endpoints: dict[str, AsyncAPIEndpoint] = {}
+
+    async def __aenter__(self) -> Self:
+        """Enter the async runtime context and return the client."""
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the HTTP client when leaving the async runtime context."""
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the underlying HTTP client."""
+        await self.http_client.close()
+
+    def register_endpoint(self, endpoint: AsyncAPIEndpoint) -> None:
+        """Register an API endpoint with the client.
+
+        Args:
+            endpoint: The endpoint instance to register.
+        """
+        self._endpoints[endpoint.endpoint_name] = endpoint
+
+    def get_endpoint(self, name: str) -> AsyncAPIEndpoint:
+        """Get a registered endpoint by name.
+
+        Args:
+            name: The endpoint name.
+
+        Returns:
+            The endpoint instance.
+
+        Raises:
+            SMWValidationError: If the endpoint is not registered.
+        """
+        if name not in self._endpoints:
+            raise SMWValidationError(f"Endpoint '{name}' is not registered")
+        return self._endpoints[name]
+
+    async def make_request(
+        self, action: str, params: dict[str, Any] | None = None, method: str = "GET"
+    ) -> dict[str, Any]:
+        """Make a request to the SMW API.
+
+        Args:
+            action: The API action/module name.
+            params: Additional parameters for the request.
+            method: HTTP method to use.
+
+        Returns:
+            The API response as a dictionary.
+
+        Raises:
+            SMWAPIError: If the API request fails.
+        """
+        request_params = build_request_params(action, params, self.lean)
+
+        try:
+            async with self._semaphore:
+                if method.upper() == "GET":
+                    response = await self.http_client.get(self.api_url, params=request_params)
+                elif method.upper() == "POST":
+                    response = await self.http_client.post(self.api_url, data=request_params)
+                else:
+                    raise SMWValidationError(f"Unsupported HTTP method: {method}")
+
+            check_api_error(response)
+            return response
+
+        except SMWAPIError:
+            # Re-raise SMW API errors as-is
+            raise
+        except Exception as e:
+            # Wrap other exceptions
+            raise SMWAPIError(f"Request failed: {e}") from e
@@ -0,0 +1,232 @@
+"""Asyncio HTTP client implementations backed by aiohttp or httpx.
+
+Both transports are optional dependencies, installable with the `aiohttp`,
+`httpx` or `async` extras.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from ._optional import optional_module, require_module
+from .exceptions import SMWConnectionError
+from .http_client import http_status_error, parse_json_object
+from .interfaces import AsyncHTTPClient
+from .json_decoding import JSONDecoder, get_decoder
+
+
+def _str_params(params: dict[str, Any] | None) -> dict[str, str] | None:
+    """Convert parameter values to strings, as the synchronous clients do."""
+    return {k: str(v) for k, v in params.items()} if params else None
+
+
+class AiohttpHTTPClient(AsyncHTTPClient):
+    """Asyncio HTTP client using aiohttp.
+
+    The underlying `aiohttp.ClientSession` is created on first use, inside the
+    running event loop, and keeps up to `pool_size` connections alive.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        user_agent: str = "SMW-Reader/0.1.0",
+        pool_size: int = 100,
+        json_decoder: str | JSONDecoder | None = None,
+    ) -> None:
+        """Initialize the HTTP client.
+
+        Args:
+            timeout: Request timeout in seconds.
+            user_agent: User agent string for requests.
+            pool_size: Maximum number of simultaneous connections.
+            json_decoder: JSON decoder for response bodies: the name of an
+                installed library ('orjson', 'msgspec', 'ujson', 'json') or a
+                function. If None, the fastest installed library is used.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+            ValueError: If the named JSON decoder is not installed.
+        """
+        self._aiohttp = require_module("aiohttp", "aiohttp", "this HTTP client")
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+        self.json_decoder = get_decoder(json_decoder)
+        self._session: Any = None
+
+    async def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a GET request.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            **kwargs: Additional request parameters passed to aiohttp.
+
+        Returns:
+            The response data as a dictionary.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        return await self._request("GET", url, params=_str_params(params), **kwargs)
+
+    async def post(self, url: str, data: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a POST request.
+
+        Args:
+            url: The URL to request.
+            data: Request body data.
+            **kwargs: Additional request parameters passed to aiohttp.
+
+        Returns:
+            The response data as a dictionary.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        return await self._request("POST", url, data=_str_params(data), **kwargs)
+
+    async def close(self) -> None:
+        """Close the underlying client session."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
+        aiohttp = self._aiohttp
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": self.user_agent, "Accept": "application/json"},
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+        try:
+            async with self._session.request(method, url, **kwargs) as response:
+                payload = await response.read()
+                status, reason = response.status, response.reason or ""
+                retry_after = response.headers.get("Retry-After")
+        except (TimeoutError, aiohttp.ClientError) as e:
+            raise SMWConnectionError(f"Connection error: {e}") from e
+
+        if status >= 400:
+            raise http_status_error(status, reason, payload, retry_after)
+        return parse_json_object(payload, self.json_decoder)
+
+
+class HttpxHTTPClient(AsyncHTTPClient):
+    """Asyncio HTTP client using httpx.
+
+    A single `httpx.AsyncClient` is shared by all requests and keeps up to
+    `pool_size` connections alive.
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        user_agent: str = "SMW-Reader/0.1.0",
+        pool_size: int = 100,
+        json_decoder: str | JSONDecoder | None = None,
+    ) -> None:
+        """Initialize the HTTP client.
+
+        Args:
+            timeout: Request timeout in seconds.
+            user_agent: User agent string for requests.
+            pool_size: Maximum number of simultaneous connections.
+            json_decoder: JSON decoder for response bodies: the name of an
+                installed library ('orjson', 'msgspec', 'ujson', 'json') or a
+                function. If None, the fastest installed library is used.
+
+        Raises:
+            ImportError: If httpx is not installed.
+            ValueError: If the named JSON decoder is not installed.
+        """
+        self._httpx = require_module("httpx", "httpx", "this HTTP client")
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.pool_size = pool_size
+        self.json_decoder = get_decoder(json_decoder)
+        self._client: Any = None
+
+    async def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a GET request.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            **kwargs: Additional request parameters passed to httpx.
+
+        Returns:
+            The response data as a dictionary.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        return await self._request("GET", url, params=_str_params(params), **kwargs)
+
+    async def post(self, url: str, data: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a POST request.
+
+        Args:
+            url: The URL to request.
+            data: Request body data.
+            **kwargs: Additional request parameters passed to httpx.
+
+        Returns:
+            The response data as a dictionary.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        return await self._request("POST", url, data=_str_params(data), **kwargs)
+
+    async def close(self) -> None:
+        """Close the underlying httpx client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> dict[str, Any]:
+        httpx = self._httpx
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={"User-Agent": self.user_agent, "Accept": "application/json"},
+                limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size),
+            )
+        try:
+            response = await self._client.request(method, url, **kwargs)
+        except httpx.TransportError as e:
+            raise SMWConnectionError(f"Connection error: {e}") from e
+
+        if response.status_code >= 400:
+            raise http_status_error(
+                response.status_code, response.reason_phrase, response.content, response.headers.get("Retry-After")
+            )
+        return parse_json_object(response.content, self.json_decoder)
+
+
+def default_async_http_client(**kwargs: Any) -> AsyncHTTPClient:
+    """Create an async HTTP client from whichever transport library is installed.
+
+    httpx is preferred over aiohttp when both are available.
+
+    Args:
+        **kwargs: Arguments passed to the client constructor.
+
+    Returns:
+        A new async HTTP client.
+
+    Raises:
+        ImportError: If neither httpx nor aiohttp is installed.
+    """
+    if optional_module("httpx") is not None:
+        return HttpxHTTPClient(**kwargs)
+    if optional_module("aiohttp") is not None:
+        return AiohttpHTTPClient(**kwargs)
+    raise ImportError("An async HTTP library is required. Install one with: pip install 'smw-reader[async]'")
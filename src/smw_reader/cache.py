@@ -0,0 +1,357 @@
+"""Response caching for SMW API requests."""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Self
+
+from .interfaces import ResponseCache
+
+
+def cache_key(action: str, params: dict[str, Any] | None = None) -> str:
+    """Build a normalized cache key for an API request.
+
+    Parameter order and value types do not matter: `{"limit": 10}` and
+    `{"limit": "10"}` produce the same key, as they produce the same request.
+
+    Args:
+        action: The API action/module name.
+        params: Additional parameters for the request.
+
+    Returns:
+        A string identifying the request.
+    """
+    normalized = {str(k): str(v).strip() for k, v in (params or {}).items() if v is not None}
+    return json.dumps([action, normalized], sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+@dataclass
+class CacheEntry:
+    """A cached API response.
+
+    Attributes:
+        response: The decoded API response.
+        expires_at: Wall-clock time (`time.time()`) after which the entry is stale.
+        etag: The ETag validator the server sent with the response, if any.
+        last_modified: The Last-Modified validator the server sent, if any.
+    """
+
+    response: dict[str, Any]
+    expires_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def is_fresh(self) -> bool:
+        """Whether the entry may still be served without asking the server."""
+        return time.time() < self.expires_at
+
+
+@dataclass
+class CacheStats:
+    """Counters describing the effectiveness of a response cache.
+
+    Attributes:
+        hits: Lookups answered with a fresh entry.
+        misses: Lookups that found no fresh entry.
+        evictions: Entries dropped to stay within the size bound.
+        expirations: Entries dropped because their TTL had passed.
+        revalidations: Stale entries the server confirmed as unchanged (HTTP 304).
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    revalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class MemoryCache(ResponseCache):
+    """Thread-safe in-process response cache with LRU eviction and per-entry TTL.
+
+    Examples:
+        >>> site = SMWClient("https://example.org/w/", cache=MemoryCache(maxsize=512, ttl=60))
+        >>> site.cache.stats
+        CacheStats(hits=0, misses=0, evictions=0, expirations=0, revalidations=0)
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 300.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries; the least recently used entry is
+                evicted when a new one would exceed it.
+            ttl: Default time to live of an entry in seconds.
+
+        Raises:
+            ValueError: If maxsize is smaller than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including stale ones not yet dropped."""
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Look up a fresh entry and mark it as recently used.
+
+        Args:
+            key: The cache key (see `cache_key`).
+
+        Returns:
+            The entry, or None if there is no fresh entry for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and not entry.is_fresh:
+                del self._entries[key]
+                self.stats.expirations += 1
+                entry = None
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the least recently used ones if necessary.
+
+        Args:
+            key: The cache key (see `cache_key`).
+            entry: The entry to store.
+        """
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry.
+
+        Args:
+            key: The cache key (see `cache_key`).
+
+        Returns:
+            True if an entry was removed.
+        """
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def record_revalidation(self) -> None:
+        """Count a stale entry the server confirmed as unchanged."""
+        with self._lock:
+            self.stats.revalidations += 1
+
+
+class SQLiteCache(ResponseCache):
+    """Response cache stored in an SQLite database on disk.
+
+    The database is opened in WAL mode, so several processes on one host can
+    share a cache file: readers are not blocked by a writer, and entries
+    survive restarts. Each thread uses its own connection.
+
+    Expired entries that carry an ETag or Last-Modified validator are kept and
+    returned by `get`, so that `SMWClient` can revalidate them with a
+    conditional request instead of downloading the response again. Expired
+    entries without validators are dropped.
+
+    Examples:
+        >>> with SQLiteCache("/var/cache/smw/responses.sqlite", ttl=3600) as cache:
+        ...     site = SMWClient("https://example.org/w/", cache=cache)
+    """
+
+    _PRUNE_INTERVAL = 64
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        ttl: float = 300.0,
+        max_entries: int = 10000,
+        timeout: float = 30.0,
+    ) -> None:
+        """Open (and if necessary create) the cache database.
+
+        Args:
+            path: Path of the database file.
+            ttl: Default time to live of an entry in seconds.
+            max_entries: Maximum number of entries; the oldest entries are
+                evicted when the database grows beyond it.
+            timeout: Seconds to wait for a lock held by another process.
+
+        Raises:
+            ValueError: If max_entries is smaller than 1.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.timeout = timeout
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._writes = 0
+        self._connection().execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " response TEXT NOT NULL,"
+            " expires_at REAL NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " stored_at REAL NOT NULL)"
+        )
+
+    def __len__(self) -> int:
+        """Return the number of stored entries, including stale ones."""
+        (count,) = self._connection().execute("SELECT COUNT(*) FROM responses").fetchone()
+        return int(count)
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the cache."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the database connections when leaving the runtime context."""
+        self.close()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Look up an entry.
+
+        Args:
+            key: The cache key (see `cache_key`).
+
+        Returns:
+            The entry if it is fresh or can be revalidated, otherwise None.
+        """
+        connection = self._connection()
+        row = connection.execute(
+            "SELECT response, expires_at, etag, last_modified FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        entry = None if row is None else CacheEntry(json.loads(row[0]), row[1], row[2], row[3])
+        if entry is not None and not entry.is_fresh and not (entry.etag or entry.last_modified):
+            connection.execute("DELETE FROM responses WHERE key = ? AND expires_at = ?", (key, entry.expires_at))
+            self._count(expirations=1)
+            entry = None
+        if entry is None or not entry.is_fresh:
+            self._count(misses=1)
+        else:
+            self._count(hits=1)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting the oldest ones if the cache is full.
+
+        Args:
+            key: The cache key (see `cache_key`).
+            entry: The entry to store.
+        """
+        self._connection().execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                key,
+                json.dumps(entry.response, ensure_ascii=False, separators=(",", ":")),
+                entry.expires_at,
+                entry.etag,
+                entry.last_modified,
+                time.time(),
+            ),
+        )
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self._PRUNE_INTERVAL == 0
+        if prune:
+            self.prune()
+
+    def delete(self, key: str) -> bool:
+        """Remove an entry.
+
+        Args:
+            key: The cache key (see `cache_key`).
+
+        Returns:
+            True if an entry was removed.
+        """
+        return self._connection().execute("DELETE FROM responses WHERE key = ?", (key,)).rowcount > 0
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._connection().execute("DELETE FROM responses")
+
+    def record_revalidation(self) -> None:
+        """Count a stale entry the server confirmed as unchanged."""
+        self._count(revalidations=1)
+
+    def prune(self) -> None:
+        """Drop expired entries without validators and evict entries beyond `max_entries`.
+
+        This runs automatically every few writes.
+        """
+        connection = self._connection()
+        expired = connection.execute(
+            "DELETE FROM responses WHERE expires_at <= ? AND etag IS NULL AND last_modified IS NULL",
+            (time.time(),),
+        ).rowcount
+        evicted = connection.execute(
+            "DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self._count(expirations=expired, evictions=evicted)
+
+    def close(self) -> None:
+        """Close the database connections of all threads."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening it on first use."""
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+    def _count(self, **increments: int) -> None:
+        """Add to the statistics counters."""
+        with self._lock:
+            for name, value in increments.items():
+                setattr(self.stats, name, getattr(self.stats, name) + value)
@@ -1,11 +1,70 @@
 """Main SMW API client implementation."""
 
-from typing import Any
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future
+from dataclasses import replace
+from typing import Any, TypeVar
 from urllib.parse import urljoin
 
-from .exceptions import SMWAPIError, SMWValidationError
-from .http_client import RequestsHTTPClient
-from .interfaces import APIEndpoint, HTTPClient
+from .cache import CacheEntry, cache_key
+from .exceptions import SMWAPIError, SMWServerError, SMWValidationError
+from .http_client import PooledHTTPClient
+from .interfaces import APIEndpoint, ConditionalResponse, HTTPClient, RateLimiter, RequestObserver, ResponseCache
+from .metrics import RequestEvent
+from .rate_limit import is_throttled
+
+_T = TypeVar("_T")
+
+
+LEAN_PARAMS = {"formatversion": "2", "utf8": "1"}
+"""Parameters added in lean mode: MediaWiki's newer JSON format, with non-ASCII characters sent as UTF-8."""
+
+
+def build_request_params(action: str, params: dict[str, Any] | None = None, lean: bool = False) -> dict[str, Any]:
+    """Build the full parameter set for an API request.
+
+    Args:
+        action: The API action/module name.
+        params: Additional parameters for the request.
+        lean: Ask for a smaller response: add `LEAN_PARAMS`, and for 'ask'
+            queries `|link=none` unless the query sets `link` itself.
+
+    Returns:
+        The request parameters including action and response format.
+    """
+    request_params = {"action": action, "format": "json"}
+    if lean:
+        request_params.update(LEAN_PARAMS)
+    if params:
+        request_params.update(params)
+    query = request_params.get("query")
+    if lean and action == "ask" and isinstance(query, str) and "|link=" not in query.replace(" ", ""):
+        request_params["query"] = f"{query}|link=none"
+    return request_params
+
+
+def check_api_error(response: dict[str, Any]) -> None:
+    """Raise if an API response reports an error.
+
+    A maxlag error arrives with HTTP 200, so its replication lag stands in
+    for a Retry-After header: it becomes the error's `retry_after`.
+
+    Args:
+        response: The decoded API response.
+
+    Raises:
+        SMWAPIError: If the response contains an 'error' object.
+    """
+    if "error" in response:
+        error_info = response["error"]
+        lag = error_info.get("lag")
+        raise SMWAPIError(
+            f"API Error: {error_info.get('info', 'Unknown error')}",
+            response_data=error_info,
+            retry_after=float(lag) if error_info.get("code") == "maxlag" and isinstance(lag, int | float) else None,
+        )
 
 
 class SMWClient:
@@ -20,18 +79,45 @@ class SMWClient:
         base_url: str,
         http_client: HTTPClient | None = None,
         api_path: str = "api.php",
+        cache: ResponseCache | None = None,
+        coalesce: bool = True,
+        rate_limiter: RateLimiter | None = None,
+        observers: Iterable[RequestObserver] | None = None,
+        lean: bool = False,
     ) -> None:
         """Initialize the SMW client.
 
         Args:
             base_url: Base URL of the MediaWiki installation (e.g., "https://example.com/wiki/").
-            http_client: HTTP client instance. If None, uses default RequestsHTTPClient.
+            http_client: HTTP client instance. If None, uses a PooledHTTPClient that
+                keeps connections to the wiki alive between requests.
             api_path: Path to the API endpoint (default: "api.php").
+            cache: Cache for GET responses (e.g. a `MemoryCache` or an on-disk
+                `SQLiteCache`). If None, responses are not cached.
+            coalesce: Whether identical GET requests made while one of them is
+                in flight share that request's response instead of being sent again.
+            rate_limiter: Limiter pacing all requests sent by this client (e.g.
+                an `AdaptiveRateLimiter`). If None, requests are not throttled.
+            observers: Observers receiving a `RequestEvent` with the timings of
+                every request sent to the server (e.g. a `MetricsRecorder`).
+                Responses served from the cache or shared with a coalesced
+                request are not reported.
+            lean: Request smaller responses (see `build_request_params`):
+                `formatversion=2` and `utf8=1`, so that non-ASCII text is not
+                sent as 6-byte escapes, and `|link=none` for ask queries.
         """
         self.base_url = base_url.rstrip("/") + "/"
         self.api_url = urljoin(self.base_url, api_path)
-        self.http_client = http_client or RequestsHTTPClient()
+        self.http_client = http_client or PooledHTTPClient()
+        self.cache = cache
+        self.coalesce = coalesce
+        self.rate_limiter = rate_limiter
+        self.observers = list(observers or ())
+        self.lean = lean
+        self.coalesced_requests = 0
         self._endpoints: dict[str, APIEndpoint] = {}
+        self._inflight: dict[str, Future[dict[str, Any]]] = {}
+        self._inflight_lock = threading.Lock()
 
     def register_endpoint(self, endpoint: APIEndpoint) -> None:
         """Register an API endpoint with the client.
@@ -41,6 +127,14 @@ class SMWClient:
         """
         self._endpoints[endpoint.endpoint_name] = endpoint
 
+    def add_observer(self, observer: RequestObserver) -> None:
+        """Report the timings of all further requests to an observer.
+
+        Args:
+            observer: The observer to add.
+        """
+        self.observers.append(observer)
+
     def get_endpoint(self, name: str) -> APIEndpoint:
         """Get a registered endpoint by name.
 
@@ -57,13 +151,44 @@ class SMWClient:
             raise SMWValidationError(f"Endpoint '{name}' is not registered")
         return self._endpoints[name]
 
-    def make_request(self, action: str, params: dict[str, Any] | None = None, method: str = "GET") -> dict[str, Any]:
+    def make_request(
+        self,
+        action: str,
+        params: dict[str, Any] | None = None,
+        method: str = "GET",
+        use_cache: bool = True,
+        cache_ttl: float | None = None,
+    ) -> dict[str, Any]:
         """Make a request to the SMW API.
 
+        When the client has a cache, GET responses are served from it while
+        they are fresh. A stale entry that carries an ETag or Last-Modified
+        validator is revalidated with a conditional request; if the server
+        answers 304 Not Modified, the cached response is reused and its TTL
+        renewed.
+
+        Identical GET requests issued from several threads while the first of
+        them is still in flight are coalesced: only one HTTP request is sent
+        and every caller receives its response (or exception). The number of
+        calls answered this way is counted in `coalesced_requests`.
+
+        With a rate limiter, every request sent to the server waits for the
+        limiter first and carries its `maxlag` parameter. Requests the server
+        throttles (HTTP 429/503 or a maxlag/ratelimited API error) are
+        reported to the limiter and sent again after its pause, up to its
+        `max_retries`.
+
+        Cached and coalesced responses are shared between callers and must
+        not be modified.
+
         Args:
             action: The API action/module name.
             params: Additional parameters for the request.
             method: HTTP method to use.
+            use_cache: Set to False to bypass the cache for this call; the
+                fresh response still replaces the cached one.
+            cache_ttl: Time to live of the cached response in seconds. If None,
+                uses the cache's default TTL.
 
         Returns:
             The API response as a dictionary.
@@ -71,32 +196,258 @@ class SMWClient:
         Raises:
             SMWAPIError: If the API request fails.
         """
-        # Prepare parameters
-        request_params = {"action": action, "format": "json"}
-        if params:
-            request_params.update(params)
+        if method.upper() != "GET":
+            return self._request(action, params, method)
 
-        try:
-            if method.upper() == "GET":
-                response = self.http_client.get(self.api_url, params=request_params)
-            elif method.upper() == "POST":
-                response = self.http_client.post(self.api_url, data=request_params)
+        key = self._cache_key(action, params)
+        if not self.coalesce:
+            return self._get(key, action, params, use_cache, cache_ttl)
+        return self._single_flight(key, lambda: self._get(key, action, params, use_cache, cache_ttl))
+
+    def _single_flight(self, key: str, fetch: Callable[[], dict[str, Any]]) -> dict[str, Any]:
+        """Call `fetch`, or wait for the outcome of an in-flight call with the same key."""
+        with self._inflight_lock:
+            waiting_for = self._inflight.get(key)
+            if waiting_for is not None:
+                self.coalesced_requests += 1
             else:
-                raise SMWValidationError(f"Unsupported HTTP method: {method}")
-
-            # Check for API errors
-            if "error" in response:
-                error_info = response["error"]
-                raise SMWAPIError(
-                    f"API Error: {error_info.get('info', 'Unknown error')}",
-                    response_data=error_info,
-                )
+                future: Future[dict[str, Any]] = Future()
+                self._inflight[key] = future
+        if waiting_for is not None:
+            return waiting_for.result()
 
+        try:
+            response = fetch()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(response)
             return response
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _get(
+        self,
+        key: str,
+        action: str,
+        params: dict[str, Any] | None,
+        use_cache: bool,
+        cache_ttl: float | None,
+    ) -> dict[str, Any]:
+        """Answer a GET request from the cache or the server, updating the cache."""
+        if self.cache is None:
+            return self._request(action, params, "GET")
+
+        entry = self.cache.get(key) if use_cache else None
+        if entry is not None and entry.is_fresh:
+            return entry.response
+
+        result = self._conditional_request(action, params, entry)
+        if result.data is not None:
+            response = result.data
+        elif entry is not None:
+            response = entry.response
+            self.cache.record_revalidation()
+        else:
+            raise SMWServerError("Server answered 304 Not Modified to an unconditional request")
+
+        ttl = self.cache.ttl if cache_ttl is None else cache_ttl
+        self.cache.set(
+            key,
+            CacheEntry(response, time.time() + ttl, etag=result.etag, last_modified=result.last_modified),
+        )
+        return response
+
+    def stream_request(self, action: str, params: dict[str, Any] | None = None) -> Iterator[bytes]:
+        """Make a GET request to the SMW API and return its body as it arrives.
+
+        Streamed requests bypass the cache and request coalescing, and the
+        body is not checked for API errors; see `JSONStream` for parsing it.
+
+        Args:
+            action: The API action/module name.
+            params: Additional parameters for the request.
+
+        Returns:
+            An iterator over chunks of the JSON response body. The request is
+            sent when iteration starts, after waiting for the rate limiter.
+        """
+        stream = self.http_client.get_stream(self.api_url, params=self._request_params(action, params))
+        if self.observers:
+            stream = self._observed_stream(action, stream)
+        if self.rate_limiter is None:
+            return stream
+        return self._limited_stream(self.rate_limiter, stream)
 
-        except SMWAPIError:
-            # Re-raise SMW API errors as-is
+    def _observed_stream(self, action: str, stream: Iterator[bytes]) -> Iterator[bytes]:
+        """Report the timings of a stream to the observers once it is read or abandoned."""
+        start = time.perf_counter()
+        error: BaseException | None = None
+        try:
+            yield from stream
+        except GeneratorExit:
+            raise
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self._notify(action, "GET", time.perf_counter() - start, error)
+
+    @staticmethod
+    def _limited_stream(limiter: RateLimiter, stream: Iterator[bytes]) -> Iterator[bytes]:
+        """Wait for the rate limiter before reading a stream and report its outcome."""
+        limiter.acquire()
+        try:
+            yield from stream
+        except SMWAPIError as e:
+            if is_throttled(e):
+                limiter.record_throttle(e.retry_after)
             raise
-        except Exception as e:
-            # Wrap other exceptions
-            raise SMWAPIError(f"Request failed: {e}") from e
+        limiter.record_success()
+
+    def invalidate_cache(self, action: str, params: dict[str, Any] | None = None) -> bool:
+        """Drop the cached response of one request.
+
+        Args:
+            action: The API action/module name.
+            params: The request parameters, as passed to `make_request`.
+
+        Returns:
+            True if a cached response was removed.
+        """
+        return self.cache is not None and self.cache.delete(self._cache_key(action, params))
+
+    def _cache_key(self, action: str, params: dict[str, Any] | None) -> str:
+        """Return the key a request's response is cached under."""
+        # Lean responses differ in format, so they must not be served to clients sharing the cache without lean mode.
+        return cache_key(action, {**LEAN_PARAMS, **(params or {})} if self.lean else params)
+
+    def _conditional_request(
+        self, action: str, params: dict[str, Any] | None, entry: CacheEntry | None
+    ) -> ConditionalResponse:
+        """Send a GET request carrying the validators of a cached entry, if any."""
+        request_params = self._request_params(action, params)
+
+        def send() -> ConditionalResponse:
+            try:
+                result = self.http_client.conditional_get(
+                    self.api_url,
+                    params=request_params,
+                    etag=entry.etag if entry else None,
+                    last_modified=entry.last_modified if entry else None,
+                )
+                if result.data is not None:
+                    check_api_error(result.data)
+                return result
+
+            except SMWAPIError:
+                # Re-raise SMW API errors as-is
+                raise
+            except Exception as e:
+                # Wrap other exceptions
+                raise SMWAPIError(f"Request failed: {e}") from e
+
+        return self._throttled(action, "GET", send)
+
+    def _request(self, action: str, params: dict[str, Any] | None, method: str) -> dict[str, Any]:
+        """Send a request to the SMW API and check the response for errors."""
+        if method.upper() not in ("GET", "POST"):
+            raise SMWValidationError(f"Unsupported HTTP method: {method}")
+        request_params = self._request_params(action, params)
+
+        def send() -> dict[str, Any]:
+            try:
+                if method.upper() == "GET":
+                    response = self.http_client.get(self.api_url, params=request_params)
+                else:
+                    response = self.http_client.post(self.api_url, data=request_params)
+
+                check_api_error(response)
+                return response
+
+            except SMWAPIError:
+                # Re-raise SMW API errors as-is
+                raise
+            except Exception as e:
+                # Wrap other exceptions
+                raise SMWAPIError(f"Request failed: {e}") from e
+
+        return self._throttled(action, method.upper(), send)
+
+    def _request_params(self, action: str, params: dict[str, Any] | None) -> dict[str, Any]:
+        """Build the parameters of a request, adding the rate limiter's maxlag."""
+        request_params = build_request_params(action, params, self.lean)
+        if self.rate_limiter is not None and self.rate_limiter.maxlag is not None:
+            request_params.setdefault("maxlag", self.rate_limiter.maxlag)
+        return request_params
+
+    def _throttled(self, action: str, method: str, send: Callable[[], _T]) -> _T:
+        """Call `send` when the rate limiter allows it, sending throttled requests again.
+
+        Every call of `send` is reported to the observers.
+        """
+        if self.observers:
+            send = self._observed(action, method, send)
+        limiter = self.rate_limiter
+        if limiter is None:
+            return send()
+        attempt = 0
+        while True:
+            limiter.acquire()
+            try:
+                result = send()
+            except SMWAPIError as e:
+                if not is_throttled(e):
+                    raise
+                limiter.record_throttle(e.retry_after)
+                if attempt >= limiter.max_retries:
+                    raise
+                attempt += 1
+            else:
+                limiter.record_success()
+                return result
+
+    def _observed(self, action: str, method: str, send: Callable[[], _T]) -> Callable[[], _T]:
+        """Wrap `send` so that each call is reported to the observers."""
+
+        def observed() -> _T:
+            start = time.perf_counter()
+            try:
+                result = send()
+            except BaseException as e:
+                self._notify(action, method, time.perf_counter() - start, e)
+                raise
+            self._notify(action, method, time.perf_counter() - start, None)
+            return result
+
+        return observed
+
+    def _notify(self, action: str, method: str, total: float, error: BaseException | None) -> None:
+        """Build the event of a finished request from the HTTP client's transfer statistics and report it."""
+        transfer = self.http_client.last_transfer
+        status = transfer.status if transfer is not None else None
+        if isinstance(error, SMWAPIError) and error.status_code is not None:
+            status = error.status_code
+        event = RequestEvent(
+            action=action,
+            method=method,
+            status=status,
+            total=total,
+            error=type(error).__name__ if error is not None else None,
+        )
+        if transfer is not None:
+            event = replace(
+                event,
+                connect=transfer.connect,
+                ttfb=transfer.ttfb,
+                read=transfer.read,
+                decode=transfer.decode,
+                parse=transfer.parse,
+                wire_bytes=transfer.wire_bytes,
+                body_bytes=transfer.body_bytes,
+                retries=transfer.retries,
+            )
+        for observer in self.observers:
+            observer.record(event)
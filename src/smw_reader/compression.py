@@ -0,0 +1,188 @@
+"""Content-Encoding negotiation and incremental response decompression."""
+
+from __future__ import annotations
+
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from typing import Any, Protocol
+
+from ._optional import optional_module
+from .exceptions import SMWServerError
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class Decompressor(Protocol):
+    """Incremental decompressor for one Content-Encoding."""
+
+    def decompress(self, data: bytes, /) -> bytes:
+        """Decompress the next chunk of input."""
+        ...
+
+    def flush(self) -> bytes:
+        """Return any data still buffered at the end of the stream."""
+        ...
+
+
+class _DeflateDecompressor:
+    """Decompressor for 'deflate', accepting both zlib-wrapped and raw streams.
+
+    RFC 9110 defines 'deflate' as zlib-wrapped data, but some servers send raw
+    deflate streams; the format is detected from the first chunk.
+    """
+
+    def __init__(self) -> None:
+        self._obj = zlib.decompressobj()
+        self._first = True
+
+    def decompress(self, data: bytes) -> bytes:
+        if self._first and data:
+            self._first = False
+            try:
+                return self._obj.decompress(data)
+            except zlib.error:
+                self._obj = zlib.decompressobj(-zlib.MAX_WBITS)
+        return self._obj.decompress(data)
+
+    def flush(self) -> bytes:
+        return self._obj.flush()
+
+
+class _BrotliDecompressor:
+    """Adapter for the `brotli`/`brotlicffi` streaming API."""
+
+    def __init__(self, module: Any) -> None:
+        self._obj = module.Decompressor()
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._obj.process(data))
+
+    def flush(self) -> bytes:
+        return b""
+
+
+class _ZstdDecompressor:
+    """Adapter for the stdlib `compression.zstd` (3.14+) or the `zstandard` package."""
+
+    def __init__(self, module: Any) -> None:
+        if hasattr(module, "ZstdDecompressor") and not hasattr(module.ZstdDecompressor, "decompressobj"):
+            self._obj = module.ZstdDecompressor()
+        else:
+            self._obj = module.ZstdDecompressor().decompressobj()
+
+    def decompress(self, data: bytes) -> bytes:
+        return bytes(self._obj.decompress(data))
+
+    def flush(self) -> bytes:
+        flush = getattr(self._obj, "flush", None)
+        return bytes(flush()) if flush else b""
+
+
+def _available_decompressors() -> dict[str, Callable[[], Decompressor]]:
+    """Build the table of content codings that can be decoded in this environment."""
+    factories: dict[str, Callable[[], Decompressor]] = {
+        "gzip": lambda: zlib.decompressobj(16 + zlib.MAX_WBITS),
+        "deflate": _DeflateDecompressor,
+    }
+    brotli = optional_module("brotli", "brotlicffi")
+    if brotli is not None:
+        factories["br"] = lambda: _BrotliDecompressor(brotli)
+    zstd = optional_module("compression.zstd", "zstandard")
+    if zstd is not None:
+        factories["zstd"] = lambda: _ZstdDecompressor(zstd)
+    return factories
+
+
+DECOMPRESSORS = _available_decompressors()
+"""Supported content codings mapped to factories for incremental decompressors."""
+
+ACCEPT_ENCODING = ", ".join(DECOMPRESSORS)
+"""Value of the Accept-Encoding header advertising every supported coding."""
+
+
+class DecodedStream:
+    """Read a response body, undoing its Content-Encoding as chunks arrive.
+
+    Compressed data is never buffered as a whole: each chunk read from the
+    network is decompressed immediately, so only the decoded body (or, when
+    iterating, a single decoded chunk) is held in memory.
+
+    Attributes:
+        content_encoding: The Content-Encoding of the response ('identity' if none).
+        wire_bytes: Number of (possibly compressed) body bytes read so far.
+        body_bytes: Number of decoded body bytes produced so far.
+        decode_seconds: Time spent decompressing so far.
+    """
+
+    def __init__(self, raw: Any, content_encoding: str | None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+        """Initialize the stream.
+
+        Args:
+            raw: Binary file-like object, typically an `http.client.HTTPResponse`.
+            content_encoding: The response's Content-Encoding header value.
+            chunk_size: Maximum number of bytes to read from `raw` at a time.
+
+        Raises:
+            SMWServerError: If the content coding is not supported.
+        """
+        codings = [c.strip().lower() for c in (content_encoding or "").split(",") if c.strip()]
+        codings = [c for c in codings if c != "identity"]
+        unsupported = [c for c in codings if c not in DECOMPRESSORS]
+        if unsupported:
+            raise SMWServerError(f"Unsupported Content-Encoding: {', '.join(unsupported)}")
+
+        self.content_encoding = ", ".join(codings) or "identity"
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.decode_seconds = 0.0
+        self._raw = raw
+        self._chunk_size = chunk_size
+        # Codings are listed in the order they were applied, so undo them in reverse.
+        self._decompressors = [DECOMPRESSORS[c]() for c in reversed(codings)]
+
+    def __iter__(self) -> Iterator[bytes]:
+        """Yield decoded body chunks until the end of the response."""
+        read = getattr(self._raw, "read1", self._raw.read)
+        while chunk := read(self._chunk_size):
+            self.wire_bytes += len(chunk)
+            if decoded := self._decode(chunk):
+                yield decoded
+        if tail := self._flush():
+            yield tail
+
+    def read(self) -> bytearray:
+        """Read and decode the remaining body.
+
+        Returns:
+            The decoded body. A bytearray is returned so that the chunks can be
+            accumulated in place without an extra copy.
+        """
+        body = bytearray()
+        for chunk in self:
+            body += chunk
+        return body
+
+    def _decode(self, chunk: bytes) -> bytes:
+        if self._decompressors:
+            start = time.perf_counter()
+            try:
+                for decompressor in self._decompressors:
+                    chunk = decompressor.decompress(chunk)
+            except Exception as e:
+                raise SMWServerError(f"Failed to decode {self.content_encoding} response: {e}") from e
+            self.decode_seconds += time.perf_counter() - start
+        self.body_bytes += len(chunk)
+        return chunk
+
+    def _flush(self) -> bytes:
+        tail = b""
+        start = time.perf_counter()
+        try:
+            for decompressor in self._decompressors:
+                tail = decompressor.decompress(tail) + decompressor.flush() if tail else decompressor.flush()
+        except Exception as e:
+            raise SMWServerError(f"Failed to decode {self.content_encoding} response: {e}") from e
+        self.decode_seconds += time.perf_counter() - start
+        self.body_bytes += len(tail)
+        return tail
@@ -0,0 +1,198 @@
+"""Keep-alive connection pool for the standard library HTTP client."""
+
+from __future__ import annotations
+
+import http.client
+import select
+import ssl
+import threading
+import time
+import urllib.parse
+from collections import deque
+from dataclasses import dataclass
+
+PoolKey = tuple[str, str, int]
+"""Identifies a pool of interchangeable connections: (scheme, host, port)."""
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def pool_key(url: str) -> PoolKey:
+    """Return the pool key for a URL.
+
+    Args:
+        url: An absolute http or https URL.
+
+    Returns:
+        The (scheme, host, port) tuple identifying the target host.
+
+    Raises:
+        ValueError: If the URL scheme is not http or https.
+    """
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    if scheme not in _DEFAULT_PORTS or not parts.hostname:
+        raise ValueError(f"Unsupported URL for connection pooling: {url}")
+    return scheme, parts.hostname, parts.port or _DEFAULT_PORTS[scheme]
+
+
+@dataclass
+class PoolStats:
+    """Counters describing how a connection pool has been used.
+
+    Attributes:
+        created: Connections opened because no idle connection was available.
+        reused: Requests served from an idle keep-alive connection.
+        expired: Idle connections closed because they exceeded the idle timeout
+            or were dropped by the server.
+        discarded: Connections closed on release because the pool was full or closed.
+    """
+
+    created: int = 0
+    reused: int = 0
+    expired: int = 0
+    discarded: int = 0
+
+
+class ConnectionPool:
+    """Thread-safe per-host pool of reusable HTTP/1.1 keep-alive connections.
+
+    Connections are checked out with `acquire` and handed back with `release`.
+    A connection is only ever used by one thread at a time; idle connections
+    are kept per (scheme, host, port) and reused most-recently-used first so
+    that rarely used connections age out through the idle timeout.
+
+    The pool never blocks: when every connection to a host is busy a new one
+    is opened, and `maxsize` only bounds how many idle connections are kept.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 10,
+        idle_timeout: float = 60.0,
+        timeout: float = 30.0,
+        ssl_context: ssl.SSLContext | None = None,
+    ) -> None:
+        """Initialize the connection pool.
+
+        Args:
+            maxsize: Maximum number of idle connections kept per host.
+            idle_timeout: Seconds an idle connection may be kept before it is closed.
+            timeout: Socket timeout in seconds for new connections.
+            ssl_context: SSL context for HTTPS connections. If None, uses the
+                default context with certificate verification.
+
+        Raises:
+            ValueError: If maxsize is smaller than 1.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.stats = PoolStats()
+        self._ssl_context = ssl_context
+        self._idle: dict[PoolKey, deque[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def acquire(self, key: PoolKey) -> tuple[http.client.HTTPConnection, bool]:
+        """Check out a connection to the given host.
+
+        Args:
+            key: The pool key of the target host (see `pool_key`).
+
+        Returns:
+            A tuple of the connection and a flag telling whether it was reused.
+        """
+        now = time.monotonic()
+        stale: list[http.client.HTTPConnection] = []
+        connection = None
+        with self._lock:
+            idle = self._idle.get(key)
+            while idle:
+                candidate, last_used = idle.pop()
+                if now - last_used > self.idle_timeout:
+                    # Idle connections are ordered by last use, so all older ones expired too.
+                    stale.append(candidate)
+                    stale.extend(conn for conn, _ in idle)
+                    idle.clear()
+                elif _is_dropped(candidate):
+                    stale.append(candidate)
+                    continue
+                else:
+                    connection = candidate
+                break
+            self.stats.expired += len(stale)
+            if connection is None:
+                self.stats.created += 1
+            else:
+                self.stats.reused += 1
+
+        for conn in stale:
+            conn.close()
+        if connection is not None:
+            return connection, True
+        return self._new_connection(key), False
+
+    def release(self, key: PoolKey, connection: http.client.HTTPConnection) -> None:
+        """Return a connection to the pool after its response was fully read.
+
+        Args:
+            key: The pool key the connection was acquired for.
+            connection: The connection to return.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            if not self._closed and len(idle) < self.maxsize:
+                idle.append((connection, time.monotonic()))
+                return
+            self.stats.discarded += 1
+        connection.close()
+
+    def idle_count(self, key: PoolKey | None = None) -> int:
+        """Return the number of idle connections.
+
+        Args:
+            key: Restrict the count to one host. If None, counts all hosts.
+
+        Returns:
+            The number of idle connections currently held.
+        """
+        with self._lock:
+            if key is not None:
+                return len(self._idle.get(key, ()))
+            return sum(len(idle) for idle in self._idle.values())
+
+    def close(self) -> None:
+        """Close all idle connections and stop keeping released ones."""
+        with self._lock:
+            self._closed = True
+            connections = [conn for idle in self._idle.values() for conn, _ in idle]
+            self._idle.clear()
+        for conn in connections:
+            conn.close()
+
+    def _new_connection(self, key: PoolKey) -> http.client.HTTPConnection:
+        """Open a new connection for the given pool key."""
+        scheme, host, port = key
+        if scheme == "https":
+            context = self._ssl_context or ssl.create_default_context()
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout, context=context)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+
+def _is_dropped(connection: http.client.HTTPConnection) -> bool:
+    """Check whether the server has closed an idle keep-alive connection.
+
+    An idle connection should never be readable; if it is, the peer either
+    closed it or sent unsolicited data, and it cannot be reused safely.
+    """
+    sock = connection.sock
+    if sock is None:
+        return True
+    try:
+        readable, _, _ = select.select([sock], [], [], 0)
+    except (OSError, ValueError):
+        return True
+    return bool(readable)
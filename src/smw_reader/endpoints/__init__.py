@@ -1,5 +1,6 @@
 """SMW API endpoints package."""
 
-from .ask import AskEndpoint
+from .ask import AskEndpoint, QueryOutcome
+from .async_ask import AsyncAskEndpoint
 
-__all__ = ["AskEndpoint"]
+__all__ = ["AskEndpoint", "AsyncAskEndpoint", "QueryOutcome"]
@@ -1,10 +1,288 @@
 """SMW API 'ask' endpoint implementation."""
 
-from typing import Any
+import math
+import time
+import warnings
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any, TypeVar
 
-from ..exceptions import SMWValidationError
+from ..cache import CacheEntry, MemoryCache, cache_key
+from ..client import SMWClient, check_api_error
+from ..exceptions import SMWAPIError, SMWResultLimitWarning, SMWServerError, SMWValidationError
 from ..interfaces import APIEndpoint
-from .query import QueryBuilder
+from ..streaming import JSONStream
+from .query import QueryBuilder, add_printout, escape_value, split_query
+
+DEFAULT_MAX_OFFSET = 10000
+"""SMW's default `$smwgQMaxLimit`, the largest offset plus limit a query may reach."""
+
+DEFAULT_COUNT_TTL = 60.0
+"""Seconds for which `AskEndpoint.count` reuses a count."""
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from ..export import ExportStats
+    from ..frames import MultiValue
+    from ..interfaces import ExportSink
+    from ..results import ResultSet
+
+RESULTS_PATH = ("query", "results")
+"""Location of the result rows in an ask response."""
+
+_Page = TypeVar("_Page")
+
+
+def build_ask_params(**params: Any) -> dict[str, Any]:
+    """Build the request parameters of an 'ask' API call.
+
+    Args:
+        **params: The query string as `query` plus inline query parameters
+            (limit, offset, sort, ...), which are appended as `|key=value`.
+
+    Returns:
+        The request parameters for the 'ask' action.
+
+    Raises:
+        SMWValidationError: If the query is missing or not a string.
+    """
+    query = params.pop("query", None)
+    if not query or not isinstance(query, str):
+        raise SMWValidationError("Query parameter must be a non-empty string")
+
+    query_parts = [query.strip()]
+    for key, value in params.items():
+        if value is not None:
+            query_parts.append(f"|{key}={value}")
+
+    return {"query": "".join(query_parts)}
+
+
+def iter_result_rows(response: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Iterate over the result rows of an ask response.
+
+    SMW serializes results as an object keyed by subject, as an empty list when
+    there are no results, or (with newer API versions) as a list of rows.
+
+    Args:
+        response: An ask API response.
+
+    Yields:
+        Tuples of the subject name and its result entry (with 'printouts',
+        'fulltext', 'fullurl' and so on).
+    """
+    results = response.get("query", {}).get("results") or {}
+    if isinstance(results, dict):
+        yield from results.items()
+        return
+    for entry in results:
+        yield from _list_entry_rows(entry)
+
+
+def iter_streamed_rows(stream: JSONStream) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Iterate over the result rows of an ask response while it is being parsed.
+
+    Once the rows are exhausted, the rest of the response (continuation
+    offset, meta data) is available as `stream.document`.
+
+    Args:
+        stream: A stream over the response body with `path=RESULTS_PATH`.
+
+    Yields:
+        Tuples of the subject name and its result entry.
+
+    Raises:
+        SMWAPIError: If the response reports an error.
+        SMWServerError: If the response is not valid JSON.
+    """
+    for subject, entry in stream:
+        if subject is None:
+            yield from _list_entry_rows(entry)
+        else:
+            yield subject, entry
+    check_api_error(stream.document)
+
+
+class OffsetPager:
+    """The limits and offsets of the successive pages of an ask query.
+
+    Holds the continuation and offset limit rules shared by the sync and
+    async endpoints: the next page starts at the response's
+    ``query-continue-offset``, which must advance, and paging stops with an
+    `SMWResultLimitWarning` at the wiki's maximum offset.
+
+    Examples:
+        >>> pager = OffsetPager(page_size, max_offset, params)
+        >>> while (window := pager.window()) is not None:
+        ...     limit, offset = window
+        ...     page = site.ask.query(query, limit=limit, offset=offset, **params)
+        ...     if not pager.advance(page):
+        ...         break
+    """
+
+    def __init__(self, page_size: int, max_offset: int, params: dict[str, Any], stacklevel: int = 2) -> None:
+        """Validate the page size and take the paging parameters out of `params`.
+
+        Args:
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            params: The query parameters; `limit` is removed and `offset`
+                becomes the start offset.
+            stacklevel: Stack level of the limit warning, relative to the
+                caller of `window`.
+
+        Raises:
+            SMWValidationError: If page_size is not positive.
+        """
+        if page_size < 1:
+            raise SMWValidationError("page_size must be a positive integer")
+        params.pop("limit", None)
+        self.offset = int(params.pop("offset", 0) or 0)
+        self.page_size = page_size
+        self.max_offset = max_offset
+        self.stacklevel = stacklevel
+
+    def window(self) -> tuple[int, int] | None:
+        """Return the limit and offset of the next page, or None (with a warning) at the maximum offset."""
+        if self.offset < self.max_offset:
+            return min(self.page_size, self.max_offset - self.offset), self.offset
+        warnings.warn(
+            f"Query has more results than the maximum offset of {self.max_offset}; "
+            "the remaining results were not fetched. Narrow the query or partition it.",
+            SMWResultLimitWarning,
+            stacklevel=self.stacklevel + 1,
+        )
+        return None
+
+    def advance(self, document: dict[str, Any]) -> bool:
+        """Move on to the continuation offset of a page's response.
+
+        Args:
+            document: The ask response of the current page.
+
+        Returns:
+            False if the response was the last page.
+
+        Raises:
+            SMWServerError: If the continuation offset does not advance.
+        """
+        next_offset = document.get("query-continue-offset")
+        if next_offset is None:
+            return False
+        next_offset = int(next_offset)
+        if next_offset <= self.offset:
+            raise SMWServerError(f"Continuation offset {next_offset} does not advance past {self.offset}")
+        self.offset = next_offset
+        return True
+
+
+def _list_entry_rows(entry: dict[str, Any]) -> Iterator[tuple[str, dict[str, Any]]]:
+    """Yield the rows of one element of a list-serialized result set."""
+    if "printouts" in entry or "fulltext" in entry:
+        yield entry.get("fulltext", ""), entry
+    else:
+        yield from entry.items()
+
+
+def condition_value(value: Any) -> str:
+    """Format a serialized printout value for use in a query condition.
+
+    Args:
+        value: A value from the printouts of a result row: a page, date,
+            quantity, number, boolean or string.
+
+    Returns:
+        The value as SMW parses it in a condition such as ``[[Key::>value]]``.
+    """
+    if isinstance(value, dict):
+        if "fulltext" in value:
+            return escape_value(value["fulltext"])
+        if "timestamp" in value:
+            return datetime.fromtimestamp(int(value["timestamp"]), UTC).strftime("%Y-%m-%dT%H:%M:%S")
+        if "value" in value and "unit" in value:
+            return escape_value(f"{value['value']} {value['unit']}")
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return escape_value(value)
+
+
+def bound_condition(key: str, comparator: str, value: str, strict_comparators: bool = False) -> str:
+    """Build a condition selecting the values of a property at or beyond a bound.
+
+    SMW's ``>`` and ``<`` include the bound itself unless the wiki sets
+    `$smwStrictComparators`; for such wikis the inclusive ``≥`` and ``≤``
+    are used instead.
+
+    Args:
+        key: The property name.
+        comparator: '>' for values at or above the bound, '<' for values at
+            or below it.
+        value: The bound, formatted for a condition (see `condition_value`).
+        strict_comparators: Whether the wiki's ``>`` and ``<`` are strict.
+
+    Returns:
+        A condition such as '[[Population::>1000]]'.
+    """
+    if strict_comparators:
+        comparator = "≥" if comparator == ">" else "≤"
+    return f"[[{key}::{comparator}{value}]]"
+
+
+def result_count(response: dict[str, Any]) -> int | None:
+    """Extract the number of matching pages from a `format=count` ask response.
+
+    Args:
+        response: An ask API response for a query with `format=count`.
+
+    Returns:
+        The count reported by the wiki, or None if the response carries none.
+    """
+    query = response.get("query", {})
+    for count in (query.get("count"), query.get("meta", {}).get("count")):
+        if count is not None:
+            return int(count)
+    return None
+
+
+def _key_value(subject: str, entry: dict[str, Any], key: str) -> str:
+    """Return the keyset value of a result row, formatted for a condition."""
+    values = (entry.get("printouts") or {}).get(key)
+    if not values:
+        raise SMWServerError(f"Result {subject!r} has no value for the keyset property {key!r}")
+    return condition_value(values[0])
+
+
+@dataclass(frozen=True)
+class QueryOutcome:
+    """The outcome of one query run by `AskEndpoint.ask_many`.
+
+    Attributes:
+        query: The query string.
+        response: The ask response, or None if the query failed.
+        error: The error raised for the query, or None if it succeeded.
+    """
+
+    query: str
+    response: dict[str, Any] | None = None
+    error: SMWAPIError | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Whether the query succeeded."""
+        return self.error is None
+
+    def result(self) -> dict[str, Any]:
+        """Return the response, or raise the query's error.
+
+        Raises:
+            SMWAPIError: If the query failed.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response or {}
 
 
 class AskEndpoint(APIEndpoint):
@@ -16,8 +294,29 @@ class AskEndpoint(APIEndpoint):
 
     The recommended way to build complex queries is by using the `QueryBuilder`.
     See the `query` method for more details.
+
+    Attributes:
+        counts: Recently probed result counts (see `count`).
     """
 
+    def __init__(
+        self, client: SMWClient, count_ttl: float = DEFAULT_COUNT_TTL, strict_comparators: bool = False
+    ) -> None:
+        """Initialize the endpoint.
+
+        Args:
+            client: The SMW client instance for making requests.
+            count_ttl: Seconds for which `count` reuses a count; 0 disables it.
+            strict_comparators: Whether the wiki sets `$smwStrictComparators`,
+                which makes ``>`` and ``<`` in conditions exclude the value
+                itself. Keyset pagination and partitioning then use the
+                inclusive ``≥`` and ``≤`` (see `bound_condition`).
+        """
+        super().__init__(client)
+        self.count_ttl = count_ttl
+        self.strict_comparators = strict_comparators
+        self.counts = MemoryCache(maxsize=1024, ttl=count_ttl)
+
     @property
     def endpoint_name(self) -> str:
         """The name of the API endpoint."""
@@ -41,17 +340,7 @@ class AskEndpoint(APIEndpoint):
         Raises:
             SMWValidationError: If the query is invalid.
         """
-        query = params.pop("query", None)
-        if not query or not isinstance(query, str):
-            raise SMWValidationError("Query parameter must be a non-empty string")
-
-        query_parts = [query.strip()]
-        for key, value in params.items():
-            if value is not None:
-                query_parts.append(f"|{key}={value}")
-
-        request_params = {"query": "".join(query_parts)}
-        return self._client.make_request("ask", request_params)
+        return self._client.make_request("ask", build_ask_params(**params))
 
     def query(self, query: str | QueryBuilder, **params: Any) -> dict[str, Any]:
         """Convenience method for executing semantic queries.
@@ -80,6 +369,509 @@ class AskEndpoint(APIEndpoint):
         """
         return self.execute(query=str(query), **params)
 
+    def ask_many(
+        self,
+        queries: Iterable[str | QueryBuilder],
+        max_concurrency: int = 8,
+        **params: Any,
+    ) -> list[QueryOutcome]:
+        """Run independent queries concurrently.
+
+        The queries are sent from a thread pool through the client, so they
+        share its connection pool, cache and rate limiter. A query given more
+        than once is sent once, and its outcome is shared by all its
+        positions. The total time is close to that of the slowest query
+        rather than the sum of all of them.
+
+        A failing query does not affect the others: its error is returned in
+        its outcome instead of being raised.
+
+        Examples:
+            >>> outcomes = site.ask.ask_many([cities, rivers, "[[Category:Mountains]]"], limit=50)
+            >>> [len(outcome.result()["query"]["results"]) for outcome in outcomes if outcome.ok]
+            [50, 12, 50]
+
+        Args:
+            queries: The semantic query strings or QueryBuilder instances.
+            max_concurrency: Maximum number of queries in flight at the same time.
+            **params: Query parameters applied to every query.
+
+        Returns:
+            One outcome per query, in the order of `queries`.
+
+        Raises:
+            SMWValidationError: If max_concurrency is not positive.
+        """
+        if max_concurrency < 1:
+            raise SMWValidationError("max_concurrency must be a positive integer")
+        query_strings = [str(query) for query in queries]
+        distinct = list(dict.fromkeys(query_strings))
+
+        def run(query: str) -> QueryOutcome:
+            try:
+                return QueryOutcome(query, response=self.query(query, **params))
+            except SMWAPIError as e:
+                return QueryOutcome(query, error=e)
+
+        if len(distinct) <= 1:
+            outcomes = [run(query) for query in distinct]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_concurrency, len(distinct))) as executor:
+                outcomes = list(executor.map(run, distinct))
+        by_query = dict(zip(distinct, outcomes, strict=True))
+        return [by_query[query] for query in query_strings]
+
+    def query_frame(
+        self, query: str | QueryBuilder, multivalue: "MultiValue" = "list", **params: Any
+    ) -> "pd.DataFrame":
+        """Execute a query and return its results as a pandas DataFrame.
+
+        The frame has a 'subject' column and one typed column per printout;
+        see `smw_reader.frames.to_dataframe` for the conversion rules.
+
+        Examples:
+            >>> frame = site.ask.query_frame("[[Category:Cities]]|?Population|?Founded", multivalue="first", limit=500)
+            >>> frame.sort_values("Population").tail()
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            multivalue: How printouts with several values are represented:
+                'list', 'first' or 'explode'.
+            **params: Additional query parameters.
+
+        Returns:
+            The query results as a DataFrame.
+        """
+        from ..frames import to_dataframe
+
+        return to_dataframe(self.query(query, **params), multivalue=multivalue)
+
+    def query_compact(
+        self,
+        query: str | QueryBuilder,
+        page_size: int = 500,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        **params: Any,
+    ) -> "ResultSet":
+        """Fetch all results of a query into a compact, typed `ResultSet`.
+
+        The pages are fetched one at a time and each is converted as soon as
+        it arrives, so only one raw page is held in memory. The rows take a
+        fraction of the memory of the raw dicts: values are stored in slotted
+        objects and repeated pages and strings are stored once (see
+        `smw_reader.results`).
+
+        Examples:
+            >>> cities = site.ask.query_compact("[[Category:Cities]]|?Population|?Country")
+            >>> sum(row.first("Population", 0) for row in cities if row.first("Country").title == "Germany")
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            **params: Additional query parameters.
+
+        Returns:
+            The results of the query.
+
+        Raises:
+            SMWValidationError: If page_size is not positive.
+        """
+        from ..results import ResultSet
+
+        return ResultSet(self.iter_pages(query, page_size, max_offset, **params))
+
+    def query_stream(self, query: str | QueryBuilder, **params: Any) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Execute a query and parse its result rows while the response arrives.
+
+        Rows are parsed one at a time straight from the connection, so a large
+        result page never has to be held in memory as a whole, and processing
+        can start before the download has finished. Streamed queries bypass
+        the client's cache and request coalescing.
+
+        Examples:
+            >>> for subject, row in site.ask.query_stream("[[Category:Cities]]|?Population", limit=5000):
+            ...     print(subject, row["printouts"]["Population"])
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            **params: Additional query parameters.
+
+        Returns:
+            An iterator over tuples of the subject name and its result entry.
+            The request is sent when iteration starts.
+
+        Raises:
+            SMWValidationError: If the query is invalid.
+        """
+        return iter_streamed_rows(self._stream(query, **params))
+
+    def iter_results(
+        self,
+        query: str | QueryBuilder,
+        page_size: int = 50,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        stream: bool = False,
+        keyset: str | None = None,
+        **params: Any,
+    ) -> Iterator[tuple[str, dict[str, Any]]]:
+        """Iterate over all results of a query, fetching one page at a time.
+
+        The next page is requested only after the rows of the current page have
+        been consumed, and each page is released once it is exhausted, so memory
+        use does not depend on the size of the whole result set.
+
+        SMW refuses to page beyond its maximum query offset (`$smwgQMaxLimit`).
+        When the result set is larger than that, iteration stops at the limit
+        and an `SMWResultLimitWarning` is issued instead of dropping the
+        remaining rows silently.
+
+        Examples:
+            >>> for subject, row in site.ask.iter_results("[[Category:Cities]]|?Population", page_size=200):
+            ...     print(subject, row["printouts"]["Population"])
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            stream: Parse each page while it arrives (see `query_stream`)
+                instead of after it has been downloaded.
+            keyset: Page by the values of this property instead of by offset
+                (see `iter_pages`).
+            **params: Additional query parameters. An `offset` starts iteration
+                further into the result set.
+
+        Yields:
+            Tuples of the subject name and its result entry.
+
+        Raises:
+            SMWValidationError: If page_size is not positive, or keyset is
+                combined with stream or offset.
+            SMWServerError: If the server's continuation offset does not advance.
+        """
+        if keyset is not None and stream:
+            raise SMWValidationError("Keyset pagination cannot be combined with stream")
+        if not stream:
+            for page in self.iter_pages(query, page_size, max_offset, keyset=keyset, **params):
+                yield from iter_result_rows(page)
+            return
+
+        def fetch(limit: int, offset: int) -> JSONStream:
+            return self._stream(query, limit=limit, offset=offset, **params)
+
+        pager = OffsetPager(page_size, max_offset, params, stacklevel=3)
+        for stream_page in self._paginate(fetch, lambda page: page.document, pager):
+            yield from iter_streamed_rows(stream_page)
+
+    def iter_pages(
+        self,
+        query: str | QueryBuilder,
+        page_size: int = 50,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        keyset: str | None = None,
+        **params: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """Iterate over the result pages of a query, fetching one page at a time.
+
+        This is the page-level counterpart of `iter_results`, for consumers that
+        need each response as a whole (for example its printrequests).
+
+        SMW answers a query with `offset=n` by skipping n results, so deep pages
+        get slower and the maximum offset ends the iteration. With `keyset`,
+        results are sorted by that property instead, and each next page adds a
+        ``[[keyset::>last]]`` condition on the last value seen, so every page
+        costs the same and result sets beyond the maximum offset are reached.
+        The condition includes the last value, so that results sharing it are
+        not lost between pages; those already returned are skipped with a
+        small offset. On wikis with `$smwStrictComparators`, create the
+        endpoint with `strict_comparators=True` to use ``≥`` instead.
+
+        The key should be a single-valued property that every result has, such
+        as 'Modification date' or a unique identifier: pages without a value
+        are not returned. A ``?keyset`` printout is added to the query if it
+        has none, and any `sort` or `order` is replaced by the ascending key.
+
+        Examples:
+            >>> for page in site.ask.iter_pages("[[Category:Cities]]|?Population", 500, keyset="Modification date"):
+            ...     print(len(page["query"]["results"]))
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset; ignored with keyset.
+            keyset: Page by the values of this property instead of by offset.
+            **params: Additional query parameters. An `offset` starts iteration
+                further into the result set.
+
+        Returns:
+            An iterator over the ask responses of the successive pages.
+
+        Raises:
+            SMWValidationError: If page_size is not positive, or keyset is
+                combined with offset.
+            SMWServerError: If the server's continuation offset does not advance,
+                or a result has no value for the keyset property.
+        """
+
+        def fetch(limit: int, offset: int) -> dict[str, Any]:
+            return self.query(query, limit=limit, offset=offset, **params)
+
+        pager = OffsetPager(page_size, max_offset, params, stacklevel=3)
+        if keyset is not None:
+            if pager.offset:
+                raise SMWValidationError("Keyset pagination cannot be combined with offset")
+            return self._keyset_pages(str(query), keyset, page_size, **params)
+        return self._paginate(fetch, lambda page: page, pager)
+
+    def _keyset_pages(self, query: str, key: str, page_size: int, **params: Any) -> Iterator[dict[str, Any]]:
+        """Fetch pages sorted by `key`, continuing each after the last key value seen."""
+        conditions, rest = split_query(add_printout(query, key))
+        params.update(sort=key, order="asc")
+        bound = ""
+        # Results whose key equals the bound that were already returned: the next page skips them.
+        ties = 0
+        while True:
+            condition = bound_condition(key, ">", bound, self.strict_comparators) if bound else ""
+            page = self.query(f"{conditions}{condition}{rest}", limit=page_size, offset=ties or None, **params)
+            yield page
+
+            if page.get("query-continue-offset") is None:
+                return
+            values = [_key_value(subject, entry, key) for subject, entry in iter_result_rows(page)]
+            if not values:
+                raise SMWServerError("Keyset page is empty but the server reports more results")
+            last = values[-1]
+            run = 0
+            for value in reversed(values):
+                if value != last:
+                    break
+                run += 1
+            ties = ties + run if last == bound else run
+            bound = last
+
+    @staticmethod
+    def _paginate(
+        fetch: Callable[[int, int], _Page],
+        document: Callable[[_Page], dict[str, Any]],
+        pager: OffsetPager,
+    ) -> Iterator[_Page]:
+        """Fetch pages until the server reports no continuation or the offset limit is reached.
+
+        The continuation offset is read from `document(page)` only after the
+        consumer has resumed iteration, so streamed pages can be consumed first.
+        """
+        while (window := pager.window()) is not None:
+            page = fetch(*window)
+            yield page
+            if not pager.advance(document(page)):
+                return
+
+    def fetch_all(
+        self,
+        query: str | QueryBuilder,
+        workers: int = 4,
+        page_size: int = 500,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        **params: Any,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Fetch all results of a query, requesting several pages in parallel.
+
+        The number of matching pages is determined first with a `format=count`
+        query. The offset range is then split into disjoint windows of
+        `page_size` results which are fetched concurrently on a thread pool.
+        Every request still goes through the client's `make_request`, so any
+        client-side throttling applies to each window.
+
+        Rows are returned in result order. Pass a `sort` parameter if the
+        query's order must be stable while the windows are fetched; rows that
+        move between windows during the export are returned only once.
+
+        Examples:
+            >>> rows = site.ask.fetch_all("[[Category:Cities]]|?Population", workers=8, sort="Population")
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            workers: Number of pages fetched at the same time.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            **params: Additional query parameters.
+
+        Returns:
+            A list of tuples of the subject name and its result entry.
+
+        Raises:
+            SMWValidationError: If workers or page_size is not positive.
+        """
+        if workers < 1 or page_size < 1:
+            raise SMWValidationError("workers and page_size must be positive integers")
+        params.pop("limit", None)
+        start = int(params.pop("offset", 0) or 0)
+
+        total = self.count(query, **params)
+        if total is None:
+            # Without a count there is nothing to shard; fall back to sequential paging.
+            return list(dict(self.iter_results(query, page_size, max_offset, offset=start, **params)).items())
+
+        end = min(total, max_offset)
+        if end <= start:
+            return []
+        # Spread the results evenly over as few windows as page_size allows, and start no more threads than windows.
+        windows = math.ceil((end - start) / page_size)
+        page_size = math.ceil((end - start) / windows)
+        workers = min(workers, windows)
+        offsets = range(start, end, page_size)
+
+        def fetch(offset: int) -> dict[str, Any]:
+            return self.query(query, limit=min(page_size, end - offset), offset=offset, **params)
+
+        rows: dict[str, dict[str, Any]] = {}
+        last_page: dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for last_page in executor.map(fetch, offsets):
+                rows.update(iter_result_rows(last_page))
+
+        # The last window continues only if rows were added since the count was taken,
+        # or if the result set reaches the maximum offset (iter_results then warns).
+        next_offset = last_page.get("query-continue-offset")
+        if next_offset is not None:
+            rows.update(self.iter_results(query, page_size, max_offset, offset=int(next_offset), **params))
+        return list(rows.items())
+
+    def fetch_partitioned(
+        self,
+        query: str | QueryBuilder,
+        key: str | None = None,
+        workers: int = 4,
+        page_size: int = 500,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        **params: Any,
+    ) -> list[tuple[str, dict[str, Any]]]:
+        """Fetch all results of a query that may match more than the wiki's maximum offset.
+
+        The query is split into disjoint parts that each fit under
+        `max_offset`, by the range of a number or date property or by title
+        prefix (see `smw_reader.partition`). The parts are then paged through
+        concurrently and their rows merged, each subject once.
+
+        Examples:
+            >>> rows = site.ask.fetch_partitioned("[[Category:Cities]]|?Population", key="Population", workers=8)
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            key: A number or date property whose range is split, or None to
+                split by title prefix.
+            workers: Number of requests sent at the same time, both while
+                counting and while fetching.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            **params: Additional query parameters.
+
+        Returns:
+            A list of tuples of the subject name and its result entry, in the
+            order of the parts.
+
+        Raises:
+            SMWValidationError: If workers, page_size or max_offset is not
+                positive, or the key property has neither numbers nor dates.
+            SMWServerError: If the wiki does not report result counts.
+        """
+        from ..partition import partition_query
+
+        if page_size < 1:
+            raise SMWValidationError("page_size must be a positive integer")
+        partitions = partition_query(self, query, key, limit=max_offset, workers=workers)
+
+        def fetch(query: str) -> list[tuple[str, dict[str, Any]]]:
+            return list(self.iter_results(query, page_size, max_offset, **params))
+
+        rows: dict[str, dict[str, Any]] = {}
+        with ThreadPoolExecutor(max_workers=min(workers, len(partitions) or 1)) as executor:
+            for part_rows in executor.map(fetch, [partition.query for partition in partitions]):
+                rows.update(part_rows)
+        return list(rows.items())
+
+    def _stream(self, query: str | QueryBuilder, **params: Any) -> JSONStream:
+        """Send a query and return a stream over its result rows."""
+        chunks = self._client.stream_request("ask", build_ask_params(query=str(query), **params))
+        return JSONStream(chunks, RESULTS_PATH)
+
+    def export(
+        self,
+        query: str | QueryBuilder,
+        sink: "ExportSink",
+        batch_size: int = 10_000,
+        page_size: int = 500,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        multivalue: "MultiValue" = "list",
+        **params: Any,
+    ) -> "ExportStats":
+        """Page through a query and write its results to a file sink in batches.
+
+        Pages are converted to typed columns (see `frames.to_dataframe`) and
+        written in batches of at most `batch_size` rows as they arrive, so
+        memory use is bounded by one batch plus one page. The column schema is
+        fixed by the printrequests of the first page.
+
+        Examples:
+            >>> from smw_reader.export import ParquetSink
+            >>> stats = site.ask.export("[[Category:Cities]]|?Population|?Founded", ParquetSink("cities.parquet"))
+            >>> print(stats)
+            9500 rows in 1 batches, 0.2 MB in 3.10s (3,065 rows/s, 0.1 MB/s)
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            sink: The destination, e.g. a `CSVSink`, `JSONLinesSink`,
+                `ParquetSink` or `ArrowSink` from `smw_reader.export`.
+            batch_size: Maximum number of rows written at once (the Parquet
+                row group size).
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            multivalue: How printouts with several values are represented.
+            **params: Additional query parameters.
+
+        Returns:
+            The number of rows and bytes written and the export's throughput.
+        """
+        from ..export import export_pages
+
+        pages = self.iter_pages(query, page_size, max_offset, **params)
+        return export_pages(pages, sink, batch_size=batch_size, multivalue=multivalue)
+
+    def count(self, query: str | QueryBuilder, use_cache: bool = True, **params: Any) -> int | None:
+        """Ask the wiki how many pages match a query, without fetching them.
+
+        The count is requested with `format=count`, so the response holds a
+        single number however many pages match. Counts are reused for
+        `count_ttl` seconds, which lets the planning steps of `fetch_all`,
+        `fetch_partitioned` and `smw_reader.partition` share them.
+
+        Examples:
+            >>> total = site.ask.count("[[Category:Cities]]")
+            >>> pages = math.ceil(total / 500)
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            use_cache: Set to False to ask the wiki even if a recent count is
+                known, bypassing the client's response cache as well.
+            **params: Additional query parameters; printouts and paging and
+                sorting parameters do not change the count and are ignored.
+
+        Returns:
+            The number of matching pages, or None if the wiki did not report it.
+        """
+        for key in ("limit", "offset", "format", "sort", "order"):
+            params.pop(key, None)
+        conditions, _ = split_query(str(query))
+        request = build_ask_params(query=conditions, format="count", **params)
+        key = cache_key("ask", request)
+        entry = self.counts.get(key) if use_cache and self.count_ttl > 0 else None
+        if entry is None:
+            response = self._client.make_request("ask", request, use_cache=use_cache)
+            entry = CacheEntry(response, time.time() + self.count_ttl)
+            if self.count_ttl > 0:
+                self.counts.set(key, entry)
+        return result_count(entry.response)
+
     def query_category(self, category: str, printouts: list[str] | None = None, **params: Any) -> dict[str, Any]:
         """Query pages in a specific category.
 
@@ -0,0 +1,101 @@
+"""SMW API 'ask' endpoint implementation for the asyncio client."""
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from ..interfaces import AsyncAPIEndpoint
+from .ask import DEFAULT_MAX_OFFSET, OffsetPager, build_ask_params, iter_result_rows
+from .query import QueryBuilder
+
+
+class AsyncAskEndpoint(AsyncAPIEndpoint):
+    """Implementation of the SMW 'ask' API endpoint for `AsyncSMWClient`.
+
+    This is the asyncio counterpart of `AskEndpoint`; every method that sends
+    a request is a coroutine (or an async generator for `iter_results`).
+    """
+
+    @property
+    def endpoint_name(self) -> str:
+        """The name of the API endpoint."""
+        return "ask"
+
+    async def execute(self, **params: Any) -> dict[str, Any]:
+        """Execute a semantic query using the 'ask' endpoint.
+
+        Args:
+            **params: Query parameters including:
+                - query: The semantic query string
+                - limit: Maximum number of results
+                - offset: Offset for pagination
+                - sort: Sort field
+                - order: Sort order ('asc' or 'desc')
+
+        Returns:
+            The query results as a dictionary.
+
+        Raises:
+            SMWValidationError: If the query is invalid.
+        """
+        return await self._client.make_request("ask", build_ask_params(**params))
+
+    async def query(self, query: str | QueryBuilder, **params: Any) -> dict[str, Any]:
+        """Convenience method for executing semantic queries.
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            **params: Additional query parameters.
+
+        Returns:
+            The query results as a dictionary.
+        """
+        return await self.execute(query=str(query), **params)
+
+    async def query_category(self, category: str, printouts: list[str] | None = None, **params: Any) -> dict[str, Any]:
+        """Query pages in a specific category.
+
+        Args:
+            category: The name of the category to query.
+            printouts: A list of properties to retrieve for each page.
+            **params: Additional query parameters.
+
+        Returns:
+            The query results as a dictionary.
+        """
+        query_builder = QueryBuilder().add_conditions(f"Category:{category}")
+        if printouts:
+            query_builder.add_printouts(*(p.lstrip("?") for p in printouts))
+        return await self.query(query_builder, **params)
+
+    async def iter_results(
+        self,
+        query: str | QueryBuilder,
+        page_size: int = 50,
+        max_offset: int = DEFAULT_MAX_OFFSET,
+        **params: Any,
+    ) -> AsyncIterator[tuple[str, dict[str, Any]]]:
+        """Iterate over all results of a query, fetching one page at a time.
+
+        See `AskEndpoint.iter_results` for the paging and offset limit behaviour.
+
+        Args:
+            query: The semantic query string or a QueryBuilder instance.
+            page_size: Number of results to request per page.
+            max_offset: The wiki's maximum query offset.
+            **params: Additional query parameters.
+
+        Yields:
+            Tuples of the subject name and its result entry.
+
+        Raises:
+            SMWValidationError: If page_size is not positive.
+            SMWServerError: If the server's continuation offset does not advance.
+        """
+        pager = OffsetPager(page_size, max_offset, params)
+        while (window := pager.window()) is not None:
+            limit, offset = window
+            response = await self.query(query, limit=limit, offset=offset, **params)
+            for row in iter_result_rows(response):
+                yield row
+            if not pager.advance(response):
+                return
@@ -1,6 +1,75 @@
-"""Query builder for SMW queries."""
+"""Query builder and precompiled query templates for SMW queries."""
 
-from typing import Self
+import string
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Self
+
+_SYNTAX_CHARACTERS = frozenset("[]|{}")
+_ESCAPES = str.maketrans({char: f"&#{ord(char)};" for char in _SYNTAX_CHARACTERS})
+_COMPARATORS = frozenset("<>!~")
+
+
+def escape_value(value: Any) -> str:
+    """Escape a value for use inside a condition of an SMW query.
+
+    The characters delimiting query syntax (``[``, ``]``, ``|``, ``{`` and
+    ``}``) are replaced with HTML character references, so that the value
+    cannot end its condition or start another one. A leading comparator
+    (``<``, ``>``, ``!`` or ``~``) is escaped as well, so that the value is
+    compared literally instead of changing the kind of comparison.
+
+    Args:
+        value: The value; it is converted with `str`.
+
+    Returns:
+        The escaped value.
+    """
+    text = str(value)
+    if not _SYNTAX_CHARACTERS.isdisjoint(text):
+        text = text.translate(_ESCAPES)
+    if text[:1] in _COMPARATORS:
+        text = f"&#{ord(text[0])};{text[1:]}"
+    return text
+
+
+def split_query(query: str) -> tuple[str, str]:
+    """Split an ask query into its conditions and the printouts and parameters after them.
+
+    Args:
+        query: An ask query, e.g. '[[Category:City]][[Population::>1000]]|?Population|sort=Population'.
+
+    Returns:
+        The conditions and the rest of the query, which is empty or starts with '|'.
+    """
+    depth = 0
+    for index, char in enumerate(query):
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth = max(depth - 1, 0)
+        elif char == "|" and depth == 0:
+            return query[:index].strip(), query[index:]
+    return query.strip(), ""
+
+
+def add_printout(query: str, name: str) -> str:
+    """Add a printout to an ask query unless the query already has it.
+
+    Only a printout without a label counts, since a labelled one
+    ('?Modification date=Changed') is keyed by its label in the results.
+
+    Args:
+        query: An ask query.
+        name: The property to print.
+
+    Returns:
+        The query, with ``|?name`` appended if needed.
+    """
+    _, rest = split_query(query)
+    if f"?{name.lower()}" in (part.strip().lower() for part in rest.split("|")):
+        return query
+    return f"{query.rstrip()}|?{name}"
 
 
 class QueryBuilder:
@@ -81,3 +150,94 @@ class QueryBuilder:
         """
         self.printouts.extend(f"?{p}" for p in printouts)
         return self
+
+    def template(self) -> "QueryTemplate":
+        """Compile the query into a template.
+
+        Placeholders are written as ``{name}`` in conditions, typically as
+        the value of a dict condition; literal braces must be doubled.
+
+        Examples:
+            >>> template = QueryBuilder().add_conditions(
+            ...     "Category:City", {"key": "Located in", "value": "{country}"}
+            ... ).add_printouts("Population").template()
+            >>> template.bind(country="France")
+            '[[Category:City]][[Located in::France]]|?Population'
+
+        Returns:
+            The compiled template.
+
+        Raises:
+            ValueError: If a placeholder is malformed.
+        """
+        return QueryTemplate(self.build())
+
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    """An SMW query with named placeholders, compiled once and bound to values many times.
+
+    The query text is validated once when the template is created, so
+    binding values only escapes them (see `escape_value`) and substitutes
+    them into the text. Templates compare and hash by their
+    text, so they can serve as cache and deduplication keys.
+
+    Examples:
+        >>> template = QueryTemplate("[[Category:City]][[Located in::{country}]]|?Population|limit={limit}")
+        >>> template.fields
+        ('country', 'limit')
+        >>> template.bind(country="France", limit=50)
+        '[[Category:City]][[Located in::France]]|?Population|limit=50'
+
+    Attributes:
+        text: The query with ``{name}`` placeholders; literal braces are doubled.
+        fields: The placeholder names, in order of first occurrence.
+    """
+
+    text: str
+    fields: tuple[str, ...] = field(init=False, compare=False)
+    _field_set: frozenset[str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Split the text into fixed parts and placeholders.
+
+        Raises:
+            ValueError: If a placeholder is unnamed, has a format specification
+                or conversion, or the braces are unbalanced.
+        """
+        names: list[str] = []
+        for _, name, format_spec, conversion in string.Formatter().parse(self.text):
+            if name is None:
+                continue
+            if not name.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Invalid placeholder {{{name}}} in query template; use {{name}}")
+            names.append(name)
+        # With only plain named fields left, the text itself is the compiled form: str.format_map
+        # substitutes the values in C without parsing conditions or joining parts in Python.
+        object.__setattr__(self, "fields", tuple(dict.fromkeys(names)))
+        object.__setattr__(self, "_field_set", frozenset(names))
+
+    def bind(self, values: Mapping[str, Any] | None = None, /, **kwargs: Any) -> str:
+        """Substitute escaped values for the placeholders.
+
+        Args:
+            values: Values by placeholder name.
+            **kwargs: Further values by placeholder name.
+
+        Returns:
+            The query string.
+
+        Raises:
+            ValueError: If a placeholder has no value or a value has no placeholder.
+        """
+        if values:
+            kwargs = {**values, **kwargs}
+        if kwargs.keys() != self._field_set:
+            missing = [name for name in self.fields if name not in kwargs]
+            unknown = [name for name in kwargs if name not in self._field_set]
+            raise ValueError(f"Query template values do not match its fields: missing {missing}, unknown {unknown}")
+        return self.text.format_map({name: escape_value(value) for name, value in kwargs.items()})
+
+    def __str__(self) -> str:
+        """Return the template text."""
+        return self.text
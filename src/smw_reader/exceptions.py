@@ -11,6 +11,7 @@ class SMWAPIError(Exception):
         message: str,
         status_code: int | None = None,
         response_data: dict[str, Any] | None = None,
+        retry_after: float | None = None,
     ) -> None:
         """Initialize SMW API error.
 
@@ -18,10 +19,13 @@ class SMWAPIError(Exception):
             message: Error message.
             status_code: HTTP status code if available.
             response_data: Response data if available.
+            retry_after: Seconds the server asked the client to wait before
+                retrying (its Retry-After header), if available.
         """
         super().__init__(message)
         self.status_code = status_code
         self.response_data = response_data
+        self.retry_after = retry_after
 
 
 class SMWConnectionError(SMWAPIError):
@@ -46,3 +50,9 @@ class SMWServerError(SMWAPIError):
     """Exception raised when the SMW server returns an error."""
 
     pass
+
+
+class SMWResultLimitWarning(UserWarning):
+    """Warning issued when a result set is cut off by the server's maximum query offset."""
+
+    pass
@@ -0,0 +1,336 @@
+"""Batched export of paginated ask queries to CSV, JSON Lines, Parquet and Arrow files.
+
+Results are converted and written in batches of bounded size as pages
+arrive, so the memory needed for an export does not depend on the size of
+the result set. The column schema is taken from the printrequests of the
+first page and kept for every batch.
+
+Parquet and Arrow output require the optional `pyarrow` package (the
+`parquet` extra).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import time
+from abc import abstractmethod
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import IO, Any
+
+import pandas as pd
+
+from ._optional import require_module
+from .endpoints.ask import iter_result_rows
+from .frames import SUBJECT_COLUMN, ColumnKind, MultiValue, column_kinds, to_dataframe
+from .interfaces import ExportSink
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+@dataclass
+class ExportStats:
+    """Size and throughput of a finished export.
+
+    Attributes:
+        rows: Number of rows written.
+        batches: Number of batches (row groups) written.
+        bytes_written: Size of the output in bytes.
+        seconds: Wall-clock duration of the export, including fetching.
+    """
+
+    rows: int = 0
+    batches: int = 0
+    bytes_written: int = 0
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        """Rows written per second."""
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def megabytes_per_second(self) -> float:
+        """Megabytes (10^6 bytes) written per second."""
+        return self.bytes_written / 1e6 / self.seconds if self.seconds else 0.0
+
+    def __str__(self) -> str:
+        """Summarize the export in one line."""
+        return (
+            f"{self.rows} rows in {self.batches} batches, {self.bytes_written / 1e6:.1f} MB in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s, {self.megabytes_per_second:.1f} MB/s)"
+        )
+
+
+def export_pages(
+    pages: Iterable[dict[str, Any]],
+    sink: ExportSink,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    multivalue: MultiValue = "list",
+) -> ExportStats:
+    """Write the results of successive ask responses to a sink in batches.
+
+    Args:
+        pages: Ask responses, typically from `AskEndpoint.iter_pages`.
+        sink: The destination. It is closed when the export ends, also on errors.
+        batch_size: Maximum number of results converted and written at once.
+        multivalue: How printouts with several values are represented (see
+            `frames.to_dataframe`).
+
+    Returns:
+        The size and throughput of the export.
+
+    Raises:
+        ValueError: If batch_size is smaller than 1.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    stats = ExportStats()
+    start = time.perf_counter()
+    kinds: dict[str, ColumnKind] | None = None
+    batch: list[tuple[str, dict[str, Any]]] = []
+
+    def flush(rows: list[tuple[str, dict[str, Any]]]) -> None:
+        frame = to_dataframe(rows, multivalue=multivalue, kinds=kinds)
+        sink.write(frame)
+        stats.rows += len(frame)
+        stats.batches += 1
+
+    try:
+        for page in pages:
+            if kinds is None:
+                kinds = column_kinds(page)
+                sink.open(kinds, multivalue)
+            batch.extend(iter_result_rows(page))
+            while len(batch) >= batch_size:
+                flush(batch[:batch_size])
+                del batch[:batch_size]
+        if kinds is None:
+            kinds = {}
+            sink.open(kinds, multivalue)
+        if batch:
+            flush(batch)
+    finally:
+        stats.bytes_written = sink.close()
+        stats.seconds = time.perf_counter() - start
+    return stats
+
+
+class _FileSink(ExportSink):
+    """Base class for sinks writing to a file path."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        self._opened = False
+
+    def open(self, kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> None:
+        self.kinds = dict(kinds)
+        self.multivalue = multivalue
+        self._opened = True
+
+    def close(self) -> int:
+        if not self._opened:
+            return 0
+        self._opened = False
+        return os.path.getsize(self.path)
+
+
+class CSVSink(_FileSink):
+    """Write results as CSV with a header row.
+
+    In 'list' mode the values of multi-valued printouts are joined with
+    `separator`. Dates are written in ISO 8601 format.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], separator: str = "; ", encoding: str = "utf-8") -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The output file; it is replaced if it exists.
+            separator: String placed between the values of a multi-valued printout.
+            encoding: Text encoding of the file.
+        """
+        super().__init__(path)
+        self.separator = separator
+        self.encoding = encoding
+        self._file: IO[str] | None = None
+
+    def open(self, kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> None:
+        """Create the file and write the header row."""
+        super().open(kinds, multivalue)
+        self._file = open(self.path, "w", newline="", encoding=self.encoding)  # noqa: SIM115
+        csv.writer(self._file).writerow([SUBJECT_COLUMN, *self.kinds])
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """Append a batch of rows."""
+        if self._file is None:
+            raise RuntimeError("CSVSink.write called before open")
+        if self.multivalue == "list":
+            frame = frame.copy()
+            for label in self.kinds:
+                frame[label] = [self.separator.join(map(_text, values)) for values in frame[label]]
+        frame.to_csv(self._file, header=False, index=False, date_format="%Y-%m-%dT%H:%M:%SZ")
+
+    def close(self) -> int:
+        """Close the file and return its size."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return super().close()
+
+
+class JSONLinesSink(_FileSink):
+    """Write results as JSON Lines, one object per row.
+
+    Multi-valued printouts are written as arrays in 'list' mode, dates as ISO
+    8601 strings and missing values as null.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The output file; it is replaced if it exists.
+        """
+        super().__init__(path)
+        self._file: IO[str] | None = None
+
+    def open(self, kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> None:
+        """Create the file."""
+        super().open(kinds, multivalue)
+        self._file = open(self.path, "w", encoding="utf-8")  # noqa: SIM115
+
+    def write(self, frame: pd.DataFrame) -> None:
+        """Append a batch of rows."""
+        if self._file is None:
+            raise RuntimeError("JSONLinesSink.write called before open")
+        if len(frame):
+            frame.to_json(self._file, orient="records", lines=True, date_format="iso", force_ascii=False)
+
+    def close(self) -> int:
+        """Close the file and return its size."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        return super().close()
+
+
+class _ArrowFileSink(_FileSink):
+    """Base class for sinks writing Arrow tables with a schema fixed at open time."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        super().__init__(path)
+        self._pa: Any = require_module("pyarrow", "parquet", "Parquet and Arrow export")
+        self._writer: Any = None
+
+    def open(self, kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> None:
+        super().open(kinds, multivalue)
+        self.schema = arrow_schema(kinds, multivalue)
+        self._writer = self._new_writer()
+
+    def write(self, frame: pd.DataFrame) -> None:
+        if self._writer is None:
+            raise RuntimeError(f"{type(self).__name__}.write called before open")
+        for label, kind in self.kinds.items():
+            if kind == "text" and frame[label].dtype == object:
+                frame = frame.assign(**{label: frame[label].map(_text_or_list, na_action="ignore")})
+        table = self._pa.Table.from_pandas(frame, schema=self.schema, preserve_index=False)
+        self._writer.write_table(table)
+
+    def close(self) -> int:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        return super().close()
+
+    @abstractmethod
+    def _new_writer(self) -> Any:
+        """Create the writer for the file, with the schema set by `open`."""
+
+
+class ParquetSink(_ArrowFileSink):
+    """Write results to a Parquet file, one row group per batch (requires pyarrow)."""
+
+    def __init__(self, path: str | os.PathLike[str], compression: str = "snappy") -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The output file; it is replaced if it exists.
+            compression: Parquet compression codec, e.g. 'snappy', 'zstd' or 'none'.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        super().__init__(path)
+        self.compression = compression
+
+    def _new_writer(self) -> Any:
+        parquet = require_module("pyarrow.parquet", "parquet", "Parquet export")
+        return parquet.ParquetWriter(self.path, self.schema, compression=self.compression)
+
+
+class ArrowSink(_ArrowFileSink):
+    """Write results to an Arrow IPC (Feather v2) file, one record batch per batch (requires pyarrow)."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        """Initialize the sink.
+
+        Args:
+            path: The output file; it is replaced if it exists.
+
+        Raises:
+            ImportError: If pyarrow is not installed.
+        """
+        super().__init__(path)
+
+    def _new_writer(self) -> Any:
+        return self._pa.ipc.new_file(self.path, self.schema)
+
+
+def arrow_schema(kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> Any:
+    """Build the Arrow schema of an export.
+
+    Args:
+        kinds: The printout columns and their kinds.
+        multivalue: How printouts with several values are represented; in
+            'list' mode every printout column is a list column.
+
+    Returns:
+        A `pyarrow.Schema` with a 'subject' column followed by the printouts.
+
+    Raises:
+        ImportError: If pyarrow is not installed.
+    """
+    pa: Any = require_module("pyarrow", "parquet", "Parquet and Arrow export")
+    types = {
+        "number": pa.float64(),
+        "quantity": pa.float64(),
+        "date": pa.timestamp("us", tz="UTC"),
+        "page": pa.string(),
+        "boolean": pa.bool_(),
+        "text": pa.string(),
+    }
+    fields = [pa.field(SUBJECT_COLUMN, pa.string())]
+    for label, kind in kinds.items():
+        value_type = types[kind]
+        fields.append(pa.field(label, pa.list_(value_type) if multivalue == "list" else value_type))
+    return pa.schema(fields)
+
+
+def _text(value: Any) -> str:
+    """Format a single value for a text file."""
+    if isinstance(value, pd.Timestamp):
+        return str(value.strftime("%Y-%m-%dT%H:%M:%SZ"))
+    if isinstance(value, str):
+        return value
+    return json.dumps(value, ensure_ascii=False) if isinstance(value, dict | list) else str(value)
+
+
+def _text_or_list(value: Any) -> Any:
+    """Format the values of a text column whose values are not all strings."""
+    if isinstance(value, list):
+        return [_text(item) for item in value]
+    return _text(value)
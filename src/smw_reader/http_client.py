@@ -1,13 +1,151 @@
 """HTTP client implementation for SMW API requests."""
 
-import json
+from __future__ import annotations
+
+import http.client
+import threading
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
-from typing import Any
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+from types import TracebackType
+from typing import Any, Self, TypeVar
+
+from .compression import ACCEPT_ENCODING, DecodedStream
+from .connection_pool import ConnectionPool, PoolKey, pool_key
+from .exceptions import SMWAPIError, SMWConnectionError, SMWServerError
+from .interfaces import ConditionalResponse, HTTPClient
+from .json_decoding import JSONDecoder, get_decoder
+from .retry import RetryPolicy
+
+_T = TypeVar("_T")
+
+_REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+_MAX_REDIRECTS = 5
+_DEFAULT_DECODER = get_decoder()
+
+
+def parse_json_object(payload: bytes | bytearray, decoder: JSONDecoder | None = None) -> dict[str, Any]:
+    """Parse a response body as a JSON object.
+
+    The body is handed to the decoder as is, without decoding it to a str first.
+
+    Args:
+        payload: The raw response body.
+        decoder: The JSON decoder to use. If None, the fastest installed one
+            is used (see `smw_reader.json_decoding.DECODERS`).
+
+    Returns:
+        The parsed JSON object.
+
+    Raises:
+        SMWServerError: If the body is not a valid JSON object.
+    """
+    try:
+        parsed_json = (decoder or _DEFAULT_DECODER)(payload)
+    except ValueError as e:
+        raise SMWServerError(f"Invalid JSON response: {e}") from e
+    if not isinstance(parsed_json, dict):
+        raise SMWServerError("Expected JSON object, got different type")
+    return parsed_json
+
+
+def _with_query(url: str, params: dict[str, Any] | None) -> str:
+    """Append parameters, converted to strings, to a URL as its query string."""
+    if not params:
+        return url
+    return f"{url}?{urllib.parse.urlencode({k: str(v) for k, v in params.items()})}"
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header value.
+
+    Args:
+        value: The header value, either a number of seconds or an HTTP date.
+
+    Returns:
+        The number of seconds to wait (0 for dates in the past), or None if the
+        value is missing or malformed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
 
-from .exceptions import SMWConnectionError, SMWServerError
-from .interfaces import HTTPClient
+def http_status_error(
+    status: int, reason: str, payload: bytes | bytearray, retry_after: str | None = None
+) -> SMWServerError:
+    """Build the error raised for an HTTP error status.
+
+    Args:
+        status: The HTTP status code.
+        reason: The HTTP reason phrase.
+        payload: The (decoded) response body.
+        retry_after: The response's Retry-After header, if any.
+
+    Returns:
+        An SMWServerError describing the response.
+    """
+    error_body = bytes(payload).decode("utf-8", errors="replace") or "No error details"
+    return SMWServerError(
+        f"HTTP {status}: {reason}. Response: {error_body}",
+        status_code=status,
+        response_data={"error": error_body},
+        retry_after=parse_retry_after(retry_after),
+    )
+
+
+@dataclass(frozen=True)
+class TransferStats:
+    """Byte counts and timings recorded for one HTTP response.
+
+    Attributes:
+        url: The requested URL.
+        status: The HTTP status code.
+        content_encoding: The response's content coding ('identity' if uncompressed).
+        wire_bytes: Body bytes received over the network (compressed size).
+        body_bytes: Body bytes after decompression.
+        connect: Seconds spent opening a new connection (0 for a reused one).
+        ttfb: Seconds from sending the request to receiving the response
+            headers (time to first byte).
+        read: Seconds spent reading the body, excluding decompression. For
+            streamed responses this includes the time the consumer spent
+            between chunks.
+        decode: Seconds spent decompressing the body.
+        parse: Seconds spent decoding the JSON body (0 for streamed responses).
+        retries: Number of retries that preceded the response (see `RetryPolicy`).
+    """
+
+    url: str
+    status: int
+    content_encoding: str
+    wire_bytes: int
+    body_bytes: int
+    connect: float = 0.0
+    ttfb: float = 0.0
+    read: float = 0.0
+    decode: float = 0.0
+    parse: float = 0.0
+    retries: int = 0
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decompressed size divided by transferred size (1.0 for uncompressed bodies)."""
+        return self.body_bytes / self.wire_bytes if self.wire_bytes else 1.0
 
 
 class RequestsHTTPClient(HTTPClient):
@@ -15,17 +153,51 @@ class RequestsHTTPClient(HTTPClient):
 
     This implementation uses only standard library modules to avoid
     external dependencies while providing robust HTTP functionality.
+
+    With a `RetryPolicy`, requests failing with a transient error are sent
+    again after a randomized exponential backoff. The number of retries of
+    the last request made on the calling thread is available as `last_retries`,
+    and the byte counts and timings of its response as `last_transfer`.
     """
 
-    def __init__(self, timeout: float = 30.0, user_agent: str = "SMW-Reader/0.1.0") -> None:
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        user_agent: str = "SMW-Reader/0.1.0",
+        retry: RetryPolicy | None = None,
+        json_decoder: str | JSONDecoder | None = None,
+    ) -> None:
         """Initialize the HTTP client.
 
         Args:
             timeout: Request timeout in seconds.
             user_agent: User agent string for requests.
+            retry: Policy for retrying failed requests. If None, failures are
+                raised at once.
+            json_decoder: JSON decoder for response bodies: the name of an
+                installed library ('orjson', 'msgspec', 'ujson', 'json') or a
+                function. If None, the fastest installed library is used.
+
+        Raises:
+            ValueError: If the named JSON decoder is not installed.
         """
         self.timeout = timeout
         self.user_agent = user_agent
+        self.retry = retry
+        self.json_decoder = get_decoder(json_decoder)
+        self._local = threading.local()
+
+    @property
+    def last_retries(self) -> int:
+        """Number of retries of the last request made on the calling thread."""
+        retries: int = getattr(self._local, "retries", 0)
+        return retries
+
+    @property
+    def last_transfer(self) -> TransferStats | None:
+        """Byte counts and timings of the last response received on the calling thread."""
+        stats: TransferStats | None = getattr(self._local, "last_transfer", None)
+        return stats
 
     def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
         """Make a GET request.
@@ -42,13 +214,8 @@ class RequestsHTTPClient(HTTPClient):
             SMWConnectionError: If the connection fails.
             SMWServerError: If the server returns an error.
         """
-        if params:
-            # Convert parameters to strings and encode
-            str_params = {k: str(v) for k, v in params.items()}
-            query_string = urllib.parse.urlencode(str_params)
-            url = f"{url}?{query_string}"
-
-        return self._make_request(url, method="GET", **kwargs)
+        url = _with_query(url, params)
+        return self._retrying("GET", lambda: self._make_request(url, method="GET", **kwargs))
 
     def post(self, url: str, data: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
         """Make a POST request.
@@ -65,7 +232,19 @@ class RequestsHTTPClient(HTTPClient):
             SMWConnectionError: If the connection fails.
             SMWServerError: If the server returns an error.
         """
-        return self._make_request(url, method="POST", data=data, **kwargs)
+        return self._retrying("POST", lambda: self._make_request(url, method="POST", data=data, **kwargs))
+
+    def _retrying(self, method: str, send: Callable[[], _T]) -> _T:
+        """Call `send`, sending the request again as far as the retry policy allows."""
+        self._local.retries = 0
+        self._local.last_transfer = None
+        if self.retry is None:
+            return send()
+
+        def count(retry: int, error: SMWAPIError, delay: float) -> None:
+            self._local.retries = retry
+
+        return self.retry.call(method, send, on_retry=count)
 
     def _make_request(
         self,
@@ -103,17 +282,20 @@ class RequestsHTTPClient(HTTPClient):
                 request.add_header("Content-Type", "application/x-www-form-urlencoded")
 
             # Make request
+            start = time.perf_counter()
             with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                response_text = response.read().decode("utf-8")
-
-                # Try to parse JSON response
-                try:
-                    parsed_json = json.loads(response_text)
-                    if not isinstance(parsed_json, dict):
-                        raise SMWServerError("Expected JSON object, got different type")
-                    return parsed_json
-                except json.JSONDecodeError as e:
-                    raise SMWServerError(f"Invalid JSON response: {e}") from e
+                headers_received = time.perf_counter()
+                payload = response.read()
+                self._local.last_transfer = TransferStats(
+                    url=url,
+                    status=response.status,
+                    content_encoding="identity",
+                    wire_bytes=len(payload),
+                    body_bytes=len(payload),
+                    ttfb=headers_received - start,
+                    read=time.perf_counter() - headers_received,
+                    retries=self.last_retries,
+                )
 
         except urllib.error.HTTPError as e:
             error_body = e.read().decode("utf-8") if e.fp else "No error details"
@@ -121,8 +303,375 @@ class RequestsHTTPClient(HTTPClient):
                 f"HTTP {e.code}: {e.reason}. Response: {error_body}",
                 status_code=e.code,
                 response_data={"error": error_body},
+                retry_after=parse_retry_after(e.headers.get("Retry-After") if e.headers else None),
             ) from e
         except urllib.error.URLError as e:
             raise SMWConnectionError(f"Connection error: {e.reason}") from e
         except Exception as e:
             raise SMWConnectionError(f"Unexpected error: {e}") from e
+        # Parsed outside the handlers above: a malformed body is a server error, not a transient connection failure.
+        return self._parse_json(payload)
+
+    def _parse_json(self, payload: bytes | bytearray) -> dict[str, Any]:
+        """Parse a response body as a JSON object, recording the time taken in `last_transfer`.
+
+        Args:
+            payload: The raw response body.
+
+        Returns:
+            The parsed JSON object.
+
+        Raises:
+            SMWServerError: If the body is not a valid JSON object.
+        """
+        start = time.perf_counter()
+        data = parse_json_object(payload, self.json_decoder)
+        if self.last_transfer is not None:
+            self._local.last_transfer = replace(self.last_transfer, parse=time.perf_counter() - start)
+        return data
+
+
+class PooledHTTPClient(RequestsHTTPClient):
+    """HTTP client that reuses HTTP/1.1 keep-alive connections (no external dependencies).
+
+    Instead of opening a new connection (and TLS session) for every request,
+    connections are kept in a per-host `ConnectionPool` and reused by later
+    requests, which makes paginated queries against the same wiki much cheaper.
+    The client is safe to share between threads.
+
+    Responses are requested with `Accept-Encoding` (gzip and deflate, plus br
+    and zstd when a decoder module is installed) and decompressed chunk by
+    chunk while they are read. The byte counts and timings of the most recent
+    response on the calling thread are available as `last_transfer`.
+
+    Examples:
+        >>> with PooledHTTPClient(pool_size=4) as http_client:
+        ...     site = SMWClient("https://example.org/w/", http_client=http_client)
+    """
+
+    def __init__(
+        self,
+        timeout: float = 30.0,
+        user_agent: str = "SMW-Reader/0.1.0",
+        pool_size: int = 10,
+        idle_timeout: float = 60.0,
+        pool: ConnectionPool | None = None,
+        compression: bool = True,
+        retry: RetryPolicy | None = None,
+        json_decoder: str | JSONDecoder | None = None,
+    ) -> None:
+        """Initialize the pooled HTTP client.
+
+        Args:
+            timeout: Request timeout in seconds.
+            user_agent: User agent string for requests.
+            pool_size: Maximum number of idle connections kept per host.
+            idle_timeout: Seconds an idle connection is kept before it is closed.
+            pool: Connection pool to use. If None, a new pool is created from
+                `pool_size`, `idle_timeout` and `timeout`.
+            compression: Whether to ask the server for compressed responses.
+            retry: Policy for retrying failed requests (not applied to
+                `get_stream`). If None, failures are raised at once.
+            json_decoder: JSON decoder for response bodies: the name of an
+                installed library ('orjson', 'msgspec', 'ujson', 'json') or a
+                function. If None, the fastest installed library is used.
+
+        Raises:
+            ValueError: If the named JSON decoder is not installed.
+        """
+        super().__init__(timeout=timeout, user_agent=user_agent, retry=retry, json_decoder=json_decoder)
+        self.pool = pool or ConnectionPool(maxsize=pool_size, idle_timeout=idle_timeout, timeout=timeout)
+        self.compression = compression
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        self.pool.close()
+
+    def __enter__(self) -> Self:
+        """Enter the runtime context and return the client."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close pooled connections when leaving the runtime context."""
+        self.close()
+
+    def conditional_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        **kwargs: Any,
+    ) -> ConditionalResponse:
+        """Make a GET request carrying the validators of a cached response.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            etag: ETag of the cached representation, sent as If-None-Match.
+            last_modified: Last-Modified of the cached representation, sent as If-Modified-Since.
+            **kwargs: Additional request parameters.
+
+        Returns:
+            The response data and validators, or a not-modified result if the
+            server answered 304.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        url = _with_query(url, params)
+        response, payload = self._retrying("GET", lambda: self._fetch(url, "GET", None, headers))
+        if response.status == 304:
+            # A 304 may omit validators that did not change.
+            return ConditionalResponse(
+                None,
+                etag=response.getheader("ETag") or etag,
+                last_modified=response.getheader("Last-Modified") or last_modified,
+            )
+        return ConditionalResponse(
+            self._parse_json(payload),
+            etag=response.getheader("ETag") or None,
+            last_modified=response.getheader("Last-Modified") or None,
+        )
+
+    def get_stream(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> Iterator[bytes]:
+        """Make a GET request and yield the decompressed body while it arrives.
+
+        The connection stays checked out of the pool until the body has been
+        consumed; if iteration stops early, the connection is closed.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            **kwargs: Additional request parameters.
+
+        Yields:
+            Decoded chunks of the response body.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        url = _with_query(url, params)
+        headers = self._headers()
+        self._local.retries = 0
+        self._local.last_transfer = None
+        try:
+            for _ in range(_MAX_REDIRECTS + 1):
+                timings: dict[str, float] = {}
+                with self._open("GET", url, None, headers, timings) as response:
+                    location = response.getheader("Location")
+                    stream = DecodedStream(response, response.getheader("Content-Encoding"))
+                    redirect = response.status in _REDIRECT_STATUSES and bool(location)
+                    read_start = time.perf_counter()
+                    if redirect or response.status >= 400:
+                        payload = stream.read()
+                    else:
+                        yield from stream
+                    timings["read"] = time.perf_counter() - read_start
+                self._local.last_transfer = self._transfer_stats(url, response, stream, timings)
+                if response.status >= 400:
+                    raise http_status_error(
+                        response.status, response.reason, payload, response.getheader("Retry-After")
+                    )
+                if not redirect or not location:
+                    return
+                url = urllib.parse.urljoin(url, location)
+            raise SMWConnectionError(f"Too many redirects (more than {_MAX_REDIRECTS})")
+        except SMWAPIError:
+            raise
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise SMWConnectionError(f"Connection error: {e}") from e
+
+    def _make_request(
+        self,
+        url: str,
+        method: str = "GET",
+        data: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an HTTP request over a pooled connection.
+
+        Args:
+            url: The URL to request.
+            method: HTTP method.
+            data: Request body data for POST requests.
+            **kwargs: Additional request parameters.
+
+        Returns:
+            The response data as a dictionary.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error.
+        """
+        _, payload = self._fetch(url, method, data)
+        return self._parse_json(payload)
+
+    def _fetch(
+        self,
+        url: str,
+        method: str,
+        data: dict[str, Any] | None,
+        extra_headers: dict[str, str] | None = None,
+    ) -> tuple[http.client.HTTPResponse, bytearray]:
+        """Send a request, following redirects, and read the decoded body.
+
+        Args:
+            url: The URL to request.
+            method: HTTP method.
+            data: Request body data for POST requests.
+            extra_headers: Headers to send in addition to the default ones.
+
+        Returns:
+            The final (closed) response and its decoded body.
+
+        Raises:
+            SMWConnectionError: If the connection fails.
+            SMWServerError: If the server returns an error status.
+        """
+        body = None
+        headers = self._headers()
+        if data and method == "POST":
+            body = urllib.parse.urlencode(data).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        headers.update(extra_headers or {})
+
+        try:
+            for _ in range(_MAX_REDIRECTS + 1):
+                timings: dict[str, float] = {}
+                with self._open(method, url, body, headers, timings) as response:
+                    location = response.getheader("Location")
+                    stream = DecodedStream(response, response.getheader("Content-Encoding"))
+                    read_start = time.perf_counter()
+                    payload = stream.read()
+                    timings["read"] = time.perf_counter() - read_start
+                self._local.last_transfer = self._transfer_stats(url, response, stream, timings)
+                if response.status not in _REDIRECT_STATUSES or not location:
+                    break
+                url = urllib.parse.urljoin(url, location)
+                if response.status == 303 or (response.status in (301, 302) and method == "POST"):
+                    method, body = "GET", None
+                    headers.pop("Content-Type", None)
+            else:
+                raise SMWConnectionError(f"Too many redirects (more than {_MAX_REDIRECTS})")
+        except SMWAPIError:
+            raise
+        except (OSError, http.client.HTTPException, ValueError) as e:
+            raise SMWConnectionError(f"Connection error: {e}") from e
+
+        if response.status >= 400:
+            raise http_status_error(response.status, response.reason, payload, response.getheader("Retry-After"))
+        return response, payload
+
+    def _transfer_stats(
+        self, url: str, response: http.client.HTTPResponse, stream: DecodedStream, timings: dict[str, float]
+    ) -> TransferStats:
+        """Summarize a response whose body has been read."""
+        return TransferStats(
+            url=url,
+            status=response.status,
+            content_encoding=stream.content_encoding,
+            wire_bytes=stream.wire_bytes,
+            body_bytes=stream.body_bytes,
+            connect=timings["connect"],
+            ttfb=timings["ttfb"],
+            read=timings["read"] - stream.decode_seconds,
+            decode=stream.decode_seconds,
+            retries=self.last_retries,
+        )
+
+    def _headers(self) -> dict[str, str]:
+        """Build the headers sent with every request."""
+        headers = {"User-Agent": self.user_agent, "Accept": "application/json"}
+        if self.compression:
+            headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return headers
+
+    @contextmanager
+    def _open(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timings: dict[str, float],
+    ) -> Iterator[http.client.HTTPResponse]:
+        """Send a request on a pooled connection and yield the response.
+
+        The connection goes back to the pool when the response has been read
+        completely and the server allows keep-alive; otherwise it is closed.
+        A reused connection that turns out to be closed by the server is
+        replaced by a fresh one transparently.
+
+        Args:
+            method: HTTP method.
+            url: The absolute URL to request.
+            body: Encoded request body, if any.
+            headers: Request headers.
+            timings: Receives the 'connect' and 'ttfb' durations in seconds.
+
+        Yields:
+            The HTTP response, positioned at the start of the body.
+        """
+        key = pool_key(url)
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+
+        connection, response = self._send(key, method, target, body, headers, timings)
+        try:
+            yield response
+        except BaseException:
+            connection.close()
+            raise
+        # A length-delimited body read with read1() ends with length 0 but is not marked closed.
+        if not response.will_close and (response.isclosed() or response.length == 0):
+            response.close()
+            self.pool.release(key, connection)
+        else:
+            connection.close()
+
+    def _send(
+        self,
+        key: PoolKey,
+        method: str,
+        target: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        timings: dict[str, float],
+    ) -> tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """Send a request, retrying once on a fresh connection if a reused one was stale."""
+        while True:
+            connection, reused = self.pool.acquire(key)
+            try:
+                connect = 0.0
+                if connection.sock is None:
+                    start = time.perf_counter()
+                    connection.connect()
+                    connect = time.perf_counter() - start
+                sent = time.perf_counter()
+                connection.request(method, target, body=body, headers=headers)
+                response = connection.getresponse()
+                timings["connect"] = connect
+                timings["ttfb"] = time.perf_counter() - sent
+                return connection, response
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                connection.close()
+                if not reused:
+                    raise
+            except BaseException:
+                connection.close()
+                raise
@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import json
 from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    import pandas as pd
+
+    from .async_client import AsyncSMWClient
+    from .cache import CacheEntry, CacheStats
     from .client import SMWClient
+    from .frames import ColumnKind, MultiValue
+    from .http_client import TransferStats
+    from .metrics import RequestEvent
 
 
 class APIEndpoint(ABC):
@@ -46,6 +56,26 @@ class APIEndpoint(ABC):
         pass
 
 
+@dataclass(frozen=True)
+class ConditionalResponse:
+    """Result of a conditional GET request.
+
+    Attributes:
+        data: The response data, or None if the server answered 304 Not Modified.
+        etag: The ETag validator of the current representation, if known.
+        last_modified: The Last-Modified validator of the current representation, if known.
+    """
+
+    data: dict[str, Any] | None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def not_modified(self) -> bool:
+        """Whether the server confirmed that the cached representation is current."""
+        return self.data is None
+
+
 class HTTPClient(ABC):
     """Abstract interface for HTTP clients to enable dependency injection."""
 
@@ -76,3 +106,273 @@ class HTTPClient(ABC):
             The response data.
         """
         pass
+
+    def conditional_get(
+        self,
+        url: str,
+        params: dict[str, Any] | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        **kwargs: Any,
+    ) -> ConditionalResponse:
+        """Make a GET request that the server may answer with 304 Not Modified.
+
+        The default implementation ignores the validators and performs a plain
+        `get`, so every HTTP client supports caching; clients that can send
+        `If-None-Match`/`If-Modified-Since` should override it.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            etag: ETag of the cached representation, sent as If-None-Match.
+            last_modified: Last-Modified of the cached representation, sent as If-Modified-Since.
+            **kwargs: Additional request parameters.
+
+        Returns:
+            The response data and validators, or a not-modified result.
+        """
+        return ConditionalResponse(self.get(url, params=params, **kwargs))
+
+    def get_stream(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> Iterator[bytes]:
+        """Make a GET request and yield the (decoded) response body in chunks.
+
+        The default implementation performs a plain `get` and yields the
+        re-encoded response at once; clients that can read the body while it
+        arrives should override it.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            **kwargs: Additional request parameters.
+
+        Yields:
+            Chunks of the JSON response body.
+        """
+        yield json.dumps(self.get(url, params=params, **kwargs)).encode("utf-8")
+
+    @property
+    def last_transfer(self) -> TransferStats | None:
+        """Byte counts and timings of the last response received on the calling thread.
+
+        Clients that do not record them return None.
+        """
+        return None
+
+
+class AsyncAPIEndpoint(ABC):
+    """Abstract base class for SMW API endpoints used with the asyncio client."""
+
+    def __init__(self, client: AsyncSMWClient) -> None:
+        """Initialize the endpoint with a client instance.
+
+        Args:
+            client: The async SMW client instance for making requests.
+        """
+        self._client = client
+
+    @abstractmethod
+    async def execute(self, **params: Any) -> dict[str, Any]:
+        """Execute the API endpoint with given parameters.
+
+        Args:
+            **params: Endpoint-specific parameters.
+
+        Returns:
+            The API response as a dictionary.
+
+        Raises:
+            SMWAPIError: If the API request fails.
+        """
+        pass
+
+    @property
+    @abstractmethod
+    def endpoint_name(self) -> str:
+        """The name of the API endpoint (e.g., 'ask', 'askargs', 'smwbrowse')."""
+        pass
+
+
+class AsyncHTTPClient(ABC):
+    """Abstract interface for asyncio HTTP clients to enable dependency injection."""
+
+    @abstractmethod
+    async def get(self, url: str, params: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a GET request.
+
+        Args:
+            url: The URL to request.
+            params: Query parameters.
+            **kwargs: Additional request parameters.
+
+        Returns:
+            The response data.
+        """
+        pass
+
+    @abstractmethod
+    async def post(self, url: str, data: dict[str, Any] | None = None, **kwargs: Any) -> dict[str, Any]:
+        """Make a POST request.
+
+        Args:
+            url: The URL to request.
+            data: Request body data.
+            **kwargs: Additional request parameters.
+
+        Returns:
+            The response data.
+        """
+        pass
+
+    async def close(self) -> None:  # noqa: B027
+        """Release network resources held by the client."""
+
+
+class ResponseCache(ABC):
+    """Abstract interface for caches of API responses used by `SMWClient`.
+
+    Attributes:
+        ttl: Default time to live of new entries in seconds.
+        stats: Counters describing the cache's effectiveness.
+    """
+
+    ttl: float
+    stats: CacheStats
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """Look up an entry.
+
+        Args:
+            key: The normalized request key.
+
+        Returns:
+            The entry, or None if there is none. Backends that support
+            revalidation may return stale entries carrying validators.
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry.
+
+        Args:
+            key: The normalized request key.
+            entry: The entry to store.
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove an entry.
+
+        Args:
+            key: The normalized request key.
+
+        Returns:
+            True if an entry was removed.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+        pass
+
+    @abstractmethod
+    def record_revalidation(self) -> None:
+        """Count a stale entry the server confirmed as unchanged in `stats`."""
+        pass
+
+
+class RateLimiter(ABC):
+    """Abstract interface for limiters pacing the requests of `SMWClient`.
+
+    The client calls `acquire` before sending each request and reports the
+    outcome with `record_success` or `record_throttle`. Throttled requests
+    are sent again up to `max_retries` times.
+
+    Attributes:
+        maxlag: Value of the `maxlag` parameter added to every request, or
+            None to not send it.
+        max_retries: How often a throttled request is sent again.
+    """
+
+    maxlag: int | None
+    max_retries: int
+
+    @abstractmethod
+    def acquire(self) -> float:
+        """Block until the next request may be sent.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        pass
+
+    @abstractmethod
+    def record_success(self) -> None:
+        """Report that a request was answered without throttling."""
+        pass
+
+    @abstractmethod
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Report that the server throttled a request.
+
+        Args:
+            retry_after: Seconds the server asked the client to wait, if it said so.
+        """
+        pass
+
+
+class RequestObserver(ABC):
+    """Abstract interface for receivers of the timing events `SMWClient` emits per request."""
+
+    @abstractmethod
+    def record(self, event: RequestEvent) -> None:
+        """Receive the event of one request sent to the server.
+
+        It is called on the thread that made the request, after the request
+        finished, and must not raise.
+
+        Args:
+            event: Timings, sizes and outcome of the request.
+        """
+        pass
+
+
+class ExportSink(ABC):
+    """Abstract interface for destinations of `AskEndpoint.export`.
+
+    A sink is opened once with the column schema of the query, receives the
+    results as DataFrames of bounded size, and is closed at the end.
+    """
+
+    @abstractmethod
+    def open(self, kinds: Mapping[str, ColumnKind], multivalue: MultiValue) -> None:
+        """Prepare for writing.
+
+        Args:
+            kinds: The printout columns and their kinds (see `frames.column_kinds`).
+                Every batch has a 'subject' column followed by these columns.
+            multivalue: How printouts with several values are represented in
+                the batches ('list', 'first' or 'explode').
+        """
+        pass
+
+    @abstractmethod
+    def write(self, frame: pd.DataFrame) -> None:
+        """Write one batch of results.
+
+        Args:
+            frame: The batch, as produced by `frames.to_dataframe`.
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> int:
+        """Finish writing. Closing a sink that was never opened does nothing.
+
+        Returns:
+            The number of bytes written.
+        """
+        pass
@@ -0,0 +1,80 @@
+"""Decoding of JSON response bodies with the fastest installed JSON library."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from types import ModuleType
+from typing import Any
+
+from ._optional import optional_module
+
+JSONDecoder = Callable[[bytes | bytearray], Any]
+"""A function parsing a JSON document from UTF-8 encoded bytes, raising ValueError if it is invalid."""
+
+
+def _msgspec_decoder(msgspec: ModuleType) -> JSONDecoder:
+    """Wrap msgspec's decoder so that it raises ValueError like the others."""
+    decode = msgspec.json.Decoder().decode
+
+    def loads(payload: bytes | bytearray) -> Any:
+        try:
+            return decode(payload)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+
+    return loads
+
+
+def _ujson_decoder(ujson: ModuleType) -> JSONDecoder:
+    """Wrap ujson's decoder, which accepts bytes but not bytearray."""
+
+    def loads(payload: bytes | bytearray) -> Any:
+        return ujson.loads(payload if isinstance(payload, bytes) else bytes(payload))
+
+    return loads
+
+
+def _available_decoders() -> dict[str, JSONDecoder]:
+    """Build the table of JSON decoders installed in this environment, fastest first."""
+    decoders: dict[str, JSONDecoder] = {}
+    orjson = optional_module("orjson")
+    if orjson is not None:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError and thus of ValueError.
+        decoders["orjson"] = orjson.loads
+    msgspec = optional_module("msgspec")
+    if msgspec is not None:
+        decoders["msgspec"] = _msgspec_decoder(msgspec)
+    ujson = optional_module("ujson")
+    if ujson is not None:
+        decoders["ujson"] = _ujson_decoder(ujson)
+    # json.loads detects the encoding of bytes itself; UnicodeDecodeError is a ValueError as well.
+    decoders["json"] = json.loads
+    return decoders
+
+
+DECODERS = _available_decoders()
+"""Installed JSON decoders by name, fastest first. 'json' (the standard library) is always available."""
+
+
+def get_decoder(decoder: str | JSONDecoder | None = None) -> JSONDecoder:
+    """Resolve the JSON decoder to use.
+
+    Args:
+        decoder: Name of an installed decoder ('orjson', 'msgspec', 'ujson' or
+            'json'), a decoding function, or None for the fastest installed one.
+
+    Returns:
+        The decoding function.
+
+    Raises:
+        ValueError: If the named decoder is not installed.
+    """
+    if decoder is None:
+        return next(iter(DECODERS.values()))
+    if callable(decoder):
+        return decoder
+    try:
+        return DECODERS[decoder]
+    except KeyError:
+        raise ValueError(f"JSON decoder {decoder!r} is not available; installed: {', '.join(DECODERS)}") from None
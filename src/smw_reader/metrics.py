@@ -0,0 +1,302 @@
+"""Per-request timing events and their aggregation into histograms."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from .interfaces import RequestObserver
+
+PHASES = ("connect", "ttfb", "read", "decode", "parse", "total")
+"""The timed phases of a request, in the order they happen ('total' spans all of them)."""
+
+DEFAULT_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Upper bounds in seconds of the latency histogram buckets."""
+
+DEFAULT_SIZE_BUCKETS = tuple(float(4**n) for n in range(5, 16))
+"""Upper bounds in bytes of the response size histogram buckets (1 KiB to 1 GiB)."""
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """Timings, sizes and outcome of one request sent to the SMW API.
+
+    Durations are in seconds. Phases the HTTP client does not measure are 0
+    (see `TransferStats`): `RequestsHTTPClient`, for instance, counts the
+    connection setup as part of the time to first byte.
+
+    Attributes:
+        action: The API action, e.g. 'ask'.
+        method: The HTTP method.
+        status: The HTTP status of the response, or None if no response was
+            received or the HTTP client does not report it.
+        total: Time from sending the request to having the parsed response.
+        connect: Time spent opening a new connection.
+        ttfb: Time from sending the request to receiving the response headers.
+        read: Time spent reading the body, excluding decompression.
+        decode: Time spent decompressing the body.
+        parse: Time spent decoding the JSON body.
+        wire_bytes: Body bytes received over the network.
+        body_bytes: Body bytes after decompression.
+        retries: Number of retries made by the HTTP client's retry policy.
+        error: Class name of the exception the request raised, or None.
+    """
+
+    action: str
+    method: str
+    status: int | None
+    total: float
+    connect: float = 0.0
+    ttfb: float = 0.0
+    read: float = 0.0
+    decode: float = 0.0
+    parse: float = 0.0
+    wire_bytes: int = 0
+    body_bytes: int = 0
+    retries: int = 0
+    error: str | None = None
+
+
+class Histogram:
+    """Histogram with fixed bucket bounds, in the style of Prometheus.
+
+    Attributes:
+        bounds: Upper bounds of the buckets in ascending order. Values above
+            the last bound fall into an additional overflow bucket.
+        counts: Number of observations per bucket, including the overflow bucket.
+        count: Total number of observations.
+        sum: Sum of all observed values.
+    """
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Initialize an empty histogram.
+
+        Args:
+            bounds: Upper bounds of the buckets; a value equal to a bound falls
+                into that bound's bucket.
+
+        Raises:
+            ValueError: If the bounds are empty or not strictly ascending.
+        """
+        if not bounds or any(a >= b for a, b in zip(bounds, bounds[1:], strict=False)):
+            raise ValueError("bucket bounds must be non-empty and strictly ascending")
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add an observation.
+
+        Args:
+            value: The observed value.
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    @property
+    def mean(self) -> float:
+        """Mean of the observations (NaN if there are none)."""
+        return self.sum / self.count if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q: The quantile, between 0 and 1 (0.5 for the median).
+
+        Returns:
+            The estimate, or NaN if there are no observations. Quantiles in the
+            overflow bucket are reported as the last bound.
+
+        Raises:
+            ValueError: If q is not between 0 and 1.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        below = 0
+        for index, bound in enumerate(self.bounds):
+            in_bucket = self.counts[index]
+            if in_bucket and below + in_bucket >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                return lower + (bound - lower) * (rank - below) / in_bucket
+            below += in_bucket
+        return self.bounds[-1]
+
+    def copy(self) -> Histogram:
+        """Return an independent copy of the histogram."""
+        copy = Histogram(self.bounds)
+        copy.counts = list(self.counts)
+        copy.count = self.count
+        copy.sum = self.sum
+        return copy
+
+
+class MetricsRecorder(RequestObserver):
+    """Thread-safe in-memory aggregation of request events, ready to be scraped.
+
+    Keeps a latency histogram per action and phase (see `PHASES`), response
+    size histograms per action, and counters of requests per action and
+    status and of retries per action.
+
+    Examples:
+        >>> metrics = MetricsRecorder()
+        >>> site = SMWClient("https://example.org/w/", observers=[metrics])
+        >>> site.ask.query("[[Category:Cities]]|?Population")
+        >>> metrics.histogram("ask", "ttfb").quantile(0.99)
+        0.412
+        >>> print(metrics.to_prometheus())
+        # HELP smw_reader_request_seconds Duration of SMW API requests by phase.
+        ...
+    """
+
+    def __init__(
+        self,
+        time_buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+        size_buckets: Sequence[float] = DEFAULT_SIZE_BUCKETS,
+    ) -> None:
+        """Initialize an empty recorder.
+
+        Args:
+            time_buckets: Upper bounds in seconds of the latency buckets.
+            size_buckets: Upper bounds in bytes of the response size buckets.
+        """
+        self.time_buckets = tuple(time_buckets)
+        self.size_buckets = tuple(size_buckets)
+        self._lock = threading.Lock()
+        self._timings: dict[tuple[str, str], Histogram] = {}
+        self._sizes: dict[tuple[str, str], Histogram] = {}
+        self._requests: Counter[tuple[str, str]] = Counter()
+        self._retries: Counter[str] = Counter()
+
+    def record(self, event: RequestEvent) -> None:
+        """Add a request event to the aggregates.
+
+        Args:
+            event: The event to add.
+        """
+        status = "error" if event.status is None else str(event.status)
+        with self._lock:
+            for phase in PHASES:
+                self._histogram(self._timings, (event.action, phase), self.time_buckets).observe(getattr(event, phase))
+            self._histogram(self._sizes, (event.action, "wire"), self.size_buckets).observe(event.wire_bytes)
+            self._histogram(self._sizes, (event.action, "body"), self.size_buckets).observe(event.body_bytes)
+            self._requests[event.action, status] += 1
+            self._retries[event.action] += event.retries
+
+    def histogram(self, action: str, phase: str = "total") -> Histogram:
+        """Return a copy of the latency histogram of an action and phase.
+
+        Args:
+            action: The API action.
+            phase: One of `PHASES`.
+
+        Returns:
+            The histogram; it is empty if no such request was recorded.
+        """
+        with self._lock:
+            histogram = self._timings.get((action, phase))
+            return histogram.copy() if histogram is not None else Histogram(self.time_buckets)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Summarize the aggregates as JSON-serializable data.
+
+        Returns:
+            Per action: request counts by status, the number of retries, and
+            the count, mean and 50th/90th/99th percentiles of every phase.
+        """
+        with self._lock:
+            summary: dict[str, Any] = {}
+            for (action, status), count in sorted(self._requests.items()):
+                entry = summary.setdefault(action, {"requests": {}, "retries": self._retries[action], "seconds": {}})
+                entry["requests"][status] = count
+            for (action, phase), histogram in self._timings.items():
+                summary[action]["seconds"][phase] = {
+                    "count": histogram.count,
+                    "mean": histogram.mean,
+                    "p50": histogram.quantile(0.5),
+                    "p90": histogram.quantile(0.9),
+                    "p99": histogram.quantile(0.99),
+                }
+            return summary
+
+    def to_prometheus(self, prefix: str = "smw_reader") -> str:
+        """Render the aggregates in the Prometheus text exposition format.
+
+        Args:
+            prefix: Prefix of the metric names.
+
+        Returns:
+            The metrics, ready to be served on a scrape endpoint.
+        """
+        with self._lock:
+            lines = [
+                f"# HELP {prefix}_requests_total SMW API requests by action and HTTP status.",
+                f"# TYPE {prefix}_requests_total counter",
+            ]
+            for (action, status), count in sorted(self._requests.items()):
+                lines.append(f"{prefix}_requests_total{_labels(action=action, status=status)} {count}")
+            lines += [
+                f"# HELP {prefix}_retries_total Retries made by the HTTP client's retry policy.",
+                f"# TYPE {prefix}_retries_total counter",
+            ]
+            for action, count in sorted(self._retries.items()):
+                lines.append(f"{prefix}_retries_total{_labels(action=action)} {count}")
+            lines += _histogram_lines(
+                f"{prefix}_request_seconds", "Duration of SMW API requests by phase.", "phase", self._timings
+            )
+            lines += _histogram_lines(
+                f"{prefix}_response_bytes", "Size of SMW API responses on the wire and decoded.", "size", self._sizes
+            )
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Discard all recorded data."""
+        with self._lock:
+            self._timings.clear()
+            self._sizes.clear()
+            self._requests.clear()
+            self._retries.clear()
+
+    @staticmethod
+    def _histogram(
+        histograms: dict[tuple[str, str], Histogram], key: tuple[str, str], bounds: tuple[float, ...]
+    ) -> Histogram:
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram(bounds)
+        return histogram
+
+
+def _labels(**labels: str) -> str:
+    """Format Prometheus labels, escaping their values."""
+    escaped = (
+        name + '="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _histogram_lines(
+    name: str, description: str, label: str, histograms: dict[tuple[str, str], Histogram]
+) -> list[str]:
+    """Render histograms keyed by action and one more label as Prometheus lines."""
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+    for (action, value), histogram in sorted(histograms.items()):
+        cumulative = 0
+        for bound, count in zip((*histogram.bounds, math.inf), histogram.counts, strict=True):
+            cumulative += count
+            le = "+Inf" if bound == math.inf else f"{bound:g}"
+            lines.append(f"{name}_bucket{_labels(action=action, **{label: value}, le=le)} {cumulative}")
+        lines.append(f"{name}_sum{_labels(action=action, **{label: value})} {histogram.sum:g}")
+        lines.append(f"{name}_count{_labels(action=action, **{label: value})} {histogram.count}")
+    return lines
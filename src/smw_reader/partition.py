@@ -0,0 +1,324 @@
+"""Splitting of queries that match more results than the wiki serves into disjoint partitions.
+
+SMW stops paging a query at its maximum offset (`$smwgQMaxLimit`). A larger
+result set can still be fetched completely by adding conditions that split
+it into parts which each fit under the limit. `partition_query` plans such a
+split from `format=count` probes, without fetching any results:
+
+- By the range of a number or date property: the range between the smallest
+  and the largest value is bisected until each part fits. Parts are
+  disjoint, as the upper bound of one part is the value just below the lower
+  bound of the next.
+- By title prefix: ``[[~Prefix*]]`` conditions, extended one character at a
+  time. A prefix is extended from the common prefix of the first and last
+  title it matches, so that titles sharing a long prefix ('City 000123') do
+  not take a split per shared character. A title equal to the prefix gets a
+  part of its own (``[[~Prefix]]``), and titles continuing with a character
+  outside the alphabet a leftover part that excludes the other parts with
+  ``[[!~Prefix…*]]`` conditions. Prefixes apply to the title without
+  its namespace. Characters that differ only in case are tried once, since
+  they select the same titles on wikis that compare titles without case.
+
+Results without a value for the range property fall into no part; a
+warning reports how many results the plan does not cover, and why.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import string
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any
+
+from .endpoints.ask import DEFAULT_MAX_OFFSET, bound_condition, condition_value, iter_result_rows
+from .endpoints.query import QueryBuilder, escape_value, split_query
+from .exceptions import SMWResultLimitWarning, SMWServerError, SMWValidationError
+
+if TYPE_CHECKING:
+    from .endpoints.ask import AskEndpoint
+
+DEFAULT_ALPHABET = string.digits + string.ascii_uppercase + string.ascii_lowercase + " "
+"""Characters tried when a title prefix is extended."""
+
+
+@dataclass(frozen=True)
+class Partition:
+    """One part of the results of a partitioned query.
+
+    Attributes:
+        query: The query restricted to the part: the original conditions,
+            the part's conditions, then the original printouts and parameters.
+        conditions: The conditions selecting the part, e.g.
+            '[[Population::>1000]][[Population::<4999]]' or '[[~City 0001*]]'.
+        count: Number of results in the part when it was planned.
+    """
+
+    query: str
+    conditions: str
+    count: int
+
+
+@dataclass(frozen=True)
+class _Range:
+    """A closed range of a number or date property."""
+
+    key: str
+    lower: float
+    upper: float
+    dates: bool
+    strict_comparators: bool = False
+
+    @property
+    def conditions(self) -> str:
+        return bound_condition(self.key, ">", self._format(self.lower), self.strict_comparators) + bound_condition(
+            self.key, "<", self._format(self.upper), self.strict_comparators
+        )
+
+    def split(self) -> list[_Range]:
+        """Bisect the range into two adjacent halves, or return [] if it holds a single value."""
+        if self.lower >= self.upper:
+            return []
+        if self.dates:
+            # Dates have whole-second resolution, so no value lies between two consecutive seconds.
+            middle: float = (int(self.lower) + int(self.upper)) // 2
+            above = middle + 1
+        else:
+            # Numbers are floats even if both edges are whole: the upper half starts at the next float.
+            middle = self.lower + (self.upper - self.lower) / 2
+            if middle >= self.upper:
+                middle = self.lower
+            above = math.nextafter(middle, math.inf)
+        return [replace(self, upper=middle), replace(self, lower=above)]
+
+    def _format(self, value: float) -> str:
+        if self.dates:
+            return condition_value({"timestamp": value})
+        # SMW does not parse exponent notation such as repr(1e16) == '1e+16'.
+        return str(value) if isinstance(value, int) else format(Decimal(repr(value)), "f")
+
+
+@dataclass(frozen=True)
+class _Prefix:
+    """The titles starting with a prefix, the title equal to it, or those left over by its other parts."""
+
+    prefix: str
+    exact: bool = False
+    excluded: tuple[_Prefix, ...] = ()
+
+    @property
+    def conditions(self) -> str:
+        if self.exact:
+            return f"[[~{escape_value(self.prefix)}]]"
+        conditions = f"[[~{escape_value(self.prefix)}*]]" if self.prefix else ""
+        for part in self.excluded:
+            conditions += f"[[!~{escape_value(part.prefix)}{'' if part.exact else '*'}]]"
+        return conditions
+
+
+def partition_query(
+    ask: AskEndpoint,
+    query: str | QueryBuilder,
+    key: str | None = None,
+    limit: int = DEFAULT_MAX_OFFSET,
+    workers: int = 4,
+    alphabet: str = DEFAULT_ALPHABET,
+    case_sensitive: bool = True,
+) -> list[Partition]:
+    """Split a query into disjoint parts that each match at most `limit` results.
+
+    Parts are split recursively; the counts of each level of the split are
+    probed concurrently. A part that cannot be split further (all its
+    results share one value, or one title) is kept even though it exceeds
+    the limit; fetching it stops at the maximum offset with a warning.
+
+    Examples:
+        >>> builder = QueryBuilder().add_conditions("Category:Cities").add_printouts("Population")
+        >>> for part in partition_query(site.ask, builder, key="Founded"):
+        ...     print(part.count, part.conditions)
+        8712 [[Founded::>0800-01-01T00:00:00]][[Founded::<1650-07-01T00:00:00]]
+        9468 [[Founded::>1650-07-01T00:00:01]][[Founded::<2024-12-31T00:00:00]]
+
+    Args:
+        ask: The endpoint the count probes are sent to.
+        query: The semantic query string or a QueryBuilder instance.
+        key: A number or date property whose range is bisected, or None to
+            split by title prefix.
+        limit: Maximum number of results per part, normally the wiki's
+            maximum offset.
+        workers: Number of count probes sent at the same time.
+        alphabet: Characters tried when a title prefix is extended.
+        case_sensitive: Whether the wiki compares titles with case, as stock
+            SMW does (the default). If not, characters of the alphabet that
+            differ only in case are tried once, so that parts do not
+            overlap.
+
+    Returns:
+        The parts in ascending order of their range or prefix. A query that
+        fits under the limit is returned as a single part.
+
+    Raises:
+        SMWValidationError: If limit or workers is not positive, or the key
+            property has values that are neither numbers nor dates.
+        SMWServerError: If the wiki does not report counts.
+    """
+    if limit < 1 or workers < 1:
+        raise SMWValidationError("limit and workers must be positive integers")
+    if not case_sensitive:
+        alphabet = _caseless(alphabet)
+    return _Planner(ask, str(query), key, limit, alphabet).plan(workers)
+
+
+class _Planner:
+    """Plans the partitions of one query."""
+
+    def __init__(self, ask: AskEndpoint, query: str, key: str | None, limit: int, alphabet: str) -> None:
+        self.ask = ask
+        self.conditions, self.rest = split_query(query)
+        self.key = key
+        self.limit = limit
+        self.alphabet = alphabet
+
+    def plan(self, workers: int) -> list[Partition]:
+        """Split the query level by level until every part fits."""
+        total = self._count("")
+        if total <= self.limit:
+            return [Partition(f"{self.conditions}{self.rest}", "", total)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if self.key is None:
+                level: list[_Range | _Prefix] = [_Prefix("")]
+                counts = [total]
+            else:
+                root = self._key_range(self.key)
+                level = [] if root is None else [root]
+                counts = list(executor.map(self._count, (node.conditions for node in level)))
+            parts: list[tuple[_Range | _Prefix, int]] = []
+            while level:
+                oversized = []
+                for node, count in zip(level, counts, strict=True):
+                    if count > self.limit:
+                        oversized.append((node, count))
+                    elif count:
+                        parts.append((node, count))
+                level, families = [], []
+                for (node, count), children in zip(oversized, executor.map(self._split, oversized), strict=True):
+                    if children:
+                        families.append((count, len(level), len(children)))
+                        level.extend(children)
+                    else:
+                        parts.append((node, count))
+                counts = list(executor.map(self._count, (node.conditions for node in level)))
+                if self.key is None:
+                    for count, start, size in families:
+                        parts.extend(self._leftover(level[start : start + size], counts[start : start + size], count))
+
+        parts.sort(key=_order)
+        covered = sum(count for _, count in parts)
+        if covered < total:
+            warnings.warn(
+                f"{total - covered} of {total} results fall into no partition: {self._uncovered(covered, total)}.",
+                SMWResultLimitWarning,
+                stacklevel=3,
+            )
+        return [
+            Partition(f"{self.conditions}{node.conditions}{self.rest}", node.conditions, count) for node, count in parts
+        ]
+
+    def _uncovered(self, covered: int, total: int) -> str:
+        """Explain why `total - covered` results fall into no part."""
+        if self.key is None:
+            return "their titles match none of the prefix conditions"
+        valued = self._count(f"[[{self.key}::+]]")
+        reasons = []
+        if valued < total:
+            reasons.append(f"{total - valued} have no value for the property")
+        if covered < valued:
+            reasons.append(f"{valued - covered} have values in a gap between the ranges")
+        return ", ".join(reasons)
+
+    def _count(self, conditions: str) -> int:
+        """Probe the number of results matching the query plus `conditions`."""
+        count = self.ask.count(f"{self.conditions}{conditions}")
+        if count is None:
+            raise SMWServerError("The wiki does not report result counts, which partitioning requires")
+        return count
+
+    def _split(self, part: tuple[_Range | _Prefix, int]) -> list[_Range | _Prefix]:
+        """Return the children of an oversized part, or [] if it cannot be split."""
+        node = part[0]
+        if isinstance(node, _Range):
+            return [*node.split()]
+        if node.exact or node.excluded:
+            return []
+        first, last = (self._edge(node.conditions, order) for order in ("asc", "desc"))
+        if first is None or last is None or first == last:
+            return []
+        # All titles between the first and the last share their common prefix, which may be longer than the part's.
+        prefix = os.path.commonprefix([first, last])
+        exact = [_Prefix(prefix, exact=True)] if first == prefix else []
+        return [*exact, *(_Prefix(prefix + char) for char in self.alphabet)]
+
+    def _leftover(self, children: list[_Range | _Prefix], counts: list[int], total: int) -> list[tuple[_Prefix, int]]:
+        """Return the part for titles of a split prefix that none of its children matched, if there are any."""
+        if sum(counts) == total:
+            return []
+        matched = [child for child, count in zip(children, counts, strict=True) if count and isinstance(child, _Prefix)]
+        # The children extend the prefix by one character, or are the prefix itself.
+        first = children[0]
+        assert isinstance(first, _Prefix)
+        leftover = _Prefix(first.prefix if first.exact else first.prefix[:-1], excluded=tuple(matched))
+        count = self._count(leftover.conditions)
+        return [(leftover, count)] if count else []
+
+    def _key_range(self, key: str) -> _Range | None:
+        """Probe the smallest and largest value of the key property."""
+        edges = [self._edge("", order, key) for order in ("asc", "desc")]
+        if edges[0] is None or edges[1] is None:
+            return None
+        (lower, lower_date), (upper, upper_date) = (_numeric(key, value) for value in edges)
+        return _Range(key, lower, upper, lower_date and upper_date, self.ask.strict_comparators)
+
+    def _edge(self, conditions: str, order: str, key: str | None = None) -> Any:
+        """Return the first result's title (without namespace), or its first value of `key`, in the given order."""
+        printout = f"|?{key}" if key else ""
+        response = self.ask.query(f"{self.conditions}{conditions}{printout}", limit=1, sort=key or "", order=order)
+        for subject, entry in iter_result_rows(response):
+            if key is None:
+                return _title(subject, entry)
+            values = (entry.get("printouts") or {}).get(key)
+            return values[0] if values else None
+        return None
+
+
+def _numeric(key: str, value: Any) -> tuple[float, bool]:
+    """Return a serialized number or date as a number, and whether it is a date."""
+    if isinstance(value, dict) and "timestamp" in value:
+        return int(value["timestamp"]), True
+    if isinstance(value, int | float) and not isinstance(value, bool):
+        return value, False
+    raise SMWValidationError(f"Cannot partition by {key!r}: its values are neither numbers nor dates")
+
+
+def _caseless(alphabet: str) -> str:
+    """Drop the characters of an alphabet that equal an earlier one but for case."""
+    kept: dict[str, str] = {}
+    for char in alphabet:
+        kept.setdefault(char.casefold(), char)
+    return "".join(kept.values())
+
+
+def _title(subject: str, entry: dict[str, Any]) -> str:
+    """Return the title of a result page without its namespace, which title patterns do not match."""
+    if entry.get("namespace", 0) != 0:
+        return subject.partition(":")[2]
+    return subject
+
+
+def _order(part: tuple[_Range | _Prefix, int]) -> Any:
+    """Sort key putting parts in ascending order of their range or prefix."""
+    node = part[0]
+    return node.lower if isinstance(node, _Range) else (node.prefix, not node.exact, bool(node.excluded))
@@ -0,0 +1,187 @@
+"""Adaptive client-side rate limiting for SMW API requests."""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from .exceptions import SMWAPIError
+from .interfaces import RateLimiter
+
+THROTTLE_STATUSES = frozenset({429, 503})
+"""HTTP statuses with which servers ask clients to slow down."""
+
+THROTTLE_CODES = frozenset({"maxlag", "ratelimited"})
+"""MediaWiki API error codes reporting replication lag or an exceeded rate limit."""
+
+
+def is_throttled(error: SMWAPIError) -> bool:
+    """Tell whether an error means the server wants fewer requests.
+
+    Args:
+        error: An error raised for an API request.
+
+    Returns:
+        True for HTTP 429 and 503 responses and for maxlag and ratelimited API errors.
+    """
+    if error.status_code in THROTTLE_STATUSES:
+        return True
+    data = error.response_data or {}
+    return data.get("code") in THROTTLE_CODES
+
+
+@dataclass
+class RateLimitStats:
+    """Counters describing the work of a rate limiter.
+
+    Attributes:
+        requests: Requests let through.
+        throttled: Requests the server throttled.
+        wait_time: Total seconds callers spent waiting in `acquire`.
+    """
+
+    requests: int = 0
+    throttled: int = 0
+    wait_time: float = 0.0
+
+
+class AdaptiveRateLimiter(RateLimiter):
+    """Thread-safe token bucket whose rate adapts to the server's feedback.
+
+    Requests draw tokens from a bucket holding up to `burst` tokens that
+    refills at `rate` tokens per second. Every successful request raises the
+    rate by `increase`, up to `max_rate`. Every throttled request multiplies
+    it by `decrease`, down to `min_rate`, and pauses all requests for the
+    time given in the server's Retry-After header, or for an exponentially
+    growing backoff if there was none. The rate thus settles just below the
+    highest one the server accepts.
+
+    Examples:
+        >>> limiter = AdaptiveRateLimiter(rate=5, max_rate=40)
+        >>> site = SMWClient("https://example.org/w/", rate_limiter=limiter)
+        >>> rows = AskEndpoint(site).fetch_all(builder, workers=8)
+        >>> limiter.rate, limiter.stats
+        (27.5, RateLimitStats(requests=412, throttled=3, wait_time=61.8))
+    """
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        max_rate: float = 50.0,
+        min_rate: float = 0.2,
+        burst: int = 5,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        maxlag: int | None = 5,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        max_retries: int = 5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """Initialize the limiter.
+
+        Args:
+            rate: Initial number of requests per second.
+            max_rate: Highest rate the limiter ramps up to.
+            min_rate: Lowest rate the limiter backs off to.
+            burst: Number of requests that may be sent at once after a quiet period.
+            increase: Requests per second added to the rate for every successful request.
+            decrease: Factor the rate is multiplied with for every throttled request.
+            maxlag: Maximum database replication lag in seconds the server
+                should accept before refusing a request (the `maxlag`
+                parameter), or None to not send it.
+            backoff: Pause after the first throttled request without a
+                Retry-After header; it doubles with every further one in a row.
+            max_backoff: Upper bound for all pauses, including Retry-After.
+            max_retries: How often a throttled request is sent again.
+            clock: Monotonic time source, in seconds.
+            sleep: Function used to wait.
+
+        Raises:
+            ValueError: If a rate or the burst is not positive, min_rate exceeds
+                max_rate, or decrease is not between 0 and 1.
+        """
+        if min(rate, max_rate, min_rate, burst) <= 0:
+            raise ValueError("rates and burst must be positive")
+        if min_rate > max_rate:
+            raise ValueError("min_rate must not exceed max_rate")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.maxlag = maxlag
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retries = max_retries
+        self.stats = RateLimitStats()
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._paused_until = self._updated
+        self._throttled_in_row = 0
+
+    def acquire(self) -> float:
+        """Block until a token is available or a pause has ended, and take the token.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        start = self._clock()
+        while True:
+            with self._lock:
+                now = self._clock()
+                if now >= self._paused_until:
+                    if now > self._updated:
+                        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                        self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        waited = now - start
+                        self.stats.requests += 1
+                        self.stats.wait_time += waited
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+                else:
+                    delay = self._paused_until - now
+            self._sleep(delay)
+
+    def record_success(self) -> None:
+        """Raise the rate after a request that was not throttled."""
+        with self._lock:
+            self._throttled_in_row = 0
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, retry_after: float | None = None) -> None:
+        """Lower the rate and pause all requests after a throttled request.
+
+        Reports arriving while a pause is in effect extend the pause if
+        necessary but do not lower the rate again.
+
+        Args:
+            retry_after: Seconds the server asked the client to wait, if it said so.
+        """
+        with self._lock:
+            self.stats.throttled += 1
+            now = self._clock()
+            # Requests that were in flight when the server pushed back report it
+            # as well; only the first report of a pause lowers the rate.
+            if now >= self._paused_until:
+                self._throttled_in_row += 1
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            if retry_after is None:
+                retry_after = self.backoff * 2 ** (self._throttled_in_row - 1)
+            resume = now + min(retry_after, self.max_backoff)
+            if resume > self._paused_until:
+                self._paused_until = resume
+                # Start refilling from an empty bucket when the pause ends.
+                self._tokens = 0.0
+                self._updated = resume
@@ -0,0 +1,344 @@
+"""Compact, typed representation of ask results.
+
+Raw ask responses repeat the same structure in every row: each page
+reference is a dict of five entries, each date a dict of two strings, and
+each row holds its printouts in a dict of lists. `ResultSet` stores rows as
+slotted objects instead. The values of a row are kept in a tuple indexed by
+a column table shared by all rows, whose property names are interned, and a
+printout with a single value holds that value without a container. Repeated
+values are dictionary-encoded: each distinct page, string and combination of
+values is stored once per result set, however many rows refer to it.
+
+For the synthetic rows of ``tests/bench_results.py`` (a number, a page, a
+date and two strings per row) this takes about 540 bytes per row, against
+about 1,770 for the parsed JSON.
+"""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from datetime import UTC, datetime
+from typing import Any, overload
+
+from .endpoints.ask import iter_result_rows
+
+TRUE_VALUES = frozenset({True, "t", "true", "1"})
+"""Serializations of a true boolean value in SMW's JSON results."""
+
+
+class PageValue:
+    """A reference to a wiki page.
+
+    Instances are shared by all rows of a `ResultSet` that refer to the same
+    page and must not be modified.
+
+    Attributes:
+        title: The full page title, including the namespace prefix.
+        namespace: The namespace number.
+        url: The full URL of the page.
+        exists: Whether the page exists.
+        display_title: The page's display title, or an empty string.
+    """
+
+    __slots__ = ("title", "namespace", "url", "exists", "display_title")
+
+    def __init__(
+        self, title: str, namespace: int = 0, url: str = "", exists: bool = True, display_title: str = ""
+    ) -> None:
+        """Initialize the page reference."""
+        self.title = title
+        self.namespace = namespace
+        self.url = url
+        self.exists = exists
+        self.display_title = display_title
+
+    def __eq__(self, other: object) -> bool:
+        """Compare page references by title and namespace."""
+        if not isinstance(other, PageValue):
+            return NotImplemented
+        return (self.title, self.namespace) == (other.title, other.namespace)
+
+    def __hash__(self) -> int:
+        """Hash the title and namespace."""
+        return hash((self.title, self.namespace))
+
+    def __str__(self) -> str:
+        """Return the page title."""
+        return self.title
+
+    def __repr__(self) -> str:
+        """Return a short representation showing the title."""
+        return f"PageValue({self.title!r})"
+
+
+class DateValue:
+    """A point in time, as serialized by SMW.
+
+    Attributes:
+        timestamp: Seconds since the epoch (UTC).
+        raw: SMW's raw representation, e.g. '1/2000/1/1' (calendar model/year/month/day).
+    """
+
+    __slots__ = ("timestamp", "raw")
+
+    def __init__(self, timestamp: int, raw: str = "") -> None:
+        """Initialize the date."""
+        self.timestamp = timestamp
+        self.raw = raw
+
+    @property
+    def datetime(self) -> datetime:
+        """The date as a timezone-aware datetime."""
+        return datetime.fromtimestamp(self.timestamp, UTC)
+
+    def __eq__(self, other: object) -> bool:
+        """Compare dates by timestamp."""
+        if not isinstance(other, DateValue):
+            return NotImplemented
+        return self.timestamp == other.timestamp
+
+    def __hash__(self) -> int:
+        """Hash the timestamp."""
+        return hash(self.timestamp)
+
+    def __repr__(self) -> str:
+        """Return a representation showing the raw value."""
+        return f"DateValue({self.timestamp}, {self.raw!r})"
+
+
+class QuantityValue:
+    """A number with a unit.
+
+    Attributes:
+        value: The number.
+        unit: The unit, e.g. 'km²'.
+    """
+
+    __slots__ = ("value", "unit")
+
+    def __init__(self, value: float, unit: str) -> None:
+        """Initialize the quantity."""
+        self.value = value
+        self.unit = unit
+
+    def __eq__(self, other: object) -> bool:
+        """Compare quantities by value and unit."""
+        if not isinstance(other, QuantityValue):
+            return NotImplemented
+        return (self.value, self.unit) == (other.value, other.unit)
+
+    def __hash__(self) -> int:
+        """Hash the value and unit."""
+        return hash((self.value, self.unit))
+
+    def __repr__(self) -> str:
+        """Return a representation showing value and unit."""
+        return f"QuantityValue({self.value!r}, {self.unit!r})"
+
+
+class ResultRow(Mapping[str, tuple[Any, ...]]):
+    """One result of an ask query: its subject and printout values.
+
+    The row maps printout names to tuples of values. Page references become
+    `PageValue`, dates `DateValue` and quantities `QuantityValue` instances;
+    numbers, strings and other values are kept as they are.
+
+    Attributes:
+        subject: The page the row describes.
+    """
+
+    __slots__ = ("subject", "_values", "_columns")
+
+    def __init__(self, subject: PageValue, values: tuple[Any, ...], columns: dict[str, int]) -> None:
+        """Initialize the row.
+
+        Args:
+            subject: The page the row describes.
+            values: The values of each column, in column order: a tuple of
+                values, or the value itself if there is exactly one. Columns
+                added to the result set after the row may have no entry.
+            columns: The column table of the result set, mapping printout
+                names to positions in `values`.
+        """
+        self.subject = subject
+        self._values = values
+        self._columns = columns
+
+    def __getitem__(self, name: str) -> tuple[Any, ...]:
+        """Return the values of a printout.
+
+        Raises:
+            KeyError: If the result set has no such printout.
+        """
+        index = self._columns[name]
+        if index >= len(self._values):
+            return ()
+        values = self._values[index]
+        return values if isinstance(values, tuple) else (values,)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the printout names."""
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        """Return the number of printouts."""
+        return len(self._columns)
+
+    def first(self, name: str, default: Any = None) -> Any:
+        """Return the first value of a printout.
+
+        Args:
+            name: The printout name.
+            default: Returned if the printout has no value.
+
+        Returns:
+            The first value, or `default`.
+        """
+        index = self._columns.get(name)
+        if index is None or index >= len(self._values):
+            return default
+        values = self._values[index]
+        if not isinstance(values, tuple):
+            return values
+        return values[0] if values else default
+
+    def __repr__(self) -> str:
+        """Return a representation showing the subject and values."""
+        return f"ResultRow({self.subject.title!r}, {dict(self)!r})"
+
+
+class ResultSet(Sequence[ResultRow]):
+    """A compact, list-like collection of ask results.
+
+    Rows are added response by response, so a large result set can be
+    collected page by page while each raw page is released after conversion
+    (see `AskEndpoint.query_compact`).
+
+    Examples:
+        >>> results = site.ask.query_compact("[[Category:Cities]]|?Population|?Country")
+        >>> row = results[0]
+        >>> row.subject.title, row.first("Population"), row.first("Country")
+        ('Berlin', 3850809, PageValue('Germany'))
+
+    Attributes:
+        columns: The printout names, mapped to their positions in the rows.
+    """
+
+    def __init__(self, responses: Iterable[dict[str, Any]] = ()) -> None:
+        """Initialize the result set.
+
+        Args:
+            responses: Ask responses whose rows are added.
+        """
+        self.columns: dict[str, int] = {}
+        self._rows: list[ResultRow] = []
+        self._pages: dict[str, PageValue] = {}
+        self._strings: dict[str, str] = {}
+        self._tuples: dict[tuple[Any, ...], tuple[Any, ...]] = {}
+        for response in responses:
+            self.add_response(response)
+
+    @property
+    def distinct_pages(self) -> int:
+        """Number of distinct pages referenced by the rows, subjects included."""
+        return len(self._pages)
+
+    def add_response(self, response: dict[str, Any]) -> int:
+        """Convert and add the rows of an ask response.
+
+        Args:
+            response: An ask API response.
+
+        Returns:
+            The number of rows added.
+        """
+        return self.add_rows(iter_result_rows(response))
+
+    def add_rows(self, rows: Iterable[tuple[str, dict[str, Any]]]) -> int:
+        """Convert and add result rows.
+
+        Args:
+            rows: Tuples of the subject name and its result entry, as yielded
+                by `iter_result_rows` or `AskEndpoint.iter_results`.
+
+        Returns:
+            The number of rows added.
+        """
+        added = 0
+        for subject, entry in rows:
+            printouts = entry.get("printouts") or {}
+            values: list[Any] = [()] * len(self.columns)
+            for name, raw_values in printouts.items() if isinstance(printouts, dict) else ():
+                index = self.columns.get(name)
+                if index is None:
+                    index = self.columns[sys.intern(name)] = len(self.columns)
+                    values.append(())
+                converted = tuple(self._value(value) for value in raw_values)
+                values[index] = converted[0] if len(converted) == 1 else self._tuple(converted)
+            # Trailing columns without values are left out; ResultRow treats them as empty.
+            while values and values[-1] == ():
+                values.pop()
+            self._rows.append(ResultRow(self._page(entry, subject), tuple(values), self.columns))
+            added += 1
+        return added
+
+    @overload
+    def __getitem__(self, index: int) -> ResultRow: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[ResultRow]: ...
+
+    def __getitem__(self, index: int | slice) -> ResultRow | list[ResultRow]:
+        """Return a row, or a list of rows for a slice."""
+        return self._rows[index]
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator[ResultRow]:
+        """Iterate over the rows."""
+        return iter(self._rows)
+
+    def _string(self, value: str) -> str:
+        """Return the stored instance of a string equal to `value`."""
+        return self._strings.setdefault(value, value)
+
+    def _tuple(self, values: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Return the stored instance of a tuple equal to `values`, if its values are hashable."""
+        try:
+            return self._tuples.setdefault(values, values)
+        except TypeError:
+            return values
+
+    def _page(self, value: dict[str, Any], title: str = "") -> PageValue:
+        """Return the stored reference to the page described by a serialized page value or result entry."""
+        # Full titles carry the namespace prefix, so they identify a page on their own.
+        title = value.get("fulltext", title)
+        page = self._pages.get(title)
+        if page is None:
+            page = self._pages[title] = PageValue(
+                title,
+                int(value.get("namespace", 0) or 0),
+                value.get("fullurl", ""),
+                value.get("exists", True) in TRUE_VALUES,
+                self._string(value.get("displaytitle") or ""),
+            )
+        return page
+
+    def _value(self, value: Any) -> Any:
+        """Convert a serialized printout value to its compact form."""
+        if isinstance(value, str):
+            return self._string(value)
+        if isinstance(value, dict):
+            if "fulltext" in value:
+                return self._page(value)
+            if "timestamp" in value:
+                try:
+                    return DateValue(int(value["timestamp"]), value.get("raw", ""))
+                except (TypeError, ValueError):
+                    return value
+            if "value" in value and "unit" in value:
+                return QuantityValue(value["value"], self._string(value["unit"]))
+        return value
@@ -0,0 +1,133 @@
+"""Retrying of failed HTTP requests with exponential backoff and jitter."""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .exceptions import SMWAPIError, SMWConnectionError, SMWServerError
+
+_T = TypeVar("_T")
+
+RETRYABLE_STATUSES = frozenset({408, 500, 502, 504})
+"""HTTP statuses that indicate a transient failure of the server or a proxy in front of it."""
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Rules for sending failed requests again.
+
+    Connection errors (refused or reset connections, timeouts, truncated
+    responses) and HTTP responses with a status in `retry_statuses` are
+    retryable; all other errors are fatal and raised at once. The n-th retry
+    waits a random time between 0 and ``min(max_backoff, backoff * 2**n)``
+    ("full jitter", which keeps clients that failed together from retrying
+    together), or at least as long as the server's Retry-After header asks.
+    No retry is started that would end more than `max_elapsed` seconds after
+    the first attempt.
+
+    HTTP 429 and 503 are not retried here: pacing requests the server
+    considers too many is the job of the client's rate limiter (see
+    `AdaptiveRateLimiter`), and retrying them in both layers would multiply
+    the attempts. Without a rate limiter, add 503 to `retry_statuses` to
+    retry it here.
+
+    Attributes:
+        max_retries: Maximum number of retries per request.
+        backoff: Base delay in seconds.
+        max_backoff: Upper bound of a single delay in seconds.
+        max_elapsed: Upper bound in seconds for the time from the first
+            attempt to the end of the last delay.
+        retry_statuses: HTTP statuses that are retried.
+        methods: HTTP methods that are retried. POST is excluded by default
+            because the server may have acted on a request that failed.
+        jitter: Whether to randomize delays.
+
+    Examples:
+        >>> http_client = PooledHTTPClient(retry=RetryPolicy(max_retries=5, max_elapsed=300))
+        >>> site = SMWClient("https://example.org/w/", http_client=http_client)
+    """
+
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 30.0
+    max_elapsed: float = 120.0
+    retry_statuses: frozenset[int] = RETRYABLE_STATUSES
+    methods: frozenset[str] = frozenset({"GET"})
+    jitter: bool = True
+
+    def is_retryable(self, method: str, error: SMWAPIError) -> bool:
+        """Classify an error as retryable or fatal.
+
+        Args:
+            method: The HTTP method of the failed request.
+            error: The error raised for it.
+
+        Returns:
+            True if the request may be sent again.
+        """
+        if method.upper() not in self.methods:
+            return False
+        if isinstance(error, SMWConnectionError):
+            return True
+        return isinstance(error, SMWServerError) and error.status_code in self.retry_statuses
+
+    def delay(self, retry: int, error: SMWAPIError | None = None) -> float:
+        """Compute the wait before a retry.
+
+        Args:
+            retry: Number of retries already made for the request.
+            error: The error that caused the retry; its `retry_after` is a lower bound.
+
+        Returns:
+            The delay in seconds.
+        """
+        delay = min(self.max_backoff, self.backoff * 2.0**retry)
+        if self.jitter:
+            delay = random.uniform(0, delay)  # noqa: S311 - jitter, not cryptography
+        if error is not None and error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        return delay
+
+    def call(
+        self,
+        method: str,
+        send: Callable[[], _T],
+        on_retry: Callable[[int, SMWAPIError, float], None] | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> _T:
+        """Call `send` until it succeeds, fails fatally or the retry budget is spent.
+
+        Args:
+            method: The HTTP method of the request.
+            send: Function sending the request.
+            on_retry: Called before each retry with the retry number (from 1),
+                the error and the delay.
+            sleep: Function used to wait.
+            clock: Monotonic time source, in seconds.
+
+        Returns:
+            The result of `send`.
+
+        Raises:
+            SMWAPIError: The last error, if the request did not succeed.
+        """
+        start = clock()
+        retry = 0
+        while True:
+            try:
+                return send()
+            except SMWAPIError as e:
+                if retry >= self.max_retries or not self.is_retryable(method, e):
+                    raise
+                delay = self.delay(retry, e)
+                if clock() - start + delay > self.max_elapsed:
+                    raise
+                retry += 1
+                if on_retry is not None:
+                    on_retry(retry, e, delay)
+                sleep(delay)
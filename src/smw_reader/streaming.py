@@ -0,0 +1,171 @@
+"""Incremental parsing of JSON response bodies that arrive in chunks."""
+
+from __future__ import annotations
+
+import codecs
+import json
+from collections.abc import Generator, Iterable, Iterator, Sequence
+from typing import Any
+
+from .exceptions import SMWServerError
+
+_WHITESPACE = frozenset(" \t\n\r")
+_DECODER = json.JSONDecoder()
+
+_Members = Generator[tuple[str | None, Any], None, Any]
+
+
+class JSONStream:
+    """Parse a JSON object from byte chunks, yielding the members of one nested container.
+
+    Iterating over the stream parses the document as its chunks arrive and
+    yields the members of the container found at `path` one at a time, as
+    `(key, value)` pairs for an object or `(None, value)` pairs for an array.
+    Only the chunk being parsed and the member being built are held in memory;
+    the rest of the document is collected in `document`.
+
+    Attributes:
+        path: Keys leading from the top-level object to the streamed container.
+        document: The parsed document with the streamed container left empty.
+            It is complete once iteration has finished.
+
+    Examples:
+        >>> stream = JSONStream([b'{"query": {"results": {"A": 1,', b' "B": 2}}}'], ("query", "results"))
+        >>> list(stream)
+        [('A', 1), ('B', 2)]
+        >>> stream.document
+        {'query': {'results': {}}}
+    """
+
+    def __init__(self, chunks: Iterable[bytes], path: Sequence[str]) -> None:
+        """Initialize the stream.
+
+        Args:
+            chunks: The body of a JSON document, in chunks of any size.
+            path: Keys leading from the top-level object to the container whose
+                members are yielded.
+        """
+        self.path = tuple(path)
+        self.document: dict[str, Any] = {}
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def __iter__(self) -> Iterator[tuple[str | None, Any]]:
+        """Parse the document, yielding the members of the container at `path`.
+
+        Raises:
+            SMWServerError: If the body is not a valid JSON object.
+        """
+        return self._parse()
+
+    def _parse(self) -> Iterator[tuple[str | None, Any]]:
+        if self._peek() != "{":
+            raise SMWServerError("Expected JSON object, got different type")
+        yield from self._object(0, self.document)
+        if self._peek():
+            raise SMWServerError(f"Invalid JSON response: extra data at character {self._pos}")
+
+    def _object(self, depth: int, result: dict[str, Any]) -> _Members:
+        """Parse an object on the way to the streamed container into `result`."""
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return result
+        while True:
+            key = self._decode()
+            if not isinstance(key, str):
+                raise SMWServerError("Invalid JSON response: object keys must be strings")
+            self._expect(":")
+            if key != self.path[depth]:
+                result[key] = self._decode()
+            elif depth + 1 == len(self.path):
+                result[key] = yield from self._members()
+            elif self._peek() == "{":
+                result[key] = {}
+                yield from self._object(depth + 1, result[key])
+            else:
+                result[key] = self._decode()
+            if self._next() == "}":
+                return result
+
+    def _members(self) -> _Members:
+        """Yield the members of the streamed container and return an empty one of its type."""
+        opening = self._peek()
+        if opening not in ("{", "["):
+            return self._decode()
+        self._pos += 1
+        closing = "}" if opening == "{" else "]"
+        if self._peek() == closing:
+            self._pos += 1
+            return {} if opening == "{" else []
+        while True:
+            key = None
+            if opening == "{":
+                key = self._decode()
+                self._expect(":")
+            yield key, self._decode()
+            if self._next() == closing:
+                return {} if opening == "{" else []
+
+    def _decode(self) -> Any:
+        """Decode the next complete JSON value."""
+        while True:
+            self._peek()
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._fill():
+                    continue
+                raise SMWServerError(f"Invalid JSON response: {e}") from e
+            # A number at the end of the buffer may continue in the next chunk.
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def _next(self) -> str:
+        """Consume a member separator and return it."""
+        char = self._peek()
+        if char not in (",", "}", "]"):
+            raise SMWServerError(f"Invalid JSON response: unexpected {char or 'end of data'!r} at {self._pos}")
+        self._pos += 1
+        return char
+
+    def _expect(self, char: str) -> None:
+        if self._peek() != char:
+            raise SMWServerError(f"Invalid JSON response: expected {char!r} at character {self._pos}")
+        self._pos += 1
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at the end of the body)."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping the consumed part.
+
+        Returns:
+            False if the body has been read completely.
+        """
+        if self._eof:
+            return False
+        try:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                self._eof = True
+                text = self._decoder.decode(b"", final=True)
+            else:
+                text = self._decoder.decode(chunk)
+        except UnicodeDecodeError as e:
+            raise SMWServerError(f"Invalid JSON response: {e}") from e
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return bool(text) or not self._eof
@@ -0,0 +1,148 @@
+"""Benchmark suite: latency, paging throughput, parse cost and memory use of the client.
+
+The stub servers run in child processes so that they do not compete with the
+client for the interpreter. Result sizes and the simulated server latency are
+set by the environment variables ``SMW_BENCH_ROWS`` (default 20000) and
+``SMW_BENCH_LATENCY`` (seconds, default 0).
+
+Run with ``task benchmark``, which saves the measurements as JSON for
+``task benchmark-compare``, or with ``pytest -s tests/bench_client.py --bench-json results.json``.
+"""
+
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+import pytest
+from smw_stub import make_row
+
+from smw_reader import MetricsRecorder, PooledHTTPClient, RequestsHTTPClient, SMWClient
+from smw_reader.endpoints import AskEndpoint
+from smw_reader.http_client import parse_json_object
+from smw_reader.json_decoding import DECODERS
+
+ROWS = int(os.environ.get("SMW_BENCH_ROWS", "20000"))
+LATENCY = float(os.environ.get("SMW_BENCH_LATENCY", "0"))
+QUERY = "[[Category:City]]|?Population|?Country|?Founded|?Tags"
+PRINTOUTS = ["Population", "Country", "Founded", "Tags"]
+HTTP_CLIENTS = {"pooled": PooledHTTPClient, "urllib": RequestsHTTPClient}
+
+
+@pytest.fixture(scope="module")
+def base_url(stub_process):
+    """Base URL of a stub serving ROWS results in pages of up to 5000."""
+    return stub_process(rows=ROWS, latency=LATENCY, max_limit=5000)
+
+
+@pytest.mark.parametrize("http_client", list(HTTP_CLIENTS))
+@pytest.mark.parametrize("limit", [1, 50, 500])
+def test_bench_single_query(base_url, bench_results, http_client, limit):
+    """Measure the latency distribution of one query, sent repeatedly."""
+    ask = AskEndpoint(SMWClient(base_url, http_client=HTTP_CLIENTS[http_client]()))
+    ask.query(f"{QUERY}|limit={limit}")  # warm up the connection
+    durations = []
+    for _ in range(100):
+        start = time.perf_counter()
+        ask.query(f"{QUERY}|limit={limit}")
+        durations.append(time.perf_counter() - start)
+
+    percentiles = statistics.quantiles(durations, n=100)
+    metrics = {
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "mean_ms": statistics.mean(durations) * 1000,
+    }
+    bench_results("single_query", {"http_client": http_client, "limit": limit, "latency": LATENCY}, **metrics)
+    print(f"\n{http_client} limit={limit}: " + ", ".join(f"{name}={value:.2f}" for name, value in metrics.items()))
+
+
+@pytest.mark.parametrize("page_size", [100, 1000, 5000])
+def test_bench_paginated_throughput(base_url, bench_results, page_size):
+    """Measure rows per second when paging through all ROWS results."""
+    metrics = MetricsRecorder()
+    ask = AskEndpoint(SMWClient(base_url, observers=[metrics]))
+    start = time.perf_counter()
+    count = sum(1 for _ in ask.iter_results(QUERY, page_size=page_size, max_offset=ROWS))
+    elapsed = time.perf_counter() - start
+
+    assert count == ROWS
+    seconds = metrics.snapshot()["ask"]["seconds"]
+    share = {
+        f"{phase}_share": seconds[phase]["mean"] * seconds[phase]["count"] / elapsed for phase in ("ttfb", "parse")
+    }
+    bench_results(
+        "paginated_throughput",
+        {"page_size": page_size, "rows": ROWS, "latency": LATENCY},
+        rows_per_second=ROWS / elapsed,
+        seconds=elapsed,
+        requests=seconds["total"]["count"],
+        **share,
+    )
+    print(f"\npage_size={page_size}: {ROWS} rows in {elapsed:.3f}s ({ROWS / elapsed:,.0f} rows/s)")
+
+
+@pytest.mark.parametrize("decoder", list(DECODERS))
+@pytest.mark.parametrize("rows", [500, 5000])
+def test_bench_parse(bench_results, rows, decoder):
+    """Measure the cost of decoding an ask response body with each installed JSON library."""
+    results = dict(make_row(index, PRINTOUTS) for index in range(rows))
+    payload = json.dumps({"query": {"results": results, "meta": {"count": rows, "offset": 0}}}).encode()
+    repeats = max(1, 50_000 // rows)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parse_json_object(payload, DECODERS[decoder])
+    elapsed = (time.perf_counter() - start) / repeats
+
+    bench_results(
+        "parse",
+        {"rows": rows, "decoder": decoder},
+        ms_per_response=elapsed * 1000,
+        rows_per_second=rows / elapsed,
+        megabytes_per_second=len(payload) / elapsed / 1e6,
+    )
+    print(f"\n{decoder}, {rows} rows ({len(payload) / 1e6:.1f} MB): {elapsed * 1000:.2f} ms per response")
+
+
+@pytest.mark.parametrize("mode", ["query", "iter_results", "query_stream"])
+def test_bench_memory(base_url, bench_results, mode):
+    """Measure the peak memory allocated while reading results at once, page by page and streamed."""
+    ask = AskEndpoint(SMWClient(base_url))
+    tracemalloc.start()
+    try:
+        if mode == "query":
+            count = len(ask.query(f"{QUERY}|limit={min(ROWS, 5000)}")["query"]["results"])
+        elif mode == "iter_results":
+            count = sum(1 for _ in ask.iter_results(QUERY, page_size=1000, max_offset=ROWS))
+        else:
+            count = sum(1 for _ in ask.query_stream(f"{QUERY}|limit={min(ROWS, 5000)}"))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    bench_results("memory", {"mode": mode, "rows": count}, peak_megabytes=peak / 1e6, peak_bytes_per_row=peak / count)
+    print(f"\n{mode}: {count} rows, peak {peak / 1e6:.1f} MB ({peak / count:,.0f} bytes/row)")
+
+
+@pytest.mark.parametrize("printouts", ["ascii", "non_ascii"])
+@pytest.mark.parametrize("lean", [False, True])
+def test_bench_lean_payload(base_url, bench_results, printouts, lean):
+    """Measure the response bytes per row of ask queries with and without lean requests."""
+    query = QUERY if printouts == "ascii" else "[[Category:City]]|?Population|?Straße|?Größe"
+    client = SMWClient(base_url, http_client=PooledHTTPClient(), lean=lean)
+    limit = min(ROWS, 5000)
+    count = len(AskEndpoint(client).query(f"{query}|limit={limit}")["query"]["results"])
+    transfer = client.http_client.last_transfer
+
+    assert count == limit and transfer is not None
+    bench_results(
+        "lean_payload",
+        {"printouts": printouts, "lean": lean, "rows": count},
+        body_bytes_per_row=transfer.body_bytes / count,
+        wire_bytes_per_row=transfer.wire_bytes / count,
+    )
+    print(
+        f"\n{printouts} lean={lean}: {transfer.body_bytes / count:.1f} body bytes/row, "
+        f"{transfer.wire_bytes / count:.1f} wire bytes/row ({transfer.content_encoding})"
+    )
@@ -0,0 +1,41 @@
+"""Benchmark: connection reuse of PooledHTTPClient versus one connection per request.
+
+Run with ``task benchmark`` (or ``pytest -s tests/bench_connection_pool.py``).
+"""
+
+import time
+
+import pytest
+from smw_stub import SMWStubServer
+
+from smw_reader import SMWClient
+from smw_reader.http_client import PooledHTTPClient, RequestsHTTPClient
+
+REQUESTS = 200
+
+
+def _run(http_client: RequestsHTTPClient) -> tuple[float, int]:
+    with SMWStubServer(total_rows=10_000) as server:
+        client = SMWClient(server.base_url, http_client=http_client)
+        start = time.perf_counter()
+        for page in range(REQUESTS):
+            client.make_request("ask", {"query": f"[[Category:City]]|?Population|limit=20|offset={page * 20}"})
+        elapsed = time.perf_counter() - start
+        return elapsed, server.connections
+
+
+@pytest.mark.parametrize("client_class", [RequestsHTTPClient, PooledHTTPClient])
+def test_bench_connection_reuse(client_class):
+    """Measure request latency and opened connections for sequential paginated requests."""
+    http_client = client_class()
+    elapsed, connections = _run(http_client)
+    if isinstance(http_client, PooledHTTPClient):
+        http_client.close()
+        assert connections == 1
+    else:
+        assert connections == REQUESTS
+
+    print(
+        f"\n{client_class.__name__}: {REQUESTS} requests in {elapsed:.3f}s "
+        f"({elapsed / REQUESTS * 1000:.2f} ms/request), {connections} TCP connections"
+    )
@@ -0,0 +1,41 @@
+"""Benchmark: throughput of exporting a paginated query to files.
+
+The stub server runs in a separate process so that it does not compete with
+the client for the interpreter. Run with ``task benchmark`` (or ``pytest -s tests/bench_export.py``).
+"""
+
+import pytest
+
+from smw_reader import SMWClient
+from smw_reader.endpoints import AskEndpoint
+from smw_reader.export import ArrowSink, CSVSink, JSONLinesSink, ParquetSink
+
+ROWS = 50_000
+QUERY = "[[Category:City]]|?Population|?Country|?Founded|?Tags"
+SINKS = {"csv": CSVSink, "jsonl": JSONLinesSink, "parquet": ParquetSink, "arrow": ArrowSink}
+
+
+@pytest.fixture(scope="module")
+def base_url(stub_process):
+    """Base URL of a stub serving ROWS results in pages of up to 5000."""
+    return stub_process(rows=ROWS, max_limit=5000)
+
+
+@pytest.mark.parametrize("format", list(SINKS))
+def test_bench_export(base_url, bench_results, tmp_path, format):  # noqa: A002
+    """Export ROWS results in batches of 10,000 and report the throughput."""
+    if format in ("parquet", "arrow"):
+        pytest.importorskip("pyarrow")
+    ask = AskEndpoint(SMWClient(base_url))
+    stats = ask.export(
+        QUERY, SINKS[format](tmp_path / f"cities.{format}"), batch_size=10_000, page_size=5000, max_offset=ROWS
+    )
+
+    assert stats.rows == ROWS
+    bench_results(
+        "export",
+        {"format": format, "rows": ROWS},
+        rows_per_second=stats.rows_per_second,
+        megabytes_per_second=stats.megabytes_per_second,
+    )
+    print(f"\n{format}: {stats}")
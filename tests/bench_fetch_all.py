@@ -0,0 +1,32 @@
+"""Benchmark: sequential paging versus parallel offset-sharded fetching.
+
+Run with ``task benchmark`` (or ``pytest -s tests/bench_fetch_all.py``).
+"""
+
+import time
+
+import pytest
+from smw_stub import SMWStubServer
+
+from smw_reader import SMWClient
+from smw_reader.endpoints import AskEndpoint
+
+ROWS = 5_000
+PAGE_SIZE = 100
+LATENCY = 0.02
+
+
+@pytest.mark.parametrize("workers", [1, 4, 8])
+def test_bench_fetch_all(workers):
+    """Measure a full export with simulated per-request server latency."""
+    with SMWStubServer(total_rows=ROWS, latency=LATENCY) as server:
+        ask = AskEndpoint(SMWClient(server.base_url))
+        start = time.perf_counter()
+        if workers == 1:
+            rows = list(ask.iter_results("[[Category:City]]|?Population", page_size=PAGE_SIZE))
+        else:
+            rows = ask.fetch_all("[[Category:City]]|?Population", workers=workers, page_size=PAGE_SIZE)
+        elapsed = time.perf_counter() - start
+
+    assert len(rows) == ROWS
+    print(f"\nworkers={workers}: {ROWS} rows in {elapsed:.3f}s ({ROWS / elapsed:,.0f} rows/s)")
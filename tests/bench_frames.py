@@ -0,0 +1,62 @@
+"""Benchmark: bulk DataFrame conversion versus naive row-by-row flattening.
+
+Run with ``task benchmark`` (or ``pytest -s tests/bench_frames.py``).
+"""
+
+import time
+
+import pandas as pd
+import pytest
+from smw_stub import TYPE_IDS, make_row
+
+from smw_reader.frames import to_dataframe
+
+ROWS = 100_000
+PRINTOUTS = ["Population", "Country", "Founded", "Tags"]
+
+
+@pytest.fixture(scope="module")
+def response():
+    """A single ask response with ROWS synthetic results."""
+    printrequests = [{"label": "", "key": "", "redi": "", "typeid": "_wpg", "mode": 2}] + [
+        {"label": p, "key": p, "redi": "", "typeid": TYPE_IDS[p], "mode": 1} for p in PRINTOUTS
+    ]
+    results = dict(make_row(i, PRINTOUTS) for i in range(ROWS))
+    return {"query": {"printrequests": printrequests, "results": results}}
+
+
+def naive_dataframe(response):
+    """Flatten each row in Python and convert every value on its own, as hand-written exports do."""
+    records = []
+    for subject, entry in response["query"]["results"].items():
+        printouts = entry["printouts"]
+        population = printouts["Population"]
+        country = printouts["Country"]
+        founded = printouts["Founded"]
+        records.append(
+            {
+                "subject": subject,
+                "Population": float(population[0]) if population else None,
+                "Country": country[0]["fulltext"] if country else None,
+                "Founded": pd.Timestamp(int(founded[0]["timestamp"]), unit="s", tz="UTC") if founded else None,
+                "Tags": printouts["Tags"][0] if printouts["Tags"] else None,
+            }
+        )
+    return pd.DataFrame.from_records(records)
+
+
+@pytest.mark.parametrize("pause_gc", [False, True])
+@pytest.mark.parametrize("converter", ["naive", "first", "list", "explode"])
+def test_bench_frames(response, converter, pause_gc):
+    """Measure the conversion of ROWS results into a DataFrame, with and without pausing the garbage collector."""
+    if converter == "naive" and pause_gc:
+        pytest.skip("the naive conversion has no pause_gc option")
+    start = time.perf_counter()
+    if converter == "naive":
+        frame = naive_dataframe(response)
+    else:
+        frame = to_dataframe(response, multivalue=converter, pause_gc=pause_gc)
+    elapsed = time.perf_counter() - start
+
+    assert len(frame) == (2 * ROWS if converter == "explode" else ROWS)
+    print(f"\n{converter} pause_gc={pause_gc}: {ROWS} rows in {elapsed:.3f}s ({ROWS / elapsed:,.0f} rows/s)")
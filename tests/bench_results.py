@@ -0,0 +1,50 @@
+"""Benchmark: memory per row of raw ask results versus the compact ResultSet.
+
+Run with ``task benchmark`` (or ``pytest -s tests/bench_results.py``).
+"""
+
+import gc
+import json
+import tracemalloc
+
+import pytest
+from smw_stub import make_row
+
+from smw_reader.endpoints.ask import iter_result_rows
+from smw_reader.results import ResultSet
+
+ROWS = 100_000
+PRINTOUTS = ["Population", "Country", "Founded", "Tags"]
+
+
+@pytest.fixture(scope="module")
+def payload():
+    """The body of a single ask response with ROWS synthetic results."""
+    results = dict(make_row(index, PRINTOUTS) for index in range(ROWS))
+    return json.dumps({"query": {"results": results}}).encode()
+
+
+def _retained(build):
+    """Return the result of `build` and the memory it still holds once built."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = build()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, retained
+
+
+@pytest.mark.parametrize("form", ["raw", "compact"])
+def test_bench_result_memory(payload, bench_results, form):
+    """Measure the memory retained per row by each representation."""
+    if form == "raw":
+        rows, retained = _retained(lambda: list(iter_result_rows(json.loads(payload))))
+    else:
+        rows, retained = _retained(lambda: ResultSet([json.loads(payload)]))
+
+    assert len(rows) == ROWS
+    bench_results("result_memory", {"form": form, "rows": ROWS}, bytes_per_row=retained / ROWS)
+    print(f"\n{form}: {retained / 1e6:.1f} MB for {ROWS} rows ({retained / ROWS:,.0f} bytes/row)")
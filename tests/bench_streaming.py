@@ -0,0 +1,42 @@
+"""Benchmark: peak memory of parsing a large result page at once versus streaming it.
+
+The stub server runs in a separate process so that only the client's
+allocations are traced.
+
+Run with ``task benchmark`` (or ``pytest -s tests/bench_streaming.py``).
+"""
+
+import time
+import tracemalloc
+
+import pytest
+
+from smw_reader import SMWClient
+from smw_reader.endpoints import AskEndpoint
+
+ROWS = 20_000
+QUERY = "[[Category:City]]|?Population|?Country|?Founded|?Tags"
+
+
+@pytest.fixture(scope="module")
+def base_url(stub_process):
+    """Base URL of a stub serving all ROWS results in one page."""
+    return stub_process(rows=ROWS, max_limit=ROWS)
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_bench_streaming(base_url, stream):
+    """Measure time and peak Python heap usage for one large page."""
+    ask = AskEndpoint(SMWClient(base_url))
+    tracemalloc.start()
+    start = time.perf_counter()
+    if stream:
+        count = sum(1 for _ in ask.query_stream(QUERY, limit=ROWS))
+    else:
+        count = len(ask.query(QUERY, limit=ROWS)["query"]["results"])
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert count == ROWS
+    print(f"\nstream={stream}: {ROWS} rows in {elapsed:.3f}s, peak heap {peak / 2**20:.1f} MiB")
@@ -0,0 +1,85 @@
+"""Shared pytest fixtures."""
+
+import importlib.metadata
+import json
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from smw_stub import SMWStubServer
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option for saving benchmark results."""
+    parser.addoption(
+        "--bench-json",
+        metavar="PATH",
+        help="write the measurements of the benchmarks (tests/bench_*.py) to this JSON file",
+    )
+
+
+@pytest.fixture
+def smw_stub() -> Iterator[SMWStubServer]:
+    """Run a local SMW ``api.php`` stand-in for the duration of a test."""
+    with SMWStubServer() as server:
+        yield server
+
+
+@pytest.fixture(scope="session")
+def stub_process() -> Iterator[Callable[..., str]]:
+    """Start SMW stand-ins in child processes, so that they do not compete with the client for the interpreter.
+
+    Yields a function taking the ``smw_stub.py`` options (rows, latency,
+    max_limit) and returning the base URL of a server started with them. All
+    servers are stopped at the end of the session.
+    """
+    processes: list[subprocess.Popen[str]] = []
+
+    def start(rows: int = 100, latency: float = 0.0, max_limit: int = 500) -> str:
+        stub = Path(__file__).with_name("smw_stub.py")
+        options = ["--rows", str(rows), "--latency", str(latency), "--max-limit", str(max_limit)]
+        process = subprocess.Popen([sys.executable, str(stub), *options], stdout=subprocess.PIPE, text=True)
+        processes.append(process)
+        assert process.stdout is not None
+        return process.stdout.readline().strip()
+
+    try:
+        yield start
+    finally:
+        for process in processes:
+            process.terminate()
+            process.wait()
+
+
+@pytest.fixture(scope="session")
+def bench_results(request: pytest.FixtureRequest) -> Iterator[Callable[..., None]]:
+    """Collect benchmark measurements and write them to the ``--bench-json`` file at the end of the session.
+
+    Yields a function ``record(name, params, **metrics)``. The file holds the
+    version of smw-reader, the Python version and platform, and one entry per
+    measurement, so that runs against different versions can be compared (see
+    ``task benchmark-compare``).
+    """
+    results: list[dict[str, Any]] = []
+
+    def record(name: str, params: dict[str, Any] | None = None, **metrics: float) -> None:
+        results.append({"name": name, "params": params or {}, "metrics": metrics})
+
+    yield record
+
+    path = request.config.getoption("--bench-json")
+    if path and results:
+        report = {
+            "version": importlib.metadata.version("smw-reader"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,385 @@
+"""Local stand-in for a Semantic MediaWiki ``api.php`` used by tests and benchmarks.
+
+The stub answers ``action=ask`` requests with synthetic, deterministic result
+rows so that the HTTP layer and the endpoints can be exercised end to end over
+real sockets without a wiki.
+
+Run ``python tests/smw_stub.py --rows N`` to serve it from a separate process
+(useful when measuring the client's memory use); the base URL is printed on
+the first line of output.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import datetime
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import urllib.parse
+from collections.abc import Sequence
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+TYPE_IDS = {
+    "Population": "_num",
+    "Area": "_num",
+    "Country": "_wpg",
+    "Founded": "_dat",
+    "Tags": "_txt",
+    "Modification date": "_dat",
+}
+COUNTRIES = ["Germany", "France", "Italy", "Spain", "Poland", "Austria", "Sweden", "Norway"]
+MODIFIED_BASE = 1_700_000_000
+"""Modification timestamp of the first row; each further row was modified a minute later."""
+COMPARISON = re.compile(r"\[\[([^:\]]+)::([<>≤≥])([^\]]*)\]\]")
+"""A ``[[Property::>value]]`` or ``[[Property::<value]]`` condition, or one with the always inclusive ``≥`` or ``≤``."""
+NAMESPACE_ID = 3000
+"""Number of the namespace of pages built with a namespace name."""
+TITLE_PATTERN = re.compile(r"\[\[(!?)~([^\]]*)\]\]")
+"""A ``[[~Pattern]]`` or ``[[!~Pattern]]`` condition on the page title, where ``*`` matches any text."""
+
+
+def make_row(
+    index: int, printouts: list[str], modified: int | None = None, namespace: str = "", title: str | None = None
+) -> tuple[str, dict[str, Any]]:
+    """Build one synthetic ask result row.
+
+    Args:
+        index: Position of the row in the full result set.
+        printouts: Names of the requested printouts.
+        modified: Modification timestamp of the page; defaults to a minute
+            after the previous row's.
+        namespace: Name of the page's namespace; pages are in the main
+            namespace by default.
+        title: Title of the page; defaults to 'City' and the index.
+
+    Returns:
+        The subject and its result entry in SMW's JSON serialization.
+    """
+    title = f"City {index:06d}" if title is None else title
+    subject = f"{namespace}:{title}" if namespace else title
+    values: dict[str, list[Any]] = {}
+    for name in printouts:
+        if name == "Population":
+            values[name] = [1000 + index * 7]
+        elif name == "Area":
+            values[name] = [index // 2 if index % 2 == 0 else index / 2]
+        elif name == "Country":
+            country = COUNTRIES[index % len(COUNTRIES)]
+            values[name] = [
+                {
+                    "fulltext": country,
+                    "fullurl": f"https://wiki.example.org/wiki/{country}",
+                    "namespace": 0,
+                    "exists": "1",
+                    "displaytitle": "",
+                }
+            ]
+        elif name == "Founded":
+            timestamp = 946684800 + index * 86400
+            year, month, day = time.gmtime(timestamp)[:3]
+            values[name] = [{"timestamp": str(timestamp), "raw": f"1/{year}/{month}/{day}"}]
+        elif name == "Modification date":
+            timestamp = MODIFIED_BASE + index * 60 if modified is None else modified
+            values[name] = [
+                {"timestamp": str(timestamp), "raw": time.strftime("1/%Y/%m/%d/%H/%M/%S/0", time.gmtime(timestamp))}
+            ]
+        elif name == "Tags":
+            values[name] = [f"tag-{index % 3}", f"tag-{index % 5}"]
+        else:
+            values[name] = [f"{name} value {index}"]
+    entry = {
+        "printouts": values,
+        "fulltext": subject,
+        "fullurl": f"https://wiki.example.org/wiki/{subject.replace(' ', '_')}",
+        "namespace": NAMESPACE_ID if namespace else 0,
+        "exists": "1",
+        "displaytitle": "",
+    }
+    return subject, entry
+
+
+def parse_ask_query(query: str) -> tuple[str, list[str], dict[str, str]]:
+    """Split an ask query into conditions, printouts and inline parameters."""
+    parts = query.split("|")
+    conditions = parts[0]
+    printouts = [p.strip()[1:] for p in parts[1:] if p.strip().startswith("?")]
+    params = dict(p.split("=", 1) for p in parts[1:] if "=" in p and not p.strip().startswith("?"))
+    return conditions, printouts, params
+
+
+class SMWStubServer:
+    """A threaded HTTP/1.1 server imitating an SMW ``api.php``.
+
+    Attributes:
+        total_rows: Number of rows matched by every ask query.
+        latency: Seconds to sleep before answering each request.
+        max_limit: Largest page size the server accepts (like ``$smwgQMaxInlineLimit``).
+        compress: Whether to gzip responses for clients that accept it.
+        etags: Whether to send ETag headers and answer matching If-None-Match with 304.
+        throttle: Number of upcoming requests to refuse with 429 Too Many Requests.
+        retry_after: Retry-After header sent with 429 responses.
+        failures: HTTP error statuses to answer the next requests with, in order.
+        lag: Simulated replication lag in seconds; requests whose ``maxlag`` is
+            lower get a maxlag error.
+        modified: Modification timestamps of edited rows, by row index.
+        removed: Indices of rows that no longer match (deleted pages).
+        namespace: Name of the namespace of all pages; by default they are in
+            the main namespace. Title conditions match the title without it.
+        titles: Titles of rows that are not called 'City' and their index.
+            Results without a sort order are returned in order of title.
+        strict_comparators: Whether ``>`` and ``<`` exclude the value itself,
+            like SMW with ``$smwStrictComparators``; by default they include it.
+        connections: Number of TCP connections accepted so far.
+        requests: Number of requests answered so far.
+        not_modified: Number of requests answered with 304 Not Modified.
+    """
+
+    def __init__(self, total_rows: int = 100, latency: float = 0.0, max_limit: int = 500) -> None:
+        self.total_rows = total_rows
+        self.latency = latency
+        self.max_limit = max_limit
+        self.compress = True
+        self.etags = False
+        self.throttle = 0
+        self.retry_after = "0"
+        self.failures: list[int] = []
+        self.lag = 0.0
+        self.modified: dict[int, int] = {}
+        self.removed: set[int] = set()
+        self.namespace = ""
+        self.titles: dict[int, str] = {}
+        self.strict_comparators = False
+        self.connections = 0
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """Base URL of the stand-in wiki."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/w/"
+
+    @property
+    def api_url(self) -> str:
+        """URL of the stand-in ``api.php``."""
+        return f"{self.base_url}api.php"
+
+    def start(self) -> SMWStubServer:
+        """Start serving in a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the server and wait for the serving thread."""
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> SMWStubServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def answer(self, params: dict[str, str]) -> tuple[int, dict[str, Any]]:
+        """Compute the status and JSON document for one API request."""
+        if params.get("action") != "ask":
+            info = f'Unrecognized value for parameter "action": {params.get("action")}.'
+            return 200, {"error": {"code": "badvalue", "info": info}}
+        if "maxlag" in params and self.lag > float(params["maxlag"]):
+            info = f"Waiting for db1: {self.lag} seconds lagged."
+            return 200, {"error": {"code": "maxlag", "info": info, "host": "db1", "lag": self.lag, "type": "db"}}
+
+        conditions, printouts, inline = parse_ask_query(params.get("query", ""))
+        indices = self.matching(conditions)
+        sort = inline.get("sort")
+        if sort:
+            indices = sorted(indices, key=lambda i: (self.value(sort, i), i))
+        elif self.titles:
+            indices = sorted(indices, key=self.title)
+        if inline.get("order") == "desc":
+            indices = indices[::-1]
+        if inline.get("format") == "count":
+            meta = {"hash": "stub", "count": len(indices), "offset": 0, "source": "", "time": "0.000"}
+            return 200, {"query": {"printrequests": [], "results": [], "meta": meta}}
+        limit = min(int(inline.get("limit", 50)), self.max_limit)
+        offset = int(inline.get("offset", 0))
+        end = min(offset + limit, len(indices))
+        results = dict(
+            make_row(i, printouts, self.modification_time(i), self.namespace, self.title(i))
+            for i in indices[offset:end]
+        )
+        document: dict[str, Any] = {
+            "query": {
+                "printrequests": [{"label": "", "key": "", "redi": "", "typeid": "_wpg", "mode": 2}]
+                + [
+                    {"label": p, "key": p.replace(" ", "_"), "redi": "", "typeid": TYPE_IDS.get(p, "_txt"), "mode": 1}
+                    for p in printouts
+                ],
+                "results": results,
+                "serializer": "SMW\\Serializers\\QueryResultSerializer",
+                "version": 2,
+                "meta": {"hash": "stub", "count": len(results), "offset": offset, "source": "", "time": "0.000"},
+            }
+        }
+        if end < len(indices):
+            document["query-continue-offset"] = end
+        return 200, document
+
+    def matching(self, conditions: str) -> Sequence[int]:
+        """Return the indices of the rows matching the conditions of a query, in result order."""
+        indices: Sequence[int] = range(self.total_rows)
+        comparisons = [(name, op, self._parse(name, text)) for name, op, text in COMPARISON.findall(conditions)]
+        patterns = [
+            (negated, re.compile(".*".join(map(re.escape, pattern.split("*")))))
+            for negated, pattern in TITLE_PATTERN.findall(conditions)
+        ]
+        if not comparisons and not patterns and not self.removed:
+            return indices
+        return [
+            i
+            for i in indices
+            if i not in self.removed
+            and all(bool(pattern.fullmatch(self.title(i))) != bool(negated) for negated, pattern in patterns)
+            and all(self._compare(self.value(name, i), op, bound) for name, op, bound in comparisons)
+        ]
+
+    def _compare(self, value: Any, op: str, bound: Any) -> bool:
+        """Evaluate a comparison condition for one value."""
+        if op in "≥≤" or not self.strict_comparators:
+            return bool(value >= bound if op in ">≥" else value <= bound)
+        return bool(value > bound if op == ">" else value < bound)
+
+    def title(self, index: int) -> str:
+        """Return the title of a row's page, without namespace."""
+        return self.titles.get(index, f"City {index:06d}")
+
+    def modification_time(self, index: int) -> int:
+        """Return the modification timestamp of a row."""
+        return self.modified.get(index, MODIFIED_BASE + index * 60)
+
+    def value(self, name: str, index: int) -> Any:
+        """Return the sortable value of a property of a row."""
+        if name == "Population":
+            return 1000 + index * 7
+        if name == "Area":
+            return index / 2
+        if name == "Country":
+            return COUNTRIES[index % len(COUNTRIES)]
+        if name == "Founded":
+            return 946684800 + index * 86400
+        if name == "Modification date":
+            return self.modification_time(index)
+        raise ValueError(f"The stub cannot sort or compare by {name!r}")
+
+    @staticmethod
+    def _parse(name: str, text: str) -> Any:
+        """Parse the value of a comparison condition on a property."""
+        if name in ("Founded", "Modification date"):
+            return datetime.datetime.fromisoformat(text).replace(tzinfo=datetime.UTC).timestamp()
+        if name in ("Population", "Area"):
+            return float(text)
+        return text
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def setup(self) -> None:
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self) -> None:  # noqa: N802
+                parts = urllib.parse.urlsplit(self.path)
+                if not parts.path.endswith("api.php"):
+                    self.send_error(404)
+                    return
+                self._respond(dict(urllib.parse.parse_qsl(parts.query)))
+
+            def do_POST(self) -> None:  # noqa: N802
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode("utf-8")
+                self._respond(dict(urllib.parse.parse_qsl(body)))
+
+            def _respond(self, params: dict[str, str]) -> None:
+                with stub._lock:
+                    stub.requests += 1
+                    throttled = stub.throttle > 0
+                    stub.throttle -= throttled
+                    failure = stub.failures.pop(0) if stub.failures else None
+                if stub.latency:
+                    time.sleep(stub.latency)
+                if throttled:
+                    self._send_error_status(429, b"Too many requests", {"Retry-After": stub.retry_after})
+                    return
+                if failure is not None:
+                    self._send_error_status(failure, b"Upstream failure", {})
+                    return
+                status, document = stub.answer(params)
+                # Like MediaWiki, escape non-ASCII characters unless utf8 is set, which formatversion=2 implies.
+                utf8 = "utf8" in params or params.get("formatversion") == "2"
+                payload = json.dumps(document, ensure_ascii=not utf8).encode("utf-8")
+                etag = f'"{hashlib.sha1(payload, usedforsecurity=False).hexdigest()}"'
+                if stub.etags and self.headers.get("If-None-Match") == etag:
+                    with stub._lock:
+                        stub.not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                if stub.etags:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                if stub.compress and "gzip" in self.headers.get("Accept-Encoding", ""):
+                    payload = gzip.compress(payload, compresslevel=6)
+                    self.send_header("Content-Encoding", "gzip")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _send_error_status(self, status: int, payload: bytes, headers: dict[str, str]) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    """Serve the stub until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0] if __doc__ else None)
+    parser.add_argument("--rows", type=int, default=100, help="rows matched by every ask query")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before each answer")
+    parser.add_argument("--max-limit", type=int, default=500, help="largest page size served")
+    args = parser.parse_args()
+    with SMWStubServer(total_rows=args.rows, latency=args.latency, max_limit=args.max_limit) as server:
+        print(server.base_url, flush=True)
+        with contextlib.suppress(KeyboardInterrupt):
+            threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
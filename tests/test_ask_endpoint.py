@@ -1,11 +1,22 @@
 """Tests for SMW Ask endpoint."""
 
+import time
 from unittest.mock import Mock
 
 import pytest
 
-from smw_reader.endpoints.ask import AskEndpoint, QueryBuilder
-from smw_reader.exceptions import SMWValidationError
+from smw_reader.cache import MemoryCache
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import (
+    AskEndpoint,
+    OffsetPager,
+    QueryBuilder,
+    bound_condition,
+    condition_value,
+    result_count,
+)
+from smw_reader.exceptions import SMWAPIError, SMWResultLimitWarning, SMWServerError, SMWValidationError
+from smw_reader.interfaces import HTTPClient
 
 
 class TestAskEndpoint:
@@ -70,3 +81,447 @@ class TestAskEndpoint:
         result = ask_endpoint.query_category("Test", printouts=["Name", "?Age"])
         assert result == {}
         ask_endpoint._client.make_request.assert_called_once_with("ask", {"query": "[[Category:Test]]|?Name|?Age"})
+
+
+def ask_page(start, stop, continue_offset=None):
+    """Build an ask response containing the rows start..stop-1."""
+    response = {"query": {"results": {f"Page {i}": {"printouts": {"N": [i]}} for i in range(start, stop)}}}
+    if continue_offset is not None:
+        response["query-continue-offset"] = continue_offset
+    return response
+
+
+class TestIterResults:
+    """Test cases for AskEndpoint.iter_results."""
+
+    @pytest.fixture
+    def ask_endpoint(self):
+        """Create an AskEndpoint instance for testing."""
+        return AskEndpoint(Mock())
+
+    def test_follows_continuation_offset(self, ask_endpoint):
+        """Test that all pages are fetched in order."""
+        ask_endpoint._client.make_request.side_effect = [ask_page(0, 2, 2), ask_page(2, 4, 4), ask_page(4, 5)]
+
+        rows = list(ask_endpoint.iter_results("[[Category:Test]]", page_size=2))
+
+        assert [subject for subject, _ in rows] == [f"Page {i}" for i in range(5)]
+        assert rows[3][1]["printouts"]["N"] == [3]
+        queries = [call.args[1]["query"] for call in ask_endpoint._client.make_request.call_args_list]
+        assert queries == [
+            "[[Category:Test]]|limit=2|offset=0",
+            "[[Category:Test]]|limit=2|offset=2",
+            "[[Category:Test]]|limit=2|offset=4",
+        ]
+
+    def test_pages_are_fetched_lazily(self, ask_endpoint):
+        """Test that the next page is requested only when the current one is consumed."""
+        ask_endpoint._client.make_request.side_effect = [ask_page(0, 2, 2), ask_page(2, 4)]
+
+        rows = ask_endpoint.iter_results("[[Category:Test]]", page_size=2)
+        next(rows)
+        next(rows)
+
+        assert ask_endpoint._client.make_request.call_count == 1
+        next(rows)
+        assert ask_endpoint._client.make_request.call_count == 2
+
+    def test_empty_result(self, ask_endpoint):
+        """Test that an empty result list ends iteration."""
+        ask_endpoint._client.make_request.return_value = {"query": {"results": []}}
+
+        assert list(ask_endpoint.iter_results("[[Category:Empty]]")) == []
+
+    def test_list_results(self, ask_endpoint):
+        """Test that list-shaped results are supported."""
+        ask_endpoint._client.make_request.return_value = {
+            "query": {"results": [{"A": {"printouts": {}}}, {"fulltext": "B", "printouts": {}}]}
+        }
+
+        assert [subject for subject, _ in ask_endpoint.iter_results("[[Category:Test]]")] == ["A", "B"]
+
+    def test_stops_at_max_offset_with_warning(self, ask_endpoint):
+        """Test that hitting the maximum offset stops iteration and warns."""
+        ask_endpoint._client.make_request.side_effect = [ask_page(0, 3, 3), ask_page(3, 5, 5)]
+
+        with pytest.warns(SMWResultLimitWarning, match="maximum offset of 5"):
+            rows = list(ask_endpoint.iter_results("[[Category:Test]]", page_size=3, max_offset=5))
+
+        assert len(rows) == 5
+        last_query = ask_endpoint._client.make_request.call_args.args[1]["query"]
+        assert last_query == "[[Category:Test]]|limit=2|offset=3"
+
+    def test_custom_start_offset(self, ask_endpoint):
+        """Test starting iteration at a given offset."""
+        ask_endpoint._client.make_request.return_value = ask_page(10, 12)
+
+        rows = list(ask_endpoint.iter_results("[[Category:Test]]", offset=10, limit=99))
+
+        assert len(rows) == 2
+        assert ask_endpoint._client.make_request.call_args.args[1]["query"] == "[[Category:Test]]|limit=50|offset=10"
+
+    def test_non_advancing_offset_raises(self, ask_endpoint):
+        """Test that a continuation offset that does not advance is an error."""
+        ask_endpoint._client.make_request.return_value = ask_page(0, 2, 0)
+
+        with pytest.raises(SMWServerError):
+            list(ask_endpoint.iter_results("[[Category:Test]]", page_size=2))
+
+    def test_invalid_page_size(self, ask_endpoint):
+        """Test that the page size must be positive."""
+        with pytest.raises(SMWValidationError):
+            list(ask_endpoint.iter_results("[[Category:Test]]", page_size=0))
+
+    def test_against_stub_server(self, smw_stub):
+        """Test paging through a full result set over HTTP."""
+        smw_stub.total_rows = 230
+        client = SMWClient(smw_stub.base_url)
+        endpoint = AskEndpoint(client)
+
+        subjects = [subject for subject, _ in endpoint.iter_results("[[Category:City]]|?Population", page_size=100)]
+
+        assert len(subjects) == 230
+        assert len(set(subjects)) == 230
+        assert smw_stub.requests == 3
+
+    def test_stream_against_stub_server(self, smw_stub):
+        """Test that streamed pages yield the same rows as downloaded ones."""
+        smw_stub.total_rows = 230
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        streamed = list(endpoint.iter_results("[[Category:City]]|?Population|?Tags", page_size=100, stream=True))
+        downloaded = list(endpoint.iter_results("[[Category:City]]|?Population|?Tags", page_size=100))
+
+        assert streamed == downloaded
+        assert smw_stub.requests == 6
+
+
+class TestOffsetPager:
+    """Test cases for the paging rules shared by the sync and async endpoints."""
+
+    def test_windows(self):
+        """Test that pages follow the continuation offset and stop at the maximum offset with a warning."""
+        params = {"limit": 5, "offset": 10, "sort": "Population"}
+        pager = OffsetPager(20, 45, params)
+
+        assert params == {"sort": "Population"}
+        assert pager.window() == (20, 10)
+        assert pager.advance({"query-continue-offset": 30})
+        assert pager.window() == (15, 30)
+        assert pager.advance({"query-continue-offset": 45})
+        with pytest.warns(SMWResultLimitWarning, match="maximum offset of 45"):
+            assert pager.window() is None
+
+    def test_last_page(self):
+        """Test that a response without continuation ends paging."""
+        assert not OffsetPager(20, 100, {}).advance({"query": {"results": {}}})
+
+    def test_offset_must_advance(self):
+        """Test that a continuation offset that does not advance is rejected."""
+        pager = OffsetPager(20, 100, {"offset": 40})
+
+        with pytest.raises(SMWServerError, match="does not advance"):
+            pager.advance({"query-continue-offset": 40})
+
+
+class TestKeysetPagination:
+    """Test cases for keyset pagination in AskEndpoint.iter_pages and iter_results."""
+
+    def test_reaches_beyond_max_offset(self, smw_stub, recwarn):
+        """Test that keyset pages cover result sets larger than the maximum offset."""
+        smw_stub.total_rows = 230
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        rows = list(endpoint.iter_results("[[Category:City]]", page_size=50, max_offset=100, keyset="Population"))
+
+        assert [subject for subject, _ in rows] == [f"City {index:06d}" for index in range(230)]
+        assert rows[-1][1]["printouts"]["Population"] == [1000 + 229 * 7]
+        assert smw_stub.requests == 5
+        assert not recwarn.list
+
+    def test_ties_across_pages(self, smw_stub):
+        """Test that results sharing a key value are neither repeated nor skipped."""
+        smw_stub.total_rows = 230
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+        queries = []
+        query = endpoint.query
+        endpoint.query = lambda text, **params: queries.append((text, params.get("offset"))) or query(text, **params)
+
+        subjects = [
+            subject for subject, _ in endpoint.iter_results("[[Category:City]]", page_size=20, keyset="Country")
+        ]
+
+        assert sorted(subjects) == [f"City {index:06d}" for index in range(230)]
+        # 29 cities each are in Austria and France: the second page skips the 20 from Austria already seen,
+        # the third the 11 from France.
+        assert queries[1] == ("[[Category:City]][[Country::>Austria]]|?Country", 20)
+        assert queries[2] == ("[[Category:City]][[Country::>France]]|?Country", 11)
+
+    @pytest.mark.parametrize("strict_comparators", [False, True])
+    def test_strict_comparators(self, smw_stub, strict_comparators):
+        """Test that no ties are lost on a wiki whose ">" excludes the value itself."""
+        smw_stub.total_rows = 230
+        smw_stub.strict_comparators = True
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url), strict_comparators=strict_comparators)
+
+        subjects = [
+            subject for subject, _ in endpoint.iter_results("[[Category:City]]", page_size=20, keyset="Country")
+        ]
+
+        if strict_comparators:
+            assert sorted(subjects) == [f"City {index:06d}" for index in range(230)]
+        else:
+            # Without the option, the cities of each country beyond the first page are skipped.
+            assert len(subjects) < 230
+
+    def test_missing_key_value(self):
+        """Test that a result without a key value cannot be paged past."""
+        client = Mock()
+        client.make_request.return_value = {"query-continue-offset": 1, "query": {"results": {"A": {"printouts": {}}}}}
+        endpoint = AskEndpoint(client)
+
+        with pytest.raises(SMWServerError, match="no value for the keyset property 'Population'"):
+            list(endpoint.iter_pages("[[Category:City]]", keyset="Population"))
+
+    def test_invalid_combinations(self):
+        """Test that keyset pagination cannot start at an offset or stream."""
+        endpoint = AskEndpoint(Mock())
+
+        with pytest.raises(SMWValidationError):
+            endpoint.iter_pages("[[Category:City]]", keyset="Population", offset=10)
+        with pytest.raises(SMWValidationError):
+            next(endpoint.iter_results("[[Category:City]]", keyset="Population", stream=True))
+
+    def test_condition_value(self):
+        """Test the formatting of key values for conditions."""
+        assert condition_value({"fulltext": "Category:A|B", "namespace": 14}) == "Category:A&#124;B"
+        assert condition_value({"timestamp": "946684800", "raw": "1/2000/1/1"}) == "2000-01-01T00:00:00"
+        assert condition_value({"value": 891.8, "unit": "km²"}) == "891.8 km²"
+        assert condition_value(True) == "true"
+        assert condition_value(12.5) == "12.5"
+
+    def test_bound_condition(self):
+        """Test that strict comparators are replaced by inclusive ones."""
+        assert bound_condition("Population", ">", "1000") == "[[Population::>1000]]"
+        assert bound_condition("Population", ">", "1000", strict_comparators=True) == "[[Population::≥1000]]"
+        assert bound_condition("Population", "<", "1000", strict_comparators=True) == "[[Population::≤1000]]"
+
+
+class TestQueryStream:
+    """Test cases for AskEndpoint.query_stream."""
+
+    def test_matches_query(self, smw_stub):
+        """Test that streamed rows equal the rows of a regular query."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        query = "[[Category:City]]|?Population|?Country"
+
+        streamed = list(endpoint.query_stream(query, limit=80))
+
+        assert streamed == list(endpoint.query(query, limit=80)["query"]["results"].items())
+
+    def test_api_error(self):
+        """Test that an error response is raised after parsing."""
+        http_client = Mock()
+        http_client.get_stream.return_value = iter([b'{"error": {"code": "smw-error", "info": "Bad query"}}'])
+        endpoint = AskEndpoint(SMWClient("https://example.org/w/", http_client=http_client))
+
+        with pytest.raises(SMWAPIError, match="Bad query"):
+            list(endpoint.query_stream("[[A]]"))
+
+    def test_without_streaming_transport(self):
+        """Test that HTTP clients without streaming support fall back to a full download."""
+        http_client = Mock()
+        http_client.get.return_value = {"query": {"results": [{"fulltext": "A", "printouts": {}}]}}
+        http_client.get_stream.side_effect = lambda url, **kwargs: HTTPClient.get_stream(http_client, url, **kwargs)
+        endpoint = AskEndpoint(SMWClient("https://example.org/w/", http_client=http_client))
+
+        assert list(endpoint.query_stream("[[A]]")) == [("A", {"fulltext": "A", "printouts": {}})]
+        assert http_client.get.call_args.kwargs["params"]["query"] == "[[A]]"
+
+
+class TestFetchAll:
+    """Test cases for AskEndpoint.fetch_all."""
+
+    @pytest.fixture
+    def ask_endpoint(self):
+        """Create an AskEndpoint instance for testing."""
+        return AskEndpoint(Mock())
+
+    def test_result_count(self):
+        """Test extracting the count from format=count responses."""
+        assert result_count({"query": {"meta": {"count": 12}}}) == 12
+        assert result_count({"query": {"count": "7"}}) == 7
+        assert result_count({"query": {"results": {}}}) is None
+
+    def test_fetches_disjoint_windows(self, ask_endpoint):
+        """Test that the count is probed and windows are fetched without overlap."""
+
+        def make_request(action, params, **kwargs):
+            query = params["query"]
+            if "format=count" in query:
+                return {"query": {"meta": {"count": 5}}}
+            offset = int(query.split("offset=")[1].split("|")[0])
+            limit = int(query.split("limit=")[1].split("|")[0])
+            return ask_page(offset, min(offset + limit, 5))
+
+        ask_endpoint._client.make_request.side_effect = make_request
+
+        rows = ask_endpoint.fetch_all("[[Category:Test]]", workers=3, page_size=2, sort="N")
+
+        assert [subject for subject, _ in rows] == [f"Page {i}" for i in range(5)]
+        queries = sorted(call.args[1]["query"] for call in ask_endpoint._client.make_request.call_args_list)
+        assert queries == [
+            "[[Category:Test]]|format=count",
+            "[[Category:Test]]|limit=1|offset=4|sort=N",
+            "[[Category:Test]]|limit=2|offset=0|sort=N",
+            "[[Category:Test]]|limit=2|offset=2|sort=N",
+        ]
+
+    def test_plans_even_windows(self, ask_endpoint):
+        """Test that the count spreads the results evenly over the fewest windows."""
+        ask_endpoint._client.make_request.side_effect = lambda action, params, **kwargs: (
+            {"query": {"meta": {"count": 0 if "Empty" in params["query"] else 9}}}
+            if "format=count" in params["query"]
+            else ask_page(0, 0)
+        )
+
+        ask_endpoint.fetch_all("[[Category:Test]]", workers=8, page_size=4)
+        assert ask_endpoint.fetch_all("[[Category:Empty]]") == []
+
+        queries = sorted(call.args[1]["query"] for call in ask_endpoint._client.make_request.call_args_list)
+        assert queries == [
+            "[[Category:Empty]]|format=count",
+            "[[Category:Test]]|format=count",
+            "[[Category:Test]]|limit=3|offset=0",
+            "[[Category:Test]]|limit=3|offset=3",
+            "[[Category:Test]]|limit=3|offset=6",
+        ]
+
+    def test_falls_back_without_count(self, ask_endpoint):
+        """Test sequential paging when the wiki reports no count."""
+        ask_endpoint._client.make_request.side_effect = [{"query": {"results": []}}, ask_page(0, 2, 2), ask_page(2, 3)]
+
+        rows = ask_endpoint.fetch_all("[[Category:Test]]", page_size=2)
+
+        assert len(rows) == 3
+
+    def test_warns_beyond_max_offset(self, ask_endpoint):
+        """Test that results beyond the maximum offset are reported."""
+        ask_endpoint._client.make_request.side_effect = [{"query": {"meta": {"count": 10}}}, ask_page(0, 4, 4)]
+
+        with pytest.warns(SMWResultLimitWarning):
+            rows = ask_endpoint.fetch_all("[[Category:Test]]", page_size=10, max_offset=4)
+
+        assert len(rows) == 4
+
+    def test_invalid_workers(self, ask_endpoint):
+        """Test that the worker count must be positive."""
+        with pytest.raises(SMWValidationError):
+            ask_endpoint.fetch_all("[[Category:Test]]", workers=0)
+
+    def test_against_stub_server(self, smw_stub):
+        """Test a parallel export over HTTP returns every row in order."""
+        smw_stub.total_rows = 1050
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        rows = endpoint.fetch_all("[[Category:City]]|?Population", workers=4, page_size=100)
+
+        assert [subject for subject, _ in rows] == [f"City {i:06d}" for i in range(1050)]
+        assert smw_stub.requests == 1 + 11
+
+
+class TestCount:
+    """Test cases for AskEndpoint.count."""
+
+    def test_count_is_cached(self, smw_stub):
+        """Test that counts are reused, also for queries with other printouts."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        assert endpoint.count("[[Category:City]]|?Population") == 100
+        assert endpoint.count("[[Category:City]]", limit=5, sort="Population") == 100
+        assert smw_stub.requests == 1
+        assert endpoint.counts.stats.hits == 1
+
+        smw_stub.total_rows = 120
+        assert endpoint.count("[[Category:City]]", use_cache=False) == 120
+        assert endpoint.count("[[Category:City]]") == 120
+        assert smw_stub.requests == 2
+
+    def test_bypasses_client_cache(self, smw_stub):
+        """Test that use_cache=False also bypasses the client's response cache."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url, cache=MemoryCache()))
+
+        assert endpoint.count("[[Category:City]]") == 100
+        smw_stub.total_rows = 90
+        assert endpoint.count("[[Category:City]]", use_cache=False) == 90
+        assert smw_stub.requests == 2
+
+    def test_cache_disabled(self, smw_stub):
+        """Test that a TTL of zero asks the wiki every time."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url), count_ttl=0)
+
+        endpoint.count("[[Category:City]]")
+        endpoint.count("[[Category:City]]")
+
+        assert smw_stub.requests == 2
+        assert len(endpoint.counts) == 0
+
+
+class TestAskMany:
+    """Test cases for AskEndpoint.ask_many."""
+
+    def test_results_in_input_order(self, smw_stub):
+        """Test that outcomes follow the order of the queries."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+        queries = [f"[[Category:City]]|?Population|offset={offset}" for offset in (40, 0, 20)]
+
+        outcomes = endpoint.ask_many(queries, limit=5)
+
+        assert [outcome.query for outcome in outcomes] == queries
+        assert [next(iter(outcome.result()["query"]["results"])) for outcome in outcomes] == [
+            "City 000040",
+            "City 000000",
+            "City 000020",
+        ]
+
+    def test_errors_are_isolated(self, smw_stub):
+        """Test that a failing query does not affect the others."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+        outcomes = endpoint.ask_many(["[[Category:City]]", "", QueryBuilder().add_conditions("Category:City")])
+
+        assert [outcome.ok for outcome in outcomes] == [True, False, True]
+        assert isinstance(outcomes[1].error, SMWValidationError)
+        assert outcomes[1].response is None
+        with pytest.raises(SMWValidationError):
+            outcomes[1].result()
+
+    def test_duplicates_are_sent_once(self, smw_stub):
+        """Test that a query given several times is sent once, without a cache, and answered at every position."""
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url, coalesce=False))
+        queries = ["[[Category:City]]|offset=5", "[[Category:City]]", "[[Category:City]]|offset=5"]
+
+        outcomes = endpoint.ask_many(queries, limit=1)
+
+        assert [outcome.query for outcome in outcomes] == queries
+        assert outcomes[0] is outcomes[2]
+        assert smw_stub.requests == 2
+
+    def test_runs_concurrently(self, smw_stub):
+        """Test that the total latency is close to that of a single query."""
+        smw_stub.latency = 0.2
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+        queries = [f"[[Category:City]]|offset={offset}" for offset in range(10)]
+
+        start = time.perf_counter()
+        outcomes = endpoint.ask_many(queries, max_concurrency=10, limit=1)
+        elapsed = time.perf_counter() - start
+
+        assert all(outcome.ok for outcome in outcomes)
+        assert elapsed < 1.0
+
+    def test_invalid_concurrency(self):
+        """Test that max_concurrency must be positive."""
+        with pytest.raises(SMWValidationError):
+            AskEndpoint(Mock()).ask_many(["[[Category:City]]"], max_concurrency=0)
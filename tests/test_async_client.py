@@ -0,0 +1,206 @@
+"""Tests for the asyncio SMW client, ask endpoint and HTTP transports."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from smw_reader.async_client import AsyncSMWClient
+from smw_reader.endpoints.async_ask import AsyncAskEndpoint
+from smw_reader.exceptions import SMWAPIError, SMWConnectionError, SMWServerError, SMWValidationError
+
+
+@pytest.fixture
+def http_client():
+    """Create a mock async HTTP client."""
+    client = AsyncMock()
+    client.get.return_value = {"query": {"results": {}}}
+    return client
+
+
+class TestAsyncSMWClient:
+    """Test cases for AsyncSMWClient class."""
+
+    def test_init(self, http_client):
+        """Test AsyncSMWClient initialization."""
+        client = AsyncSMWClient("https://example.org/w", http_client=http_client, max_concurrency=5)
+
+        assert client.api_url == "https://example.org/w/api.php"
+        assert client.max_concurrency == 5
+
+    def test_invalid_concurrency(self, http_client):
+        """Test that the concurrency bound must be positive."""
+        with pytest.raises(SMWValidationError):
+            AsyncSMWClient("https://example.org/w/", http_client=http_client, max_concurrency=0)
+
+    @pytest.mark.asyncio
+    async def test_make_request_get(self, http_client):
+        """Test successful GET request."""
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client)
+
+        result = await client.make_request("ask", {"query": "[[Category:Test]]"})
+
+        assert result == {"query": {"results": {}}}
+        http_client.get.assert_awaited_once_with(
+            client.api_url, params={"action": "ask", "format": "json", "query": "[[Category:Test]]"}
+        )
+
+    @pytest.mark.asyncio
+    async def test_make_request_post(self, http_client):
+        """Test successful POST request."""
+        http_client.post.return_value = {"ok": True}
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client)
+
+        assert await client.make_request("ask", method="POST") == {"ok": True}
+
+    @pytest.mark.asyncio
+    async def test_make_request_api_error(self, http_client):
+        """Test handling of API error responses."""
+        http_client.get.return_value = {"error": {"code": "badquery", "info": "Invalid query syntax"}}
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client)
+
+        with pytest.raises(SMWAPIError, match="Invalid query syntax"):
+            await client.make_request("ask")
+
+    @pytest.mark.asyncio
+    async def test_make_request_wraps_exceptions(self, http_client):
+        """Test that transport exceptions are wrapped."""
+        http_client.get.side_effect = RuntimeError("Network error")
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client)
+
+        with pytest.raises(SMWAPIError, match="Request failed: Network error"):
+            await client.make_request("ask")
+
+    @pytest.mark.asyncio
+    async def test_unsupported_method(self, http_client):
+        """Test handling of unsupported HTTP methods."""
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client)
+
+        with pytest.raises(SMWValidationError, match="Unsupported HTTP method: PUT"):
+            await client.make_request("ask", method="PUT")
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than max_concurrency requests run at once."""
+        active = peak = 0
+
+        async def slow_get(url, params=None):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            return {}
+
+        http_client = AsyncMock()
+        http_client.get.side_effect = slow_get
+        client = AsyncSMWClient("https://example.org/w/", http_client=http_client, max_concurrency=3)
+
+        await asyncio.gather(*(client.make_request("ask") for _ in range(20)))
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_http_client(self, http_client):
+        """Test that leaving the context closes the transport."""
+        async with AsyncSMWClient("https://example.org/w/", http_client=http_client):
+            pass
+
+        http_client.close.assert_awaited_once()
+
+
+class TestAsyncAskEndpoint:
+    """Test cases for AsyncAskEndpoint class."""
+
+    @pytest.fixture
+    def ask_endpoint(self, http_client):
+        """Create an AsyncAskEndpoint instance for testing."""
+        return AsyncAskEndpoint(AsyncSMWClient("https://example.org/w/", http_client=http_client))
+
+    def test_endpoint_name(self, ask_endpoint):
+        """Test endpoint name property."""
+        assert ask_endpoint.endpoint_name == "ask"
+
+    @pytest.mark.asyncio
+    async def test_query_with_parameters(self, ask_endpoint, http_client):
+        """Test the query method with additional parameters."""
+        await ask_endpoint.query("[[Category:Test]]", limit=10, sort="Name")
+
+        params = http_client.get.call_args.kwargs["params"]
+        assert params["query"] == "[[Category:Test]]|limit=10|sort=Name"
+
+    @pytest.mark.asyncio
+    async def test_query_category(self, ask_endpoint, http_client):
+        """Test the query_category method with printouts."""
+        await ask_endpoint.query_category("Test", printouts=["Name", "?Age"])
+
+        assert http_client.get.call_args.kwargs["params"]["query"] == "[[Category:Test]]|?Name|?Age"
+
+    @pytest.mark.asyncio
+    async def test_empty_query_raises_error(self, ask_endpoint):
+        """Test that empty query raises validation error."""
+        with pytest.raises(SMWValidationError):
+            await ask_endpoint.execute(query="")
+
+    @pytest.mark.asyncio
+    async def test_iter_results(self, ask_endpoint, http_client):
+        """Test that iter_results follows the continuation offset."""
+        http_client.get.side_effect = [
+            {"query": {"results": {"A": {}, "B": {}}}, "query-continue-offset": 2},
+            {"query": {"results": {"C": {}}}},
+        ]
+
+        subjects = [subject async for subject, _ in ask_endpoint.iter_results("[[Category:Test]]", page_size=2)]
+
+        assert subjects == ["A", "B", "C"]
+
+
+@pytest.mark.parametrize("transport", ["aiohttp", "httpx"])
+class TestAsyncTransports:
+    """Test the aiohttp and httpx clients against a local api.php stand-in."""
+
+    @staticmethod
+    def _client(transport):
+        pytest.importorskip(transport)
+        from smw_reader.async_http_client import AiohttpHTTPClient, HttpxHTTPClient
+
+        return AiohttpHTTPClient(timeout=5.0) if transport == "aiohttp" else HttpxHTTPClient(timeout=5.0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_queries(self, transport, smw_stub):
+        """Test many concurrent ask queries over one client."""
+        async with AsyncSMWClient(smw_stub.base_url, http_client=self._client(transport), max_concurrency=8) as site:
+            ask = AsyncAskEndpoint(site)
+            results = await asyncio.gather(*(ask.query(f"[[C]]|limit=5|offset={i * 5}") for i in range(20)))
+
+        assert all(len(result["query"]["results"]) == 5 for result in results)
+        assert smw_stub.requests == 20
+
+    @pytest.mark.asyncio
+    async def test_post(self, transport, smw_stub):
+        """Test a POST request."""
+        async with AsyncSMWClient(smw_stub.base_url, http_client=self._client(transport)) as site:
+            result = await site.make_request("ask", {"query": "[[C]]|limit=2"}, method="POST")
+
+        assert len(result["query"]["results"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_http_error(self, transport, smw_stub):
+        """Test that HTTP error statuses raise SMWServerError."""
+        http_client = self._client(transport)
+        with pytest.raises(SMWServerError) as exc_info:
+            await http_client.get(smw_stub.base_url + "missing.php")
+        await http_client.close()
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_connection_error(self, transport, smw_stub):
+        """Test that connection failures raise SMWConnectionError."""
+        url = smw_stub.api_url
+        smw_stub.stop()
+        http_client = self._client(transport)
+
+        with pytest.raises(SMWConnectionError):
+            await http_client.get(url)
+        await http_client.close()
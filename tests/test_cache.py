@@ -0,0 +1,193 @@
+"""Tests for the response cache."""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from smw_reader.cache import CacheEntry, MemoryCache, SQLiteCache, cache_key
+
+
+def entry(value, ttl=60.0):
+    """Create a cache entry expiring ttl seconds from now."""
+    return CacheEntry({"value": value}, expires_at=time.time() + ttl)
+
+
+class TestCacheKey:
+    """Test cases for cache_key."""
+
+    def test_parameter_order_is_irrelevant(self):
+        """Test that keys do not depend on parameter order."""
+        assert cache_key("ask", {"query": "[[A]]", "format": "json"}) == cache_key(
+            "ask", {"format": "json", "query": "[[A]]"}
+        )
+
+    def test_values_are_normalized(self):
+        """Test that equivalent values produce equal keys."""
+        assert cache_key("ask", {"limit": 10, "query": " [[A]] "}) == cache_key(
+            "ask", {"limit": "10", "query": "[[A]]"}
+        )
+        assert cache_key("ask", {"query": "[[A]]", "offset": None}) == cache_key("ask", {"query": "[[A]]"})
+
+    def test_distinct_requests(self):
+        """Test that different requests produce different keys."""
+        assert cache_key("ask", {"query": "[[A]]"}) != cache_key("ask", {"query": "[[B]]"})
+        assert cache_key("ask") != cache_key("askargs")
+
+
+@pytest.mark.parametrize("make_cache", [lambda path: MemoryCache(), lambda path: SQLiteCache(path / "cache.sqlite")])
+def test_revalidations_from_threads(make_cache, tmp_path):
+    """Test that revalidations recorded by several threads are all counted."""
+    cache = make_cache(tmp_path)
+
+    def record():
+        for _ in range(1000):
+            cache.record_revalidation()
+
+    threads = [threading.Thread(target=record) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert cache.stats.revalidations == 4000
+
+
+class TestMemoryCache:
+    """Test cases for MemoryCache class."""
+
+    def test_invalid_maxsize(self):
+        """Test that the cache needs room for at least one entry."""
+        with pytest.raises(ValueError):
+            MemoryCache(maxsize=0)
+
+    def test_hit_and_miss(self):
+        """Test lookups and their counters."""
+        cache = MemoryCache()
+        cache.set("a", entry(1))
+
+        assert cache.get("a").response == {"value": 1}
+        assert cache.get("b") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.hit_rate == 0.5
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = MemoryCache(maxsize=2)
+        cache.set("a", entry(1))
+        cache.set("b", entry(2))
+        cache.get("a")
+        cache.set("c", entry(3))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+        assert cache.stats.evictions == 1
+        assert len(cache) == 2
+
+    def test_ttl_expiry(self):
+        """Test that stale entries are dropped on lookup."""
+        cache = MemoryCache()
+        cache.set("a", entry(1, ttl=-1))
+
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_delete_and_clear(self):
+        """Test removing entries."""
+        cache = MemoryCache()
+        cache.set("a", entry(1))
+        cache.set("b", entry(2))
+
+        assert cache.delete("a")
+        assert not cache.delete("a")
+        cache.clear()
+        assert len(cache) == 0
+
+
+class TestSQLiteCache:
+    """Test cases for SQLiteCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create an on-disk cache in a temporary directory."""
+        with SQLiteCache(tmp_path / "cache.sqlite") as cache:
+            yield cache
+
+    def test_round_trip(self, cache):
+        """Test storing and loading an entry with validators."""
+        cache.set("a", CacheEntry({"value": "ä"}, time.time() + 60, etag='"v1"', last_modified="Mon"))
+
+        loaded = cache.get("a")
+        assert loaded.response == {"value": "ä"}
+        assert (loaded.etag, loaded.last_modified) == ('"v1"', "Mon")
+        assert cache.get("b") is None
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    def test_wal_mode(self, cache, tmp_path):
+        """Test that the database is switched to write-ahead logging."""
+        cache.set("a", entry(1))
+
+        with sqlite3.connect(tmp_path / "cache.sqlite") as connection:
+            assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+
+    def test_shared_between_instances(self, cache, tmp_path):
+        """Test that entries are visible to another cache opened on the same file."""
+        cache.set("a", entry(1))
+
+        with SQLiteCache(tmp_path / "cache.sqlite") as other:
+            assert other.get("a").response == {"value": 1}
+
+    def test_stale_entry_without_validators_is_dropped(self, cache):
+        """Test that expired entries without validators fall back to the TTL."""
+        cache.set("a", entry(1, ttl=-1))
+
+        assert cache.get("a") is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_stale_entry_with_validators_is_kept(self, cache):
+        """Test that expired entries with validators are returned for revalidation."""
+        cache.set("a", CacheEntry({"value": 1}, time.time() - 1, etag='"v1"'))
+
+        stale = cache.get("a")
+        assert stale is not None
+        assert not stale.is_fresh
+        assert cache.stats.misses == 1
+
+    def test_prune(self, tmp_path):
+        """Test that expired entries and entries beyond max_entries are removed."""
+        with SQLiteCache(tmp_path / "cache.sqlite", max_entries=2) as cache:
+            cache.set("old", entry(0, ttl=-1))
+            for name in ("a", "b", "c"):
+                cache.set(name, entry(name))
+            cache.prune()
+
+            assert len(cache) == 2
+            assert cache.get("a") is None
+            assert cache.get("c") is not None
+            assert cache.stats.expirations == 1
+            assert cache.stats.evictions == 1
+
+    def test_threads(self, cache):
+        """Test that every thread can use the cache."""
+        threads = [threading.Thread(target=cache.set, args=(str(i), entry(i))) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(cache) == 4
+
+    def test_delete_and_clear(self, cache):
+        """Test removing entries."""
+        cache.set("a", entry(1))
+        cache.set("b", entry(2))
+
+        assert cache.delete("a")
+        assert not cache.delete("a")
+        cache.clear()
+        assert len(cache) == 0
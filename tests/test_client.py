@@ -1,12 +1,17 @@
 """Tests for SMW API client."""
 
+import threading
+import time
 from unittest.mock import Mock
 
 import pytest
 
+from smw_reader.cache import MemoryCache, SQLiteCache
 from smw_reader.client import SMWClient
 from smw_reader.endpoints.ask import AskEndpoint
-from smw_reader.exceptions import SMWAPIError, SMWValidationError
+from smw_reader.exceptions import SMWAPIError, SMWServerError, SMWValidationError
+from smw_reader.http_client import PooledHTTPClient
+from smw_reader.interfaces import HTTPClient
 
 
 class TestSMWClient:
@@ -143,3 +148,258 @@ class TestSMWClient:
 
         assert result == mock_response
         mock_http_client.get.assert_called_once_with(smw_client.api_url, params={"action": "ask", "format": "json"})
+
+    def test_lean_request_params(self):
+        """Test that lean mode asks for compact, UTF-8 responses without links."""
+        mock_http_client = Mock()
+        mock_http_client.get.return_value = {"query": {"results": {}}}
+        smw_client = SMWClient("https://example.org/w/", http_client=mock_http_client, lean=True)
+
+        smw_client.make_request("ask", {"query": "[[Category:Test]]|?Name"})
+        smw_client.make_request("ask", {"query": "[[Category:Test]]|link = subject"})
+        smw_client.make_request("smwbrowse", {"browse": "property"})
+
+        assert [call.kwargs["params"] for call in mock_http_client.get.call_args_list] == [
+            {
+                "action": "ask",
+                "format": "json",
+                "formatversion": "2",
+                "utf8": "1",
+                "query": "[[Category:Test]]|?Name|link=none",
+            },
+            {
+                "action": "ask",
+                "format": "json",
+                "formatversion": "2",
+                "utf8": "1",
+                "query": "[[Category:Test]]|link = subject",
+            },
+            {"action": "smwbrowse", "format": "json", "formatversion": "2", "utf8": "1", "browse": "property"},
+        ]
+
+    def test_lean_responses_are_cached_separately(self, smw_stub):
+        """Test that lean and regular clients sharing a cache do not share responses."""
+        cache = MemoryCache()
+        query = {"query": "[[Category:City]]|?Mayor|limit=1"}
+        smw_stub.total_rows = 1
+
+        regular = SMWClient(smw_stub.base_url, cache=cache).make_request("ask", query)
+        lean = SMWClient(smw_stub.base_url, cache=cache, lean=True).make_request("ask", query)
+
+        assert regular == lean
+        assert smw_stub.requests == 2
+        assert len(cache) == 2
+
+
+class TestSMWClientCache:
+    """Test cases for response caching in SMWClient."""
+
+    @pytest.fixture
+    def http_client(self):
+        """Create a mock HTTP client returning a fresh response per call."""
+        http_client = Mock()
+        http_client.get.side_effect = lambda url, params: {"query": {"results": {}}, "n": http_client.get.call_count}
+        http_client.conditional_get.side_effect = lambda url, **kwargs: HTTPClient.conditional_get(
+            http_client, url, **kwargs
+        )
+        return http_client
+
+    @pytest.fixture
+    def smw_client(self, http_client):
+        """Create an SMWClient with an in-memory cache."""
+        return SMWClient("https://example.org/w/", http_client=http_client, cache=MemoryCache(maxsize=4, ttl=60))
+
+    def test_repeated_request_is_cached(self, smw_client, http_client):
+        """Test that identical requests are answered from the cache."""
+        first = smw_client.make_request("ask", {"query": "[[Category:Test]]"})
+        second = smw_client.make_request("ask", {"query": "[[Category:Test]]"})
+
+        assert first == second
+        assert http_client.get.call_count == 1
+        assert smw_client.cache.stats.hits == 1
+        assert smw_client.cache.stats.misses == 1
+
+    def test_bypass_refreshes_entry(self, smw_client, http_client):
+        """Test that use_cache=False fetches again and stores the new response."""
+        smw_client.make_request("ask", {"query": "[[A]]"})
+        fresh = smw_client.make_request("ask", {"query": "[[A]]"}, use_cache=False)
+
+        assert fresh["n"] == 2
+        assert smw_client.make_request("ask", {"query": "[[A]]"})["n"] == 2
+
+    def test_per_call_ttl(self, smw_client, http_client):
+        """Test that a per-call TTL overrides the default."""
+        smw_client.make_request("ask", {"query": "[[A]]"}, cache_ttl=-1)
+        smw_client.make_request("ask", {"query": "[[A]]"})
+
+        assert http_client.get.call_count == 2
+        assert smw_client.cache.stats.expirations == 1
+
+    def test_invalidate(self, smw_client, http_client):
+        """Test dropping a single cached response."""
+        smw_client.make_request("ask", {"query": "[[A]]"})
+
+        assert smw_client.invalidate_cache("ask", {"query": "[[A]]"})
+        smw_client.make_request("ask", {"query": "[[A]]"})
+        assert http_client.get.call_count == 2
+
+    def test_invalidate_lean(self, http_client):
+        """Test dropping a cached response of a lean client."""
+        smw_client = SMWClient("https://example.org/w/", http_client=http_client, cache=MemoryCache(), lean=True)
+        smw_client.make_request("ask", {"query": "[[A]]"})
+
+        assert smw_client.invalidate_cache("ask", {"query": "[[A]]"})
+        assert len(smw_client.cache) == 0
+        smw_client.make_request("ask", {"query": "[[A]]"})
+        assert http_client.get.call_count == 2
+
+    def test_post_is_not_cached(self, smw_client, http_client):
+        """Test that POST requests bypass the cache."""
+        http_client.post.return_value = {"ok": True}
+        smw_client.make_request("ask", {"query": "[[A]]"}, method="POST")
+        smw_client.make_request("ask", {"query": "[[A]]"}, method="POST")
+
+        assert http_client.post.call_count == 2
+        assert len(smw_client.cache) == 0
+
+    def test_errors_are_not_cached(self, smw_client, http_client):
+        """Test that API errors are raised and not stored."""
+        http_client.get.side_effect = [{"error": {"info": "boom"}}, {"ok": True}]
+
+        with pytest.raises(SMWAPIError):
+            smw_client.make_request("ask", {"query": "[[A]]"})
+        assert smw_client.make_request("ask", {"query": "[[A]]"}) == {"ok": True}
+
+    def test_without_cache(self, http_client):
+        """Test that invalidation is a no-op without a cache."""
+        client = SMWClient("https://example.org/w/", http_client=http_client)
+
+        assert not client.invalidate_cache("ask")
+
+
+class TestSMWClientRevalidation:
+    """Test cases for conditional revalidation of stale cache entries."""
+
+    @pytest.fixture
+    def smw_client(self, smw_stub, tmp_path):
+        """Create a client with an on-disk cache talking to a stub that sends ETags."""
+        smw_stub.etags = True
+        with PooledHTTPClient(timeout=5.0) as http_client, SQLiteCache(tmp_path / "cache.sqlite") as cache:
+            yield SMWClient(smw_stub.base_url, http_client=http_client, cache=cache)
+
+    def test_stale_entry_is_revalidated(self, smw_client, smw_stub):
+        """Test that an expired entry is confirmed with a 304 instead of being downloaded."""
+        first = smw_client.make_request("ask", {"query": "[[C]]|limit=5"}, cache_ttl=-1)
+        second = smw_client.make_request("ask", {"query": "[[C]]|limit=5"})
+        third = smw_client.make_request("ask", {"query": "[[C]]|limit=5"})
+
+        assert first == second == third
+        assert smw_stub.requests == 2
+        assert smw_stub.not_modified == 1
+        assert smw_client.cache.stats.revalidations == 1
+        assert smw_client.http_client.last_transfer.status == 304
+
+    def test_changed_response_replaces_entry(self, smw_client, smw_stub):
+        """Test that a changed response is downloaded and stored."""
+        smw_client.make_request("ask", {"query": "[[C]]|limit=5"}, cache_ttl=-1)
+        smw_stub.total_rows = 3
+        response = smw_client.make_request("ask", {"query": "[[C]]|limit=5"})
+
+        assert len(response["query"]["results"]) == 3
+        assert smw_stub.not_modified == 0
+        assert smw_client.cache.stats.revalidations == 0
+
+    def test_without_validators_falls_back_to_ttl(self, smw_client, smw_stub):
+        """Test that expired entries without validators are fetched unconditionally."""
+        smw_stub.etags = False
+        smw_client.make_request("ask", {"query": "[[C]]|limit=5"}, cache_ttl=-1)
+        smw_client.make_request("ask", {"query": "[[C]]|limit=5"})
+
+        assert smw_stub.requests == 2
+        assert smw_client.cache.stats.expirations == 1
+
+
+class TestSMWClientCoalescing:
+    """Test cases for single-flight coalescing of identical requests."""
+
+    @pytest.fixture
+    def release(self):
+        """Event that lets the blocked HTTP request finish."""
+        return threading.Event()
+
+    @pytest.fixture
+    def http_client(self, release):
+        """Create a mock HTTP client whose requests block until released."""
+        http_client = Mock()
+
+        def get(url, params):
+            assert release.wait(5)
+            if params["query"] == "[[Fail]]":
+                raise SMWServerError("HTTP 503")
+            return {"query": {"results": {}}, "n": http_client.get.call_count}
+
+        http_client.get.side_effect = get
+        return http_client
+
+    @staticmethod
+    def _run_concurrently(smw_client, release, query, callers=5):
+        """Issue identical requests from several threads and collect their outcomes."""
+        outcomes = []
+
+        def call():
+            try:
+                outcomes.append(smw_client.make_request("ask", {"query": query}))
+            except SMWAPIError as e:
+                outcomes.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 5
+        while smw_client.coalesced_requests < callers - 1 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_identical_requests_share_one_call(self, http_client, release):
+        """Test that concurrent identical requests send a single HTTP request."""
+        smw_client = SMWClient("https://example.org/w/", http_client=http_client)
+
+        outcomes = self._run_concurrently(smw_client, release, "[[A]]")
+
+        assert http_client.get.call_count == 1
+        assert smw_client.coalesced_requests == 4
+        assert all(outcome is outcomes[0] for outcome in outcomes)
+        assert smw_client._inflight == {}
+
+    def test_exception_is_shared(self, http_client, release):
+        """Test that every coalesced caller receives the failure."""
+        smw_client = SMWClient("https://example.org/w/", http_client=http_client)
+
+        outcomes = self._run_concurrently(smw_client, release, "[[Fail]]")
+
+        assert http_client.get.call_count == 1
+        assert len(outcomes) == 5
+        assert all(isinstance(outcome, SMWAPIError) for outcome in outcomes)
+
+    def test_sequential_requests_are_not_coalesced(self, http_client, release):
+        """Test that coalescing only applies to requests in flight at the same time."""
+        release.set()
+        smw_client = SMWClient("https://example.org/w/", http_client=http_client)
+
+        smw_client.make_request("ask", {"query": "[[A]]"})
+        smw_client.make_request("ask", {"query": "[[A]]"})
+
+        assert http_client.get.call_count == 2
+        assert smw_client.coalesced_requests == 0
+
+    def test_disabled(self, http_client, release):
+        """Test that coalesce=False sends every request."""
+        smw_client = SMWClient("https://example.org/w/", http_client=http_client, coalesce=False)
+
+        self._run_concurrently(smw_client, release, "[[A]]", callers=1)
+        smw_client.make_request("ask", {"query": "[[A]]"})
+
+        assert http_client.get.call_count == 2
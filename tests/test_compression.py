@@ -0,0 +1,73 @@
+"""Tests for response decompression."""
+
+import gzip
+import io
+import zlib
+
+import pytest
+
+from smw_reader.compression import ACCEPT_ENCODING, DECOMPRESSORS, DecodedStream
+from smw_reader.exceptions import SMWServerError
+
+BODY = b'{"query": {"results": {}}}' * 2000
+
+
+class TestDecodedStream:
+    """Test cases for DecodedStream class."""
+
+    def test_accept_encoding_lists_supported_codings(self):
+        """Test that the advertised codings match the available decoders."""
+        assert ACCEPT_ENCODING.startswith("gzip, deflate")
+        assert set(ACCEPT_ENCODING.split(", ")) == set(DECOMPRESSORS)
+
+    def test_identity(self):
+        """Test that uncompressed bodies are passed through."""
+        stream = DecodedStream(io.BytesIO(BODY), None)
+
+        assert stream.read() == BODY
+        assert stream.content_encoding == "identity"
+        assert stream.wire_bytes == stream.body_bytes == len(BODY)
+
+    def test_gzip(self):
+        """Test decoding a gzip body in small chunks."""
+        compressed = gzip.compress(BODY)
+        stream = DecodedStream(io.BytesIO(compressed), "gzip", chunk_size=100)
+
+        assert stream.read() == BODY
+        assert stream.wire_bytes == len(compressed)
+        assert stream.body_bytes == len(BODY)
+
+    @pytest.mark.parametrize("wbits", [zlib.MAX_WBITS, -zlib.MAX_WBITS])
+    def test_deflate_zlib_and_raw(self, wbits):
+        """Test that both zlib-wrapped and raw deflate bodies are accepted."""
+        compressor = zlib.compressobj(wbits=wbits)
+        compressed = compressor.compress(BODY) + compressor.flush()
+
+        assert DecodedStream(io.BytesIO(compressed), "Deflate").read() == BODY
+
+    def test_chained_codings(self):
+        """Test that stacked codings are undone in reverse order."""
+        compressed = gzip.compress(zlib.compress(BODY))
+
+        assert DecodedStream(io.BytesIO(compressed), "deflate, gzip").read() == BODY
+
+    def test_iteration_yields_chunks(self):
+        """Test that iterating produces the body incrementally."""
+        stream = DecodedStream(io.BytesIO(gzip.compress(BODY)), "gzip", chunk_size=64)
+
+        chunks = list(stream)
+
+        assert len(chunks) > 1
+        assert b"".join(chunks) == BODY
+
+    def test_unsupported_coding(self):
+        """Test that unknown codings are rejected."""
+        with pytest.raises(SMWServerError, match="Unsupported Content-Encoding: compress"):
+            DecodedStream(io.BytesIO(b""), "compress")
+
+    def test_corrupt_body(self):
+        """Test that undecodable bodies raise a server error."""
+        stream = DecodedStream(io.BytesIO(b"not gzip at all"), "gzip")
+
+        with pytest.raises(SMWServerError, match="Failed to decode gzip response"):
+            stream.read()
@@ -0,0 +1,143 @@
+"""Tests for the keep-alive connection pool."""
+
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from smw_reader.connection_pool import ConnectionPool, pool_key
+
+
+class TestPoolKey:
+    """Test cases for pool_key."""
+
+    def test_default_ports(self):
+        """Test that default ports are filled in per scheme."""
+        assert pool_key("http://example.org/w/api.php") == ("http", "example.org", 80)
+        assert pool_key("https://example.org/w/api.php") == ("https", "example.org", 443)
+
+    def test_explicit_port(self):
+        """Test that an explicit port is kept."""
+        assert pool_key("HTTP://Example.org:8080/api.php") == ("http", "example.org", 8080)
+
+    def test_unsupported_scheme(self):
+        """Test that non-HTTP URLs are rejected."""
+        with pytest.raises(ValueError):
+            pool_key("ftp://example.org/")
+
+
+class TestConnectionPool:
+    """Test cases for ConnectionPool class."""
+
+    key = ("http", "127.0.0.1", 8080)
+
+    def test_invalid_maxsize(self):
+        """Test that a pool needs room for at least one connection."""
+        with pytest.raises(ValueError):
+            ConnectionPool(maxsize=0)
+
+    def test_acquire_creates_connection(self):
+        """Test that an empty pool opens a new connection."""
+        pool = ConnectionPool(timeout=5.0)
+        connection, reused = pool.acquire(self.key)
+
+        assert not reused
+        assert connection.host == "127.0.0.1"
+        assert connection.port == 8080
+        assert connection.timeout == 5.0
+        assert pool.stats.created == 1
+
+    def test_release_and_reuse(self, monkeypatch):
+        """Test that a released connection is handed out again."""
+        monkeypatch.setattr("smw_reader.connection_pool._is_dropped", lambda conn: False)
+        pool = ConnectionPool()
+        connection, _ = pool.acquire(self.key)
+        pool.release(self.key, connection)
+
+        again, reused = pool.acquire(self.key)
+
+        assert reused
+        assert again is connection
+        assert pool.stats.reused == 1
+
+    def test_idle_connections_bounded_by_maxsize(self):
+        """Test that connections beyond maxsize are closed on release."""
+        pool = ConnectionPool(maxsize=2)
+        connections = [Mock() for _ in range(3)]
+        for connection in connections:
+            pool.release(self.key, connection)
+
+        assert pool.idle_count(self.key) == 2
+        assert pool.stats.discarded == 1
+        connections[2].close.assert_called_once()
+
+    def test_idle_timeout_expires_connections(self):
+        """Test that connections idle for too long are closed instead of reused."""
+        pool = ConnectionPool(idle_timeout=0.01)
+        stale = Mock()
+        pool.release(self.key, stale)
+        time.sleep(0.02)
+
+        connection, reused = pool.acquire(self.key)
+
+        assert not reused
+        assert connection is not stale
+        stale.close.assert_called_once()
+        assert pool.stats.expired == 1
+
+    def test_dropped_connection_not_reused(self, monkeypatch):
+        """Test that connections closed by the server are skipped."""
+        monkeypatch.setattr("smw_reader.connection_pool._is_dropped", lambda conn: conn.dropped)
+        pool = ConnectionPool()
+        healthy, dropped = Mock(dropped=False), Mock(dropped=True)
+        pool.release(self.key, healthy)
+        pool.release(self.key, dropped)
+
+        connection, reused = pool.acquire(self.key)
+
+        assert reused
+        assert connection is healthy
+        dropped.close.assert_called_once()
+
+    def test_close(self):
+        """Test that closing the pool closes idle connections and rejects new ones."""
+        pool = ConnectionPool()
+        idle = Mock()
+        pool.release(self.key, idle)
+
+        pool.close()
+        late = Mock()
+        pool.release(self.key, late)
+
+        idle.close.assert_called_once()
+        late.close.assert_called_once()
+        assert pool.idle_count() == 0
+
+    def test_concurrent_checkout_is_exclusive(self, monkeypatch):
+        """Test that a connection is never handed to two threads at once."""
+        monkeypatch.setattr("smw_reader.connection_pool._is_dropped", lambda conn: False)
+        pool = ConnectionPool(maxsize=4)
+        in_use: set[int] = set()
+        lock = threading.Lock()
+        errors: list[str] = []
+
+        def worker() -> None:
+            for _ in range(200):
+                connection, _ = pool.acquire(self.key)
+                with lock:
+                    if id(connection) in in_use:
+                        errors.append("shared connection")
+                    in_use.add(id(connection))
+                with lock:
+                    in_use.discard(id(connection))
+                pool.release(self.key, connection)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        assert pool.idle_count(self.key) <= 4
@@ -0,0 +1,174 @@
+"""Tests for batched export of ask queries."""
+
+import csv
+import json
+import sys
+
+import pytest
+from smw_stub import SMWStubServer
+
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.export import (
+    ArrowSink,
+    CSVSink,
+    JSONLinesSink,
+    ParquetSink,
+    arrow_schema,
+    export_pages,
+)
+from smw_reader.interfaces import ExportSink
+
+QUERY = "[[Category:City]]|?Population|?Country|?Founded|?Tags"
+
+
+@pytest.fixture
+def endpoint():
+    """An ask endpoint backed by a stub wiki with 250 results."""
+    with SMWStubServer(total_rows=250) as server:
+        yield AskEndpoint(SMWClient(server.base_url))
+
+
+class RecordingSink(ExportSink):
+    """Sink that keeps the batches it receives."""
+
+    def __init__(self, fail_on_write=False):
+        self.fail_on_write = fail_on_write
+        self.kinds = None
+        self.frames = []
+        self.closed = False
+
+    def open(self, kinds, multivalue):
+        self.kinds = dict(kinds)
+
+    def write(self, frame):
+        if self.fail_on_write:
+            raise RuntimeError("disk full")
+        self.frames.append(frame)
+
+    def close(self):
+        self.closed = True
+        return 0
+
+
+class TestExport:
+    """Test cases for AskEndpoint.export and export_pages."""
+
+    def test_batches(self, endpoint):
+        """Test that pages are regrouped into batches of the requested size."""
+        sink = RecordingSink()
+
+        stats = endpoint.export(QUERY, sink, batch_size=80, page_size=100)
+
+        assert sink.kinds == {"Population": "number", "Country": "page", "Founded": "date", "Tags": "text"}
+        assert [len(frame) for frame in sink.frames] == [80, 80, 80, 10]
+        assert stats.rows == 250
+        assert stats.batches == 4
+        assert sink.closed
+        assert sink.frames[3]["subject"].iloc[-1] == "City 000249"
+
+    def test_csv(self, endpoint, tmp_path):
+        """Test CSV output with joined multi-values and ISO dates."""
+        path = tmp_path / "cities.csv"
+
+        stats = endpoint.export(QUERY, CSVSink(path), batch_size=100, page_size=60)
+
+        with open(path, newline="", encoding="utf-8") as file:
+            rows = list(csv.reader(file))
+        assert rows[0] == ["subject", "Population", "Country", "Founded", "Tags"]
+        assert rows[1] == ["City 000000", "1000.0", "Germany", "2000-01-01T00:00:00Z", "tag-0; tag-0"]
+        assert len(rows) == 251
+        assert stats.bytes_written == path.stat().st_size
+
+    def test_json_lines(self, endpoint, tmp_path):
+        """Test JSON Lines output with the first value of each printout."""
+        path = tmp_path / "cities.jsonl"
+
+        endpoint.export(QUERY, JSONLinesSink(path), page_size=100, multivalue="first")
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 250
+        record = json.loads(lines[1])
+        assert record["subject"] == "City 000001"
+        assert record["Tags"] == "tag-1"
+        assert record["Founded"].startswith("2000-01-02T00:00:00")
+
+    def test_empty_result(self, tmp_path):
+        """Test that an empty result still produces a file with a header."""
+        path = tmp_path / "empty.csv"
+        page = {"query": {"printrequests": [], "results": []}}
+
+        stats = export_pages([page], CSVSink(path))
+
+        assert path.read_text(encoding="utf-8").strip() == "subject"
+        assert stats.rows == 0
+        assert stats.batches == 0
+
+    def test_sink_closed_on_error(self, endpoint):
+        """Test that the sink is closed when writing fails."""
+        sink = RecordingSink(fail_on_write=True)
+
+        with pytest.raises(RuntimeError, match="disk full"):
+            endpoint.export(QUERY, sink, page_size=100)
+
+        assert sink.closed
+
+    def test_invalid_batch_size(self):
+        """Test that a batch size below 1 is rejected."""
+        with pytest.raises(ValueError, match="batch_size"):
+            export_pages([], RecordingSink(), batch_size=0)
+
+
+class TestParquetSink:
+    """Test cases for the pyarrow-backed sinks."""
+
+    def test_row_groups(self, endpoint, tmp_path):
+        """Test that every batch becomes a row group with a typed schema."""
+        parquet = pytest.importorskip("pyarrow.parquet")
+        path = tmp_path / "cities.parquet"
+
+        endpoint.export(QUERY, ParquetSink(path), batch_size=100, page_size=100)
+
+        metadata = parquet.ParquetFile(path).metadata
+        assert metadata.num_rows == 250
+        assert metadata.num_row_groups == 3
+        table = parquet.read_table(path)
+        assert str(table.schema.field("Population").type) == "list<element: double>"
+        assert table.column("Tags")[0].as_py() == ["tag-0", "tag-0"]
+
+    @pytest.mark.parametrize(
+        "create",
+        [
+            lambda path: ParquetSink(path),
+            lambda path: ArrowSink(path),
+            lambda path: arrow_schema({"Population": "number"}, "list"),
+        ],
+        ids=["parquet", "arrow", "schema"],
+    )
+    def test_requires_pyarrow(self, tmp_path, monkeypatch, create):
+        """Test that a missing pyarrow is reported, with the extra that installs it, when a sink is created."""
+        monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+        with pytest.raises(ImportError, match=r"pyarrow is required .* pip install 'smw-reader\[parquet\]'"):
+            create(tmp_path / "cities.parquet")
+
+    @pytest.mark.parametrize(
+        ("multivalue", "population", "founded"),
+        [
+            ("list", "list<item: double>", "list<item: timestamp[us, tz=UTC]>"),
+            ("first", "double", "timestamp[us, tz=UTC]"),
+        ],
+    )
+    def test_arrow_schema(self, multivalue, population, founded):
+        """Test the Arrow types of the subject and printout columns."""
+        pytest.importorskip("pyarrow")
+
+        schema = arrow_schema({"Population": "number", "Founded": "date", "Active": "boolean"}, multivalue)
+
+        assert schema.names == ["subject", "Population", "Founded", "Active"]
+        assert [str(field.type) for field in schema] == [
+            "string",
+            population,
+            founded,
+            "list<item: bool>" if multivalue == "list" else "bool",
+        ]
@@ -0,0 +1,133 @@
+"""Tests for DataFrame conversion of ask results."""
+
+import gc
+
+import pandas as pd
+import pytest
+
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.frames import to_dataframe
+
+
+def printrequest(label, typeid):
+    """Build a printrequest entry of an ask response."""
+    return {"label": label, "key": label, "redi": "", "typeid": typeid, "mode": 1}
+
+
+@pytest.fixture
+def response():
+    """An ask response with typed, multi-valued and missing printouts."""
+    return {
+        "query": {
+            "printrequests": [
+                {"label": "", "key": "", "redi": "", "typeid": "_wpg", "mode": 2},
+                printrequest("Population", "_num"),
+                printrequest("Country", "_wpg"),
+                printrequest("Founded", "_dat"),
+                printrequest("Capital", "_boo"),
+                printrequest("Area", "_qty"),
+                printrequest("Tags", "_txt"),
+            ],
+            "results": {
+                "Berlin": {
+                    "printouts": {
+                        "Population": [3850809],
+                        "Country": [{"fulltext": "Germany", "namespace": 0}],
+                        "Founded": [{"timestamp": "-23673600", "raw": "1/1969/4/2"}],
+                        "Capital": ["t"],
+                        "Area": [{"value": 891.7, "unit": "km²"}],
+                        "Tags": ["big", "old"],
+                    },
+                    "fulltext": "Berlin",
+                },
+                "Atlantis": {
+                    "printouts": {"Population": [], "Country": [], "Founded": [], "Capital": ["f"], "Area": []},
+                    "fulltext": "Atlantis",
+                },
+            },
+        }
+    }
+
+
+class TestToDataFrame:
+    """Test cases for to_dataframe."""
+
+    def test_typed_columns(self, response):
+        """Test that printouts become typed columns."""
+        frame = to_dataframe(response, multivalue="first")
+
+        assert list(frame.columns) == ["subject", "Population", "Country", "Founded", "Capital", "Area", "Tags"]
+        assert frame["Population"].dtype == "float64"
+        assert frame["Area"].dtype == "float64"
+        assert isinstance(frame["Founded"].dtype, pd.DatetimeTZDtype)
+        assert frame["Capital"].dtype == "boolean"
+        assert isinstance(frame["Country"].dtype, pd.StringDtype)
+
+        berlin, atlantis = frame.iloc[0], frame.iloc[1]
+        assert berlin["subject"] == "Berlin"
+        assert berlin["Population"] == 3850809
+        assert berlin["Country"] == "Germany"
+        assert berlin["Founded"] == pd.Timestamp("1969-04-02", tz="UTC")
+        assert berlin["Area"] == 891.7
+        assert berlin["Tags"] == "big"
+        assert bool(berlin["Capital"]) and not atlantis["Capital"]
+        assert pd.isna(atlantis["Population"]) and pd.isna(atlantis["Country"]) and pd.isna(atlantis["Tags"])
+
+    def test_list(self, response):
+        """Test that every cell holds the list of its values."""
+        frame = to_dataframe(response)
+
+        assert frame["Tags"].tolist() == [["big", "old"], []]
+        assert frame["Country"].tolist() == [["Germany"], []]
+
+    def test_explode(self, response):
+        """Test that multi-valued printouts get one row per value."""
+        frame = to_dataframe(response, multivalue="explode")
+
+        assert frame["subject"].tolist() == ["Berlin", "Berlin", "Atlantis"]
+        assert frame["Tags"].tolist()[:2] == ["big", "old"]
+        assert frame["Population"].dtype == "float64"
+        assert frame["Capital"].dtype == "boolean"
+
+    def test_rows_infer_types(self, response):
+        """Test conversion of (subject, entry) pairs without printrequests."""
+        rows = list(response["query"]["results"].items())
+        frame = to_dataframe(rows, multivalue="first")
+
+        assert frame["Population"].dtype == "float64"
+        assert isinstance(frame["Founded"].dtype, pd.DatetimeTZDtype)
+        assert frame["Country"].tolist()[0] == "Germany"
+        assert frame["Area"].dtype == "float64"
+
+    def test_empty(self):
+        """Test that an empty result gives a frame with the printout columns."""
+        response = {"query": {"printrequests": [printrequest("Population", "_num")], "results": []}}
+        frame = to_dataframe(response, multivalue="explode")
+
+        assert list(frame.columns) == ["subject", "Population"]
+        assert len(frame) == 0
+
+    def test_pause_gc(self, response):
+        """Test that pausing the garbage collector does not change the frame and re-enables the collector."""
+        frame = to_dataframe(response, pause_gc=True)
+
+        pd.testing.assert_frame_equal(frame, to_dataframe(response))
+        assert gc.isenabled()
+
+    def test_invalid_multivalue(self, response):
+        """Test that unknown multivalue modes are rejected."""
+        with pytest.raises(ValueError):
+            to_dataframe(response, multivalue="all")
+
+
+def test_query_frame(smw_stub):
+    """Test fetching a query directly into a DataFrame."""
+    endpoint = AskEndpoint(SMWClient(smw_stub.base_url))
+
+    frame = endpoint.query_frame("[[Category:City]]|?Population|?Country|?Founded|?Tags", limit=20)
+
+    assert len(frame) == 20
+    assert frame["subject"].iloc[0] == "City 000000"
+    assert frame["Population"].iloc[0] == [1000]
+    assert frame["Tags"].iloc[1] == ["tag-1", "tag-1"]
@@ -1,16 +1,20 @@
 """Tests for SMW HTTP client."""
 
+import io
 import json
+import threading
 import urllib.error
 from unittest.mock import Mock, patch
 
 import pytest
 
+from smw_reader.connection_pool import pool_key
 from smw_reader.exceptions import (
     SMWConnectionError,
     SMWServerError,
 )
-from smw_reader.http_client import RequestsHTTPClient
+from smw_reader.http_client import PooledHTTPClient, RequestsHTTPClient, parse_json_object, parse_retry_after
+from smw_reader.json_decoding import DECODERS, get_decoder
 
 
 class TestRequestsHTTPClient:
@@ -116,8 +120,8 @@ class TestRequestsHTTPClient:
         mock_response.getcode.return_value = 200
         mock_urlopen.return_value.__enter__.return_value = mock_response
 
-        # The implementation wraps JSON decode errors as connection errors
-        with pytest.raises(SMWConnectionError) as exc_info:
+        # A malformed body is a server error, not a (retryable) connection error
+        with pytest.raises(SMWServerError) as exc_info:
             http_client.get("https://example.org/w/api.php")
 
         assert "Invalid JSON response" in str(exc_info.value)
@@ -165,3 +169,228 @@ class TestRequestsHTTPClient:
         args, kwargs = mock_urlopen.call_args
         request = args[0]
         assert request.get_method() == "POST"
+
+
+def fake_response(status, body, headers=None, reason="OK"):
+    """Create a stand-in for http.client.HTTPResponse serving the given body."""
+    stream = io.BytesIO(body)
+    response = Mock(status=status, reason=reason, will_close=False, length=None)
+    response.getheader.side_effect = lambda name, default=None: (headers or {}).get(name, default)
+    response.read1.side_effect = stream.read1
+    response.isclosed.side_effect = lambda: stream.tell() == len(body)
+    return response
+
+
+class TestPooledHTTPClient:
+    """Test cases for PooledHTTPClient against a local api.php stand-in."""
+
+    @pytest.fixture
+    def http_client(self):
+        """Create a PooledHTTPClient instance for testing."""
+        with PooledHTTPClient(timeout=5.0) as client:
+            yield client
+
+    @staticmethod
+    def _serve(http_client, response):
+        """Make the client's pool hand out a connection answering with the given response."""
+        connection = Mock()
+        connection.getresponse.return_value = response
+        http_client.pool.acquire = Mock(return_value=(connection, False))
+        return connection
+
+    def test_init(self, http_client):
+        """Test PooledHTTPClient initialization."""
+        assert http_client.timeout == 5.0
+        assert http_client.pool.maxsize == 10
+        assert http_client.pool.idle_timeout == 60.0
+
+    def test_get_reuses_connection(self, http_client, smw_stub):
+        """Test that consecutive requests share one keep-alive connection."""
+        for offset in (0, 50, 100):
+            result = http_client.get(smw_stub.api_url, params={"action": "ask", "query": f"[[C]]|offset={offset}"})
+            assert "results" in result["query"]
+
+        assert smw_stub.requests == 3
+        assert smw_stub.connections == 1
+        assert http_client.pool.stats.reused == 2
+
+    def test_compressed_response(self, http_client, smw_stub):
+        """Test that gzip is negotiated and the byte counts are reported."""
+        result = http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]|?Population|limit=50"})
+
+        assert len(result["query"]["results"]) == 50
+        stats = http_client.last_transfer
+        assert stats.status == 200
+        assert stats.content_encoding == "gzip"
+        assert stats.wire_bytes < stats.body_bytes
+        assert stats.compression_ratio > 1
+
+    def test_compression_disabled(self, smw_stub):
+        """Test that no Accept-Encoding is sent when compression is disabled."""
+        with PooledHTTPClient(compression=False) as client:
+            client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+            stats = client.last_transfer
+
+        assert stats.content_encoding == "identity"
+        assert stats.wire_bytes == stats.body_bytes
+
+    def test_last_transfer_is_per_thread(self, http_client, smw_stub):
+        """Test that byte counts of another thread's responses are not visible."""
+        thread = threading.Thread(target=http_client.get, args=(smw_stub.api_url, {"action": "ask", "query": "[[C]]"}))
+        thread.start()
+        thread.join()
+
+        assert http_client.last_transfer is None
+
+    def test_post_success(self, http_client, smw_stub):
+        """Test successful POST request."""
+        result = http_client.post(smw_stub.api_url, data={"action": "ask", "query": "[[C]]|limit=2"})
+
+        assert len(result["query"]["results"]) == 2
+
+    def test_conditional_get(self, http_client, smw_stub):
+        """Test that validators are returned and a matching ETag yields a not-modified result."""
+        smw_stub.etags = True
+        params = {"action": "ask", "query": "[[C]]|limit=2"}
+        first = http_client.conditional_get(smw_stub.api_url, params=params)
+        second = http_client.conditional_get(smw_stub.api_url, params=params, etag=first.etag)
+
+        assert len(first.data["query"]["results"]) == 2
+        assert first.etag
+        assert second.not_modified
+        assert second.etag == first.etag
+        assert smw_stub.not_modified == 1
+
+    def test_conditional_get_without_validators(self, http_client, smw_stub):
+        """Test that responses without validators are returned as usual."""
+        result = http_client.conditional_get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+        assert not result.not_modified
+        assert result.etag is None
+        assert result.last_modified is None
+
+    def test_get_stream(self, http_client, smw_stub):
+        """Test that the body is yielded in chunks and the connection is reused."""
+        smw_stub.total_rows = 500
+        smw_stub.compress = False
+        params = {"action": "ask", "query": "[[C]]|?Population|?Tags|limit=500"}
+        chunks = list(http_client.get_stream(smw_stub.api_url, params=params))
+
+        assert len(chunks) > 1
+        assert http_client.last_transfer.body_bytes == sum(map(len, chunks))
+        assert json.loads(b"".join(chunks)) == http_client.get(smw_stub.api_url, params=params)
+        assert smw_stub.connections == 1
+
+    def test_get_stream_closed_early(self, http_client, smw_stub):
+        """Test that abandoning a stream closes its connection instead of pooling it."""
+        stream = http_client.get_stream(smw_stub.api_url, params={"action": "ask", "query": "[[C]]|limit=500"})
+        next(stream)
+        stream.close()
+
+        assert http_client.pool.idle_count() == 0
+
+    def test_get_stream_http_error(self, http_client, smw_stub):
+        """Test that error statuses are raised when iteration starts."""
+        with pytest.raises(SMWServerError) as exc_info:
+            list(http_client.get_stream(smw_stub.base_url + "index.php"))
+
+        assert exc_info.value.status_code == 404
+
+    def test_server_closed_connection_is_replaced(self, http_client, smw_stub):
+        """Test that a keep-alive connection closed by the server is transparently replaced."""
+        http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+        key = pool_key(smw_stub.api_url)
+        connection, _ = http_client.pool.acquire(key)
+        connection.sock.close()
+        http_client.pool.release(key, connection)
+
+        result = http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+        assert "query" in result
+
+    def test_http_error(self, http_client):
+        """Test handling of HTTP errors."""
+        self._serve(http_client, fake_response(503, b"maintenance", reason="Service Unavailable"))
+
+        with pytest.raises(SMWServerError) as exc_info:
+            http_client.get("https://example.org/w/api.php")
+
+        assert exc_info.value.status_code == 503
+        assert "maintenance" in str(exc_info.value)
+
+    def test_retry_after(self, http_client):
+        """Test that the Retry-After header of an error response is kept."""
+        self._serve(http_client, fake_response(429, b"slow down", {"Retry-After": "7"}, reason="Too Many Requests"))
+
+        with pytest.raises(SMWServerError) as exc_info:
+            http_client.get("https://example.org/w/api.php")
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.retry_after == 7
+
+    def test_invalid_json_raises_server_error(self, http_client):
+        """Test that a non-JSON body is reported as a server error."""
+        self._serve(http_client, fake_response(200, b"<html>not json</html>"))
+
+        with pytest.raises(SMWServerError) as exc_info:
+            http_client.get("https://example.org/w/api.php")
+
+        assert "Invalid JSON response" in str(exc_info.value)
+
+    def test_custom_json_decoder(self, smw_stub):
+        """Test that response bodies are handed to the configured decoder as bytes."""
+        payloads = []
+
+        def decoder(payload):
+            payloads.append(payload)
+            return json.loads(payload)
+
+        with PooledHTTPClient(json_decoder=decoder) as http_client:
+            result = http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]|limit=5"})
+
+        assert len(result["query"]["results"]) == 5
+        assert isinstance(payloads[0], bytes | bytearray)
+
+    def test_connection_refused(self, http_client, smw_stub):
+        """Test handling of connection errors."""
+        url = smw_stub.api_url
+        smw_stub.stop()
+
+        with pytest.raises(SMWConnectionError):
+            http_client.get(url)
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [("120", 120.0), (" 3 ", 3.0), ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0), ("soon", None), (None, None)],
+)
+def test_parse_retry_after(value, seconds):
+    """Test parsing Retry-After values given as seconds or HTTP dates."""
+    assert parse_retry_after(value) == seconds
+
+
+class TestJSONDecoding:
+    """Test cases for the pluggable JSON decoders."""
+
+    @pytest.mark.parametrize("name", list(DECODERS))
+    @pytest.mark.parametrize("payload", [b'{"query": {"a": "\xc3\xa4"}}', bytearray(b'{"query": {"a": "\xc3\xa4"}}')])
+    def test_decoders_parse_bytes(self, name, payload):
+        """Test that every installed decoder parses bytes and bytearrays alike."""
+        assert parse_json_object(payload, get_decoder(name)) == {"query": {"a": "\u00e4"}}
+
+    @pytest.mark.parametrize("name", list(DECODERS))
+    @pytest.mark.parametrize("payload", [b"<html>", b"[1, 2]", b'{"a": "\xff"}'])
+    def test_decoders_reject_invalid(self, name, payload):
+        """Test that invalid documents raise SMWServerError whichever decoder is used."""
+        with pytest.raises(SMWServerError):
+            parse_json_object(payload, get_decoder(name))
+
+    def test_default_is_fastest_installed(self):
+        """Test that the standard library is the fallback."""
+        assert "json" in DECODERS
+        assert get_decoder() is next(iter(DECODERS.values()))
+
+    def test_unknown_decoder(self):
+        """Test that a decoder that is not installed is rejected."""
+        with pytest.raises(ValueError, match="not available"):
+            PooledHTTPClient(json_decoder="simdjson")
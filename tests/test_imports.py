@@ -0,0 +1,65 @@
+"""Tests for the lazy loading of the package's public names."""
+
+import subprocess
+import sys
+
+import pytest
+
+import smw_reader
+
+IMPORT_BUDGET_MS = 50
+"""Upper bound for the time ``import smw_reader`` may take, dependencies included."""
+
+HEAVY_MODULES = ["asyncio", "http.client", "sqlite3", "requests", "pandas", "aiohttp", "httpx", "importlib.metadata"]
+
+
+def _run(code: str, *options: str) -> subprocess.CompletedProcess[str]:
+    """Run Python code in a fresh interpreter."""
+    return subprocess.run([sys.executable, *options, "-c", code], capture_output=True, text=True, check=True)
+
+
+def _import_time_ms() -> float:
+    """Return the cumulative time of ``import smw_reader`` in a fresh interpreter, as reported by -X importtime."""
+    stderr = _run("import smw_reader", "-X", "importtime").stderr
+    for line in stderr.splitlines():
+        _, _, cumulative, name = (part.strip() for part in line.replace("|", ":", 2).split(":"))
+        if name == "smw_reader":
+            return int(cumulative) / 1000
+    raise AssertionError(f"smw_reader missing from the import time report:\n{stderr}")
+
+
+def test_import_loads_no_submodules():
+    """Test that importing the package loads only the exceptions."""
+    code = f"""
+import sys
+import smw_reader
+print(sorted(name for name in sys.modules if name.startswith("smw_reader")))
+print([name for name in {HEAVY_MODULES!r} if name in sys.modules])
+"""
+    loaded, heavy = _run(code).stdout.splitlines()
+
+    assert loaded == "['smw_reader', 'smw_reader.exceptions']"
+    assert heavy == "[]"
+
+
+def test_import_time_budget():
+    """Test that importing the package stays within its time budget."""
+    best = min(_import_time_ms() for _ in range(3))
+
+    assert best < IMPORT_BUDGET_MS, f"import smw_reader took {best:.1f} ms (budget {IMPORT_BUDGET_MS} ms)"
+
+
+def test_public_names_resolve():
+    """Test that every name in __all__ resolves and is cached on the package."""
+    for name in smw_reader.__all__:
+        value = getattr(smw_reader, name)
+        assert vars(smw_reader)[name] is value
+
+    assert set(smw_reader.__all__) <= set(dir(smw_reader))
+    assert smw_reader.__version__
+
+
+def test_unknown_attribute():
+    """Test that unknown names raise AttributeError."""
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        smw_reader.missing  # noqa: B018
@@ -0,0 +1,216 @@
+"""Tests for request timing events and metrics aggregation."""
+
+import math
+
+import pytest
+
+from smw_reader.cache import MemoryCache
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.exceptions import SMWServerError
+from smw_reader.http_client import PooledHTTPClient, RequestsHTTPClient
+from smw_reader.interfaces import RequestObserver
+from smw_reader.metrics import PHASES, Histogram, MetricsRecorder, RequestEvent
+from smw_reader.retry import RetryPolicy
+
+
+class EventLog(RequestObserver):
+    """Observer keeping all events."""
+
+    def __init__(self):
+        self.events = []
+
+    def record(self, event):
+        self.events.append(event)
+
+
+class TestHistogram:
+    """Test cases for Histogram."""
+
+    def test_buckets(self):
+        """Test that values fall into the first bucket whose bound they do not exceed."""
+        histogram = Histogram([1, 2, 4])
+        for value in [0.5, 1, 1.5, 3, 10]:
+            histogram.observe(value)
+
+        assert histogram.counts == [2, 1, 1, 1]
+        assert histogram.count == 5
+        assert histogram.sum == 16
+
+    def test_quantile_interpolates(self):
+        """Test that quantiles are interpolated linearly within a bucket."""
+        histogram = Histogram([1, 2, 4])
+        for value in [0.5, 1.5, 1.5, 3]:
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 1.5
+        assert histogram.quantile(1) == 4
+        assert histogram.quantile(0.25) == 1
+
+    def test_quantile_overflow_and_empty(self):
+        """Test the quantile of the overflow bucket and of an empty histogram."""
+        histogram = Histogram([1, 2])
+        assert math.isnan(histogram.quantile(0.5))
+
+        histogram.observe(100)
+        assert histogram.quantile(0.99) == 2
+
+    @pytest.mark.parametrize("bounds", [[], [2, 1], [1, 1]])
+    def test_invalid_bounds(self, bounds):
+        """Test that bounds must be strictly ascending."""
+        with pytest.raises(ValueError):
+            Histogram(bounds)
+
+
+class TestMetricsRecorder:
+    """Test cases for MetricsRecorder."""
+
+    def test_aggregates_events(self):
+        """Test that events are counted by action and status."""
+        metrics = MetricsRecorder()
+        metrics.record(RequestEvent("ask", "GET", 200, total=0.2, ttfb=0.15, wire_bytes=2000))
+        metrics.record(RequestEvent("ask", "GET", 200, total=0.4, ttfb=0.3, retries=1))
+        metrics.record(RequestEvent("ask", "GET", None, total=0.01, error="SMWConnectionError"))
+
+        snapshot = metrics.snapshot()
+
+        assert snapshot["ask"]["requests"] == {"200": 2, "error": 1}
+        assert snapshot["ask"]["retries"] == 1
+        assert snapshot["ask"]["seconds"]["total"]["count"] == 3
+        assert set(snapshot["ask"]["seconds"]) == set(PHASES)
+        assert metrics.histogram("ask", "ttfb").count == 3
+        assert metrics.histogram("browse").count == 0
+
+    def test_prometheus_format(self):
+        """Test the text exposition of counters and cumulative buckets."""
+        metrics = MetricsRecorder(time_buckets=[0.1, 1])
+        metrics.record(RequestEvent("ask", "GET", 200, total=0.5))
+        metrics.record(RequestEvent("ask", "GET", 200, total=2))
+
+        text = metrics.to_prometheus()
+
+        assert 'smw_reader_requests_total{action="ask",status="200"} 2' in text
+        assert 'smw_reader_request_seconds_bucket{action="ask",phase="total",le="0.1"} 0' in text
+        assert 'smw_reader_request_seconds_bucket{action="ask",phase="total",le="1"} 1' in text
+        assert 'smw_reader_request_seconds_bucket{action="ask",phase="total",le="+Inf"} 2' in text
+        assert 'smw_reader_request_seconds_sum{action="ask",phase="total"} 2.5' in text
+        assert "# TYPE smw_reader_response_bytes histogram" in text
+
+    def test_prometheus_escapes_labels(self):
+        """Test that backslashes, quotes and newlines in label values are escaped."""
+        metrics = MetricsRecorder()
+        metrics.record(RequestEvent('a\\"b\nc', "GET", 200, total=0.5))
+
+        text = metrics.to_prometheus()
+
+        assert 'smw_reader_requests_total{action="a\\\\\\"b\\nc",status="200"} 1' in text
+
+    def test_reset(self):
+        """Test that reset discards all data."""
+        metrics = MetricsRecorder()
+        metrics.record(RequestEvent("ask", "GET", 200, total=0.5))
+
+        metrics.reset()
+
+        assert metrics.snapshot() == {}
+
+
+class TestSMWClientObservers:
+    """Test cases for the events SMWClient emits, against the stub server."""
+
+    def test_pooled_client_phases(self, smw_stub):
+        """Test that a request reports all phases and its sizes."""
+        log = EventLog()
+        client = SMWClient(smw_stub.base_url, observers=[log])
+
+        client.make_request("ask", {"query": "[[Category:City]]|limit=50"})
+
+        (event,) = log.events
+        assert (event.action, event.method, event.status, event.error) == ("ask", "GET", 200, None)
+        assert event.connect > 0
+        assert event.ttfb > 0
+        assert event.parse > 0
+        assert event.total >= event.connect + event.ttfb + event.read + event.decode + event.parse
+        assert 0 < event.wire_bytes < event.body_bytes
+
+    def test_reused_connection_has_no_connect_time(self, smw_stub):
+        """Test that only the first request pays for connecting."""
+        log = EventLog()
+        client = SMWClient(smw_stub.base_url, observers=[log])
+
+        for _ in range(2):
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert log.events[1].connect == 0
+
+    def test_requests_client(self, smw_stub):
+        """Test that RequestsHTTPClient reports its timings as well."""
+        log = EventLog()
+        client = SMWClient(smw_stub.base_url, http_client=RequestsHTTPClient(), observers=[log])
+
+        client.make_request("ask", {"query": "[[Category:City]]"})
+
+        (event,) = log.events
+        assert event.status == 200
+        assert event.ttfb > 0
+        assert event.body_bytes > 0
+
+    def test_error_event(self, smw_stub):
+        """Test that failed requests are reported with their status and error."""
+        log = EventLog()
+        client = SMWClient(smw_stub.base_url, observers=[log])
+        smw_stub.failures = [502]
+
+        with pytest.raises(SMWServerError):
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        (event,) = log.events
+        assert event.status == 502
+        assert event.error == "SMWServerError"
+
+    def test_retries_are_reported(self, smw_stub):
+        """Test that retries made by the HTTP client are part of the event."""
+        log = EventLog()
+        http_client = PooledHTTPClient(retry=RetryPolicy(backoff=0, jitter=False))
+        client = SMWClient(smw_stub.base_url, http_client=http_client, observers=[log])
+        smw_stub.failures = [502]
+
+        client.make_request("ask", {"query": "[[Category:City]]"})
+
+        (event,) = log.events
+        assert event.status == 200
+        assert event.retries == 1
+
+    def test_stream_request(self, smw_stub):
+        """Test that streamed requests are reported once the stream is read."""
+        log = EventLog()
+        client = SMWClient(smw_stub.base_url, observers=[log])
+
+        rows = list(AskEndpoint(client).query_stream("[[Category:City]]", limit=10))
+
+        assert len(rows) == 10
+        (event,) = log.events
+        assert event.status == 200
+        assert event.body_bytes > 0
+        assert event.error is None
+
+    def test_cache_hits_are_not_reported(self, smw_stub):
+        """Test that only requests reaching the server are reported."""
+        metrics = MetricsRecorder()
+        client = SMWClient(smw_stub.base_url, cache=MemoryCache(), observers=[metrics])
+
+        for _ in range(3):
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert metrics.snapshot()["ask"]["requests"] == {"200": 1}
+
+    def test_add_observer(self, smw_stub):
+        """Test that observers can be added after construction."""
+        client = SMWClient(smw_stub.base_url)
+        client.make_request("ask", {"query": "[[Category:City]]"})
+        log = EventLog()
+
+        client.add_observer(log)
+        client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert len(log.events) == 1
@@ -0,0 +1,113 @@
+"""Tests for the incremental SQLite mirror."""
+
+import pytest
+from smw_stub import MODIFIED_BASE
+
+from smw_reader.cache import MemoryCache
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.exceptions import SMWResultLimitWarning
+from smw_reader.mirror import SQLiteMirror
+
+QUERY = "[[Category:City]]|?Population|?Country"
+
+
+@pytest.fixture
+def mirror(smw_stub, tmp_path):
+    """A mirror backed by the stub wiki."""
+    with SQLiteMirror(AskEndpoint(SMWClient(smw_stub.base_url)), tmp_path / "mirror.sqlite") as mirror:
+        yield mirror
+
+
+def test_first_sync_is_full(smw_stub, mirror):
+    """Test that the first sync fetches all results and records the high-water mark."""
+    stats = mirror.sync(QUERY, page_size=40)
+
+    assert stats.full
+    assert (stats.fetched, stats.removed, stats.rows) == (100, 0, 100)
+    assert stats.high_water.timestamp() == MODIFIED_BASE + 99 * 60
+    assert mirror.high_water(QUERY) == stats.high_water
+    subject, entry = next(mirror.rows(QUERY))
+    assert subject == "City 000000"
+    assert entry["printouts"]["Population"] == [1000]
+    assert entry["printouts"]["Modification date"][0]["timestamp"] == str(MODIFIED_BASE)
+
+
+def test_incremental_sync_fetches_changes(smw_stub, mirror):
+    """Test that later syncs fetch only pages modified since the mark."""
+    mirror.sync(QUERY)
+    smw_stub.modified[5] = MODIFIED_BASE + 10_000
+    requests = smw_stub.requests
+
+    stats = mirror.sync(QUERY)
+
+    assert not stats.full
+    # The page at the previous mark is fetched again, since SMW's ">" is inclusive.
+    assert (stats.fetched, stats.removed, stats.rows) == (2, 0, 100)
+    assert stats.high_water.timestamp() == MODIFIED_BASE + 10_000
+    # One page of changes plus the count that confirms nothing was removed.
+    assert smw_stub.requests - requests == 2
+    assert dict(mirror.rows(QUERY))["City 000005"]["printouts"]["Modification date"][0]["timestamp"] == str(
+        MODIFIED_BASE + 10_000
+    )
+
+
+def test_incremental_sync_with_strict_comparators(smw_stub, tmp_path):
+    """Test that pages modified in the second of the mark are fetched on wikis with strict comparators."""
+    smw_stub.strict_comparators = True
+    ask = AskEndpoint(SMWClient(smw_stub.base_url), strict_comparators=True)
+    with SQLiteMirror(ask, tmp_path / "mirror.sqlite") as mirror:
+        mirror.sync(QUERY)
+        smw_stub.modified[5] = MODIFIED_BASE + 99 * 60
+
+        stats = mirror.sync(QUERY)
+
+    assert (stats.fetched, stats.rows) == (2, 100)
+
+
+def test_removed_pages_are_reconciled(smw_stub, mirror):
+    """Test that pages that no longer match are removed from the mirror."""
+    mirror.sync(QUERY)
+    smw_stub.removed.update({7, 42})
+
+    stats = mirror.sync(QUERY)
+
+    assert (stats.removed, stats.rows) == (2, 98)
+    assert {"City 000007", "City 000042"}.isdisjoint(subject for subject, _ in mirror.rows(QUERY))
+
+
+def test_removed_pages_are_reconciled_with_cache(smw_stub, tmp_path):
+    """Test that the count confirming the mirrored rows is not answered from the client's cache."""
+    ask = AskEndpoint(SMWClient(smw_stub.base_url, cache=MemoryCache()))
+    with SQLiteMirror(ask, tmp_path / "mirror.sqlite") as mirror:
+        mirror.sync(QUERY)
+        mirror.sync(QUERY)
+        smw_stub.removed.add(7)
+
+        stats = mirror.sync(QUERY)
+
+    assert (stats.removed, stats.rows) == (1, 99)
+
+
+def test_full_sync_after_forget(smw_stub, mirror):
+    """Test that a forgotten query is synced in full again."""
+    mirror.sync(QUERY)
+
+    assert mirror.forget(QUERY) == 100
+    assert mirror.high_water(QUERY) is None
+    assert mirror.sync(QUERY).full
+
+
+def test_truncated_sync_resumes_from_mark(smw_stub, mirror):
+    """Test that a sync cut off by the maximum offset neither loses nor removes pages."""
+    with pytest.warns(SMWResultLimitWarning):
+        stats = mirror.sync(QUERY, page_size=30, max_offset=60)
+    assert (stats.fetched, stats.rows) == (60, 60)
+
+    smw_stub.removed.add(0)
+    with pytest.warns(SMWResultLimitWarning):
+        stats = mirror.sync(QUERY, page_size=30, max_offset=60)
+
+    # The remaining pages are fetched from the mark on; the subject list is cut off, so nothing is removed.
+    assert (stats.removed, stats.rows) == (0, 100)
+    assert mirror.high_water(QUERY).timestamp() == MODIFIED_BASE + 99 * 60
@@ -0,0 +1,167 @@
+"""Tests for query partitioning."""
+
+import warnings
+
+import pytest
+
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.endpoints.query import QueryBuilder
+from smw_reader.exceptions import SMWResultLimitWarning, SMWValidationError
+from smw_reader.partition import _Range, partition_query
+
+CITIES = QueryBuilder().add_conditions("Category:City").add_printouts("Population")
+
+
+@pytest.fixture
+def ask(smw_stub):
+    """An ask endpoint for 230 cities on the stub wiki."""
+    smw_stub.total_rows = 230
+    return AskEndpoint(SMWClient(smw_stub.base_url))
+
+
+@pytest.mark.parametrize("key", ["Population", "Founded", None])
+def test_parts_are_disjoint_and_fit(ask, recwarn, key):
+    """Test that each part fits under the limit and the parts cover every result once."""
+    parts = partition_query(ask, CITIES, key=key, limit=50)
+
+    assert all(0 < part.count <= 50 for part in parts)
+    assert sum(part.count for part in parts) == 230
+    subjects = [subject for part in parts for subject, _ in ask.iter_results(part.query, page_size=50)]
+    assert sorted(subjects) == [f"City {index:06d}" for index in range(230)]
+    assert all(part.query.endswith("|?Population") for part in parts)
+    assert not recwarn.list
+
+
+def test_range_conditions(ask):
+    """Test the conditions of range parts."""
+    parts = partition_query(ask, CITIES, key="Population", limit=120)
+
+    # Populations run from 1000 to 2603 in steps of 7.
+    assert [part.conditions for part in parts] == [
+        "[[Population::>1000]][[Population::<1801.5]]",
+        "[[Population::>1801.5000000000002]][[Population::<2603]]",
+    ]
+    assert [part.count for part in parts] == [115, 115]
+
+
+@pytest.mark.parametrize(("case_sensitive", "characters"), [(False, 37), (True, 63)])
+def test_prefixes_skip_shared_characters(ask, smw_stub, case_sensitive, characters):
+    """Test that titles sharing a long prefix are split after it."""
+    parts = partition_query(ask, CITIES, limit=100, case_sensitive=case_sensitive)
+
+    assert [part.conditions for part in parts] == ["[[~City 0000*]]", "[[~City 0001*]]", "[[~City 0002*]]"]
+    # The total, the edges of the full set and one count per character of the alphabet; without case
+    # sensitivity, letters are tried in one case only.
+    assert smw_stub.requests == 3 + characters
+
+
+def test_prefixes_keep_lowercase(ask, smw_stub):
+    """Test that titles continuing with a lowercase letter are covered by default."""
+    smw_stub.total_rows = 20
+    smw_stub.titles = {i: f"Paris {'aB'[i % 2]}{i:02d}" for i in range(20)}
+
+    parts = partition_query(ask, CITIES, limit=10)
+
+    assert [(part.conditions, part.count) for part in parts] == [("[[~Paris B*]]", 10), ("[[~Paris a*]]", 10)]
+
+
+def test_prefixes_exclude_namespace(ask, smw_stub):
+    """Test that prefixes are taken from titles without their namespace."""
+    smw_stub.namespace = "Place"
+
+    parts = partition_query(ask, CITIES, limit=100)
+
+    assert [part.conditions for part in parts] == ["[[~City 0000*]]", "[[~City 0001*]]", "[[~City 0002*]]"]
+    assert sum(part.count for part in parts) == 230
+
+
+def test_strict_comparators(smw_stub):
+    """Test that range parts stay complete on a wiki whose comparators exclude the value itself."""
+    smw_stub.total_rows = 230
+    smw_stub.strict_comparators = True
+    ask = AskEndpoint(SMWClient(smw_stub.base_url), strict_comparators=True)
+
+    parts = partition_query(ask, CITIES, key="Population", limit=120)
+
+    assert [part.conditions for part in parts] == [
+        "[[Population::≥1000]][[Population::≤1801.5]]",
+        "[[Population::≥1801.5000000000002]][[Population::≤2603]]",
+    ]
+    assert sum(part.count for part in parts) == 230
+
+
+def test_fractions_between_whole_edges(ask, smw_stub, recwarn):
+    """Test that numbers between whole-numbered edges fall into a part."""
+    smw_stub.total_rows = 201
+
+    # Areas run from 0 to 100 in steps of 0.5.
+    parts = partition_query(ask, CITIES, key="Area", limit=50)
+
+    assert sum(part.count for part in parts) == 201
+    assert not recwarn.list
+
+
+def test_uncovered_values_are_explained(ask):
+    """Test that the warning names results without a value for the key."""
+    # 30 cities have no population; the full range holds the other 200, each half 100.
+    counts = {"[[Population::+]]": 200, "[[Population::>1000]][[Population::<2603]]": 200}
+    conditions = "[[Category:City]]"
+    ask.count = lambda query, **params: 230 if query == conditions else counts.get(query.removeprefix(conditions), 100)
+
+    with pytest.warns(SMWResultLimitWarning, match=r"30 of 230 .*: 30 have no value for the property\.$"):
+        parts = partition_query(ask, CITIES, key="Population", limit=150)
+
+    assert [part.count for part in parts] == [100, 100]
+
+
+def test_range_numbers_without_exponent():
+    """Test that large and small bounds are written in positional notation, which SMW parses."""
+    assert _Range("Area", 1e16, 2.5e-7, dates=False).conditions == ("[[Area::>10000000000000000]][[Area::<0.00000025]]")
+
+
+def test_query_within_limit(ask):
+    """Test that a query that fits is returned as a single part."""
+    parts = partition_query(ask, "[[Category:City]]|?Population", limit=500)
+
+    assert [(part.query, part.conditions, part.count) for part in parts] == [("[[Category:City]]|?Population", "", 230)]
+
+
+def test_titles_outside_alphabet_are_left_over(ask, smw_stub):
+    """Test that titles continuing with a character outside the alphabet fall into a leftover part."""
+    parts = partition_query(ask, CITIES, limit=100, alphabet="01")
+
+    assert sum(part.count for part in parts) == 230
+    assert [(part.conditions, part.count) for part in parts if "!~" in part.conditions] == [
+        ("[[~City 000*]][[!~City 0000*]][[!~City 0001*]]", 30)
+    ]
+
+
+def test_title_equal_to_prefix(ask, smw_stub):
+    """Test that a title equal to the prefix and titles continuing with punctuation are covered."""
+    smw_stub.total_rows = 27
+    smw_stub.titles = {i: f"Paris {'ABCDE'[i // 5]}{i % 5}" for i in range(25)}
+    smw_stub.titles.update({25: "Paris", 26: "Paris, Texas"})
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        parts = partition_query(ask, CITIES, limit=10)
+
+    assert sum(part.count for part in parts) == 27
+    assert "[[~Paris]]" in [part.conditions for part in parts]
+    rows = sorted(i for part in parts for i in smw_stub.matching(part.conditions))
+    assert rows == list(range(27))
+
+
+def test_key_without_numbers(ask):
+    """Test that only number and date properties can be split by range."""
+    with pytest.raises(SMWValidationError, match="neither numbers nor dates"):
+        partition_query(ask, CITIES, key="Country", limit=50)
+
+
+def test_fetch_partitioned(ask, smw_stub):
+    """Test that AskEndpoint.fetch_partitioned fetches result sets beyond the maximum offset."""
+    rows = ask.fetch_partitioned(CITIES, key="Population", page_size=40, max_offset=100)
+
+    assert [subject for subject, _ in rows] == [f"City {index:06d}" for index in range(230)]
+    assert rows[229][1]["printouts"]["Population"] == [1000 + 229 * 7]
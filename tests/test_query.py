@@ -2,7 +2,7 @@
 
 import pytest
 
-from smw_reader.endpoints.query import QueryBuilder
+from smw_reader.endpoints.query import QueryBuilder, QueryTemplate, add_printout, escape_value, split_query
 
 
 class TestQueryBuilder:
@@ -83,3 +83,90 @@ class TestQueryBuilder:
             .build()
         )
         assert query == "[[Category:Test]][[Status::Active]]"
+
+
+class TestQueryTemplate:
+    """Test cases for QueryTemplate."""
+
+    def test_bind(self):
+        """Test substituting values for placeholders."""
+        template = QueryTemplate("[[Category:City]][[Located in::{country}]]|?Population|limit={limit}")
+
+        assert template.fields == ("country", "limit")
+        assert (
+            template.bind(country="France", limit=50) == "[[Category:City]][[Located in::France]]|?Population|limit=50"
+        )
+        assert template.bind({"country": "Spain"}, limit=5).endswith("[[Located in::Spain]]|?Population|limit=5")
+
+    def test_from_builder(self):
+        """Test compiling a QueryBuilder with a placeholder value."""
+        template = (
+            QueryBuilder()
+            .add_conditions("Category:City", {"key": "Founded", "operator": ">", "value": "{year}"})
+            .add_printouts("Population")
+            .template()
+        )
+
+        assert template.bind(year=1900) == "[[Category:City]][[Founded::>1900]]|?Population"
+
+    def test_repeated_placeholder_and_literal_braces(self):
+        """Test placeholders used twice and doubled braces."""
+        template = QueryTemplate("[[A::{v}]] OR [[B::{v}]]|?{{x}}")
+
+        assert template.fields == ("v",)
+        assert template.bind(v=1) == "[[A::1]] OR [[B::1]]|?{x}"
+
+    def test_values_are_escaped(self):
+        """Test that bound values cannot change the query structure."""
+        template = QueryTemplate("[[Name::{name}]]|?Population")
+
+        query = template.bind(name="x]]|?Secret [[Category:Admin")
+
+        assert query == "[[Name::x&#93;&#93;&#124;?Secret &#91;&#91;Category:Admin]]|?Population"
+
+    @pytest.mark.parametrize(("value", "escaped"), [("!Berlin", "&#33;Berlin"), ("<5", "&#60;5"), ("a<b", "a<b")])
+    def test_leading_comparators_are_escaped(self, value, escaped):
+        """Test that a value cannot turn an equality into another comparison."""
+        assert escape_value(value) == escaped
+
+    def test_mismatched_values(self):
+        """Test that missing and unknown values are rejected."""
+        template = QueryTemplate("[[A::{a}]][[B::{b}]]")
+
+        with pytest.raises(ValueError, match="missing \\['b'\\]"):
+            template.bind(a=1)
+        with pytest.raises(ValueError, match="unknown \\['c'\\]"):
+            template.bind(a=1, b=2, c=3)
+
+    @pytest.mark.parametrize("text", ["[[A::{}]]", "[[A::{0}]]", "[[A::{a!r}]]", "[[A::{a:>5}]]", "[[A::{a]]"])
+    def test_invalid_placeholders(self, text):
+        """Test that malformed placeholders are rejected when compiling."""
+        with pytest.raises(ValueError):
+            QueryTemplate(text)
+
+    def test_hashable(self):
+        """Test that equal templates are interchangeable as keys."""
+        first = QueryTemplate("[[A::{a}]]")
+        second = QueryBuilder().add_conditions({"key": "A", "value": "{a}"}).template()
+
+        assert first == second
+        assert len({first, second}) == 1
+        assert {first: 1}[second] == 1
+
+
+def test_split_query():
+    """Test that conditions are split from printouts and parameters, also around disjunctions."""
+    assert split_query("[[Category:City]] [[Located in::France||Spain]]|?Population|limit=5") == (
+        "[[Category:City]] [[Located in::France||Spain]]",
+        "|?Population|limit=5",
+    )
+    assert split_query(" [[Category:City]] ") == ("[[Category:City]]", "")
+
+
+def test_add_printout():
+    """Test that a printout is added only if the query lacks an unlabelled one."""
+    assert add_printout("[[Category:City]]", "Population") == "[[Category:City]]|?Population"
+    assert add_printout("[[Category:City]]|?population", "Population") == "[[Category:City]]|?population"
+    assert add_printout("[[Category:City]]|?Population=Inhabitants", "Population") == (
+        "[[Category:City]]|?Population=Inhabitants|?Population"
+    )
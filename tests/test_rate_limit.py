@@ -0,0 +1,206 @@
+"""Tests for adaptive rate limiting."""
+
+import pytest
+
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.exceptions import SMWAPIError, SMWServerError
+from smw_reader.http_client import PooledHTTPClient
+from smw_reader.rate_limit import AdaptiveRateLimiter, is_throttled
+from smw_reader.retry import RetryPolicy
+
+
+class FakeClock:
+    """Manually advanced time source whose sleep advances the time."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """A fake clock."""
+    return FakeClock()
+
+
+def make_limiter(clock, **kwargs):
+    """Create a limiter driven by the fake clock."""
+    return AdaptiveRateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class TestAdaptiveRateLimiter:
+    """Test cases for AdaptiveRateLimiter."""
+
+    def test_burst_then_rate(self, clock):
+        """Test that a full bucket is drained at once and then refilled at the rate."""
+        limiter = make_limiter(clock, rate=2, burst=3)
+
+        waits = [limiter.acquire() for _ in range(5)]
+
+        assert waits == [0, 0, 0, 0.5, 0.5]
+        assert limiter.stats.requests == 5
+        assert limiter.stats.wait_time == 1.0
+
+    def test_success_ramps_up(self, clock):
+        """Test that successful requests raise the rate up to max_rate."""
+        limiter = make_limiter(clock, rate=1, max_rate=2, increase=0.4)
+
+        for _ in range(5):
+            limiter.record_success()
+
+        assert limiter.rate == 2
+
+    def test_throttle_backs_off(self, clock):
+        """Test that a throttled request lowers the rate and pauses for Retry-After."""
+        limiter = make_limiter(clock, rate=8, burst=1)
+        limiter.acquire()
+
+        limiter.record_throttle(retry_after=3)
+        waited = limiter.acquire()
+
+        assert limiter.rate == 4
+        assert waited == pytest.approx(3 + 1 / 4)
+        assert limiter.stats.throttled == 1
+
+    def test_backoff_without_retry_after_doubles(self, clock):
+        """Test the exponential pause when the server gives no Retry-After."""
+        limiter = make_limiter(clock, rate=1, min_rate=0.1, burst=1, backoff=1, max_backoff=3)
+        pauses = []
+        for _ in range(4):
+            start = clock.now
+            limiter.record_throttle()
+            pauses.append(limiter._paused_until - start)
+            clock.now = limiter._paused_until
+
+        assert pauses == [1, 2, 3, 3]
+
+    def test_concurrent_throttles_lower_rate_once(self, clock):
+        """Test that reports arriving during a pause do not lower the rate again."""
+        limiter = make_limiter(clock, rate=8)
+
+        for _ in range(4):
+            limiter.record_throttle(retry_after=2)
+
+        assert limiter.rate == 4
+        assert limiter.stats.throttled == 4
+
+    def test_min_rate(self, clock):
+        """Test that the rate does not drop below min_rate."""
+        limiter = make_limiter(clock, rate=1, min_rate=0.5)
+
+        for _ in range(3):
+            limiter.record_throttle(retry_after=0)
+            clock.now += 1
+
+        assert limiter.rate == 0.5
+
+    @pytest.mark.parametrize(
+        "kwargs",
+        [{"rate": 0}, {"burst": 0}, {"min_rate": 10, "max_rate": 5}, {"decrease": 1}],
+    )
+    def test_invalid_arguments(self, kwargs):
+        """Test that invalid settings are rejected."""
+        with pytest.raises(ValueError):
+            AdaptiveRateLimiter(**kwargs)
+
+
+@pytest.mark.parametrize(
+    ("error", "throttled"),
+    [
+        (SMWServerError("HTTP 429", status_code=429), True),
+        (SMWServerError("HTTP 503", status_code=503), True),
+        (SMWServerError("HTTP 500", status_code=500), False),
+        (SMWAPIError("API Error", response_data={"code": "maxlag", "lag": 7}), True),
+        (SMWAPIError("API Error", response_data={"code": "ratelimited"}), True),
+        (SMWAPIError("API Error", response_data={"code": "badvalue"}), False),
+    ],
+)
+def test_is_throttled(error, throttled):
+    """Test the classification of throttling errors."""
+    assert is_throttled(error) is throttled
+
+
+class TestSMWClientRateLimiting:
+    """Test cases for SMWClient with a rate limiter, against the stub server."""
+
+    @pytest.fixture
+    def limiter(self, clock):
+        """A limiter that does not actually sleep."""
+        return make_limiter(clock, rate=10, max_retries=2)
+
+    def test_sends_maxlag(self, smw_stub, limiter):
+        """Test that requests carry maxlag and lagged requests are retried."""
+        client = SMWClient(smw_stub.base_url, rate_limiter=limiter)
+        smw_stub.lag = 8.0
+
+        with pytest.raises(SMWAPIError) as exc_info:
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert exc_info.value.response_data["code"] == "maxlag"
+        assert smw_stub.requests == 3
+        assert limiter.stats.throttled == 3
+
+    def test_maxlag_waits_for_lag(self, smw_stub, clock):
+        """Test that a lagged request is sent again only after the reported lag."""
+        limiter = make_limiter(clock, rate=10, max_retries=1, backoff=1)
+        client = SMWClient(smw_stub.base_url, rate_limiter=limiter)
+        smw_stub.lag = 8.0
+
+        with pytest.raises(SMWAPIError) as exc_info:
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert exc_info.value.retry_after == 8.0
+        assert sum(clock.sleeps) >= 8
+
+    def test_retries_after_429(self, smw_stub, limiter, clock):
+        """Test that 429 responses are retried after the server's Retry-After."""
+        client = SMWClient(smw_stub.base_url, rate_limiter=limiter)
+        smw_stub.throttle = 2
+        smw_stub.retry_after = "4"
+
+        result = client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert "query" in result
+        assert smw_stub.requests == 3
+        assert limiter.stats.throttled == 2
+        assert sum(clock.sleeps) >= 4
+
+    def test_503_is_retried_by_the_limiter_only(self, smw_stub, limiter):
+        """Test that a persistent 503 is not retried by both the limiter and the HTTP client's retry policy."""
+        http_client = PooledHTTPClient(retry=RetryPolicy(backoff=0, jitter=False))
+        client = SMWClient(smw_stub.base_url, http_client=http_client, rate_limiter=limiter)
+        smw_stub.failures = [503] * 20
+
+        with pytest.raises(SMWServerError):
+            client.make_request("ask", {"query": "[[Category:City]]"})
+
+        assert smw_stub.requests == 3
+        assert limiter.stats.throttled == 3
+
+    def test_other_errors_are_not_retried(self, smw_stub, limiter):
+        """Test that errors other than throttling are raised at once."""
+        client = SMWClient(smw_stub.base_url, rate_limiter=limiter)
+
+        with pytest.raises(SMWAPIError):
+            client.make_request("nonexistent")
+
+        assert smw_stub.requests == 1
+        assert limiter.stats.throttled == 0
+
+    def test_stream_request(self, smw_stub, limiter):
+        """Test that streamed requests wait for the limiter and carry maxlag."""
+        smw_stub.lag = 3.0
+        endpoint = AskEndpoint(SMWClient(smw_stub.base_url, rate_limiter=limiter))
+
+        rows = list(endpoint.query_stream("[[Category:City]]", limit=10))
+
+        assert len(rows) == 10
+        assert limiter.stats.requests == 1
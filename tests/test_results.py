@@ -0,0 +1,89 @@
+"""Tests for the compact result model."""
+
+import pytest
+from smw_stub import make_row
+
+from smw_reader.client import SMWClient
+from smw_reader.endpoints.ask import AskEndpoint
+from smw_reader.results import DateValue, PageValue, QuantityValue, ResultRow, ResultSet
+
+PRINTOUTS = ["Population", "Country", "Founded", "Tags"]
+
+
+def response(rows, start=0, printouts=PRINTOUTS):
+    """Build an ask response with synthetic rows."""
+    return {"query": {"results": dict(make_row(index, printouts) for index in range(start, start + rows))}}
+
+
+class TestResultSet:
+    """Test cases for ResultSet."""
+
+    def test_typed_values(self):
+        """Test that serialized values are converted to their compact types."""
+        results = ResultSet([response(2)])
+
+        row = results[1]
+        assert isinstance(row, ResultRow)
+        assert row.subject == PageValue("City 000001")
+        assert row.subject.url == "https://wiki.example.org/wiki/City_000001"
+        assert row["Population"] == (1007,)
+        assert row.first("Country") == PageValue("France")
+        assert row.first("Country").exists is True
+        assert row.first("Founded") == DateValue(946771200)
+        assert row.first("Founded").datetime.year == 2000
+        assert row["Tags"] == ("tag-1", "tag-1")
+        assert list(row) == PRINTOUTS
+
+    def test_quantities_and_other_values(self):
+        """Test quantities and values without a compact form."""
+        entry = {"printouts": {"Area": [{"value": 891.8, "unit": "km²"}], "Flags": [True, {"other": 1}]}}
+
+        row = ResultSet([{"query": {"results": {"Berlin": entry}}}])[0]
+
+        assert row.first("Area") == QuantityValue(891.8, "km²")
+        assert row["Flags"] == (True, {"other": 1})
+        assert row.subject.title == "Berlin"
+
+    def test_repeated_values_are_shared(self):
+        """Test that equal pages and strings are stored once."""
+        results = ResultSet([response(20)])
+
+        germany = [row.first("Country") for row in results if row.first("Country").title == "Germany"]
+        assert len(germany) == 3
+        assert germany[0] is germany[1] is germany[2]
+        assert results[0]["Tags"][0] is results[3]["Tags"][0]
+        assert results[0]["Tags"] is results[15]["Tags"]
+        assert results.distinct_pages == 20 + 8
+
+    def test_columns_added_by_later_pages(self):
+        """Test that rows of earlier pages answer for columns that appear later."""
+        results = ResultSet([response(2, printouts=["Population"])])
+        results.add_response(response(2, start=2, printouts=["Population", "Tags"]))
+
+        assert list(results.columns) == ["Population", "Tags"]
+        assert results[0]["Tags"] == ()
+        assert results[0].first("Tags", "none") == "none"
+        assert results[3]["Tags"] == ("tag-0", "tag-3")
+        with pytest.raises(KeyError):
+            results[0]["Area"]
+
+    def test_empty_and_list_serialized_results(self):
+        """Test the other serializations of result sets."""
+        results = ResultSet([{"query": {"results": []}}, {"query": {"results": [{"fulltext": "A", "printouts": {}}]}}])
+
+        assert len(results) == 1
+        assert results[0].subject.title == "A"
+        assert len(results[0:5]) == 1
+
+
+def test_query_compact(smw_stub):
+    """Test that AskEndpoint.query_compact collects all pages."""
+    smw_stub.total_rows = 120
+    ask = AskEndpoint(SMWClient(smw_stub.base_url))
+
+    results = ask.query_compact("[[Category:City]]|?Population|?Country", page_size=50)
+
+    assert len(results) == 120
+    assert smw_stub.requests == 3
+    assert results[119].subject.title == "City 000119"
+    assert results[119].first("Population") == 1000 + 119 * 7
@@ -0,0 +1,170 @@
+"""Tests for retrying failed requests."""
+
+import urllib.error
+from email.message import Message
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from smw_reader.exceptions import SMWAPIError, SMWConnectionError, SMWServerError
+from smw_reader.http_client import PooledHTTPClient, RequestsHTTPClient
+from smw_reader.retry import RetryPolicy
+
+NO_WAIT = RetryPolicy(backoff=0, jitter=False)
+
+
+class TestRetryPolicy:
+    """Test cases for RetryPolicy."""
+
+    @pytest.mark.parametrize(
+        ("method", "error", "retryable"),
+        [
+            ("GET", SMWConnectionError("Connection error: reset"), True),
+            ("GET", SMWServerError("HTTP 502", status_code=502), True),
+            ("GET", SMWServerError("HTTP 503", status_code=503), False),
+            ("GET", SMWServerError("HTTP 404", status_code=404), False),
+            ("GET", SMWServerError("HTTP 429", status_code=429), False),
+            ("GET", SMWServerError("Invalid JSON response"), False),
+            ("GET", SMWAPIError("API Error: badvalue"), False),
+            ("POST", SMWConnectionError("Connection error: reset"), False),
+        ],
+    )
+    def test_classification(self, method, error, retryable):
+        """Test which errors are retried."""
+        assert RetryPolicy().is_retryable(method, error) is retryable
+
+    def test_exponential_delay(self):
+        """Test that delays double up to max_backoff."""
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+        assert [policy.delay(retry) for retry in range(5)] == [1, 2, 4, 5, 5]
+
+    def test_jitter(self):
+        """Test that jittered delays stay within the exponential bound."""
+        policy = RetryPolicy(backoff=1)
+
+        delays = [policy.delay(3) for _ in range(100)]
+
+        assert all(0 <= delay <= 8 for delay in delays)
+        assert len(set(delays)) > 1
+
+    def test_retry_after_is_lower_bound(self):
+        """Test that the server's Retry-After is honored."""
+        error = SMWServerError("HTTP 503", status_code=503, retry_after=10)
+
+        assert RetryPolicy(backoff=1).delay(0, error) == 10
+
+    def test_call_retries_until_success(self):
+        """Test that transient errors are retried and reported."""
+        outcomes = [SMWConnectionError("reset"), SMWServerError("HTTP 502", status_code=502), "ok"]
+        retries = []
+
+        def send():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        result = NO_WAIT.call("GET", send, on_retry=lambda retry, error, delay: retries.append(retry))
+
+        assert result == "ok"
+        assert retries == [1, 2]
+
+    def test_call_gives_up(self):
+        """Test that the last error is raised once max_retries is reached."""
+        calls = []
+
+        def send():
+            calls.append(1)
+            raise SMWServerError("HTTP 502", status_code=502)
+
+        with pytest.raises(SMWServerError):
+            RetryPolicy(max_retries=2, backoff=0).call("GET", send)
+
+        assert len(calls) == 3
+
+    def test_call_respects_max_elapsed(self):
+        """Test that no retry is started beyond the time budget."""
+        sleeps = []
+
+        def send():
+            raise SMWConnectionError("reset")
+
+        policy = RetryPolicy(max_retries=10, backoff=1, jitter=False, max_elapsed=5)
+        with pytest.raises(SMWConnectionError):
+            policy.call("GET", send, sleep=sleeps.append, clock=lambda: sum(sleeps))
+
+        assert sleeps == [1, 2]
+
+
+class TestHTTPClientRetries:
+    """Test cases for retries in the HTTP clients."""
+
+    def test_pooled_client_retries_502(self, smw_stub):
+        """Test that a bad gateway response is retried transparently."""
+        smw_stub.failures = [502, 504]
+        with PooledHTTPClient(retry=NO_WAIT) as http_client:
+            result = http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+            assert "query" in result
+            assert http_client.last_retries == 2
+        assert smw_stub.requests == 3
+
+    def test_pooled_client_fatal_error(self, smw_stub):
+        """Test that non-retryable statuses are raised at once."""
+        smw_stub.failures = [400]
+        with PooledHTTPClient(retry=NO_WAIT) as http_client, pytest.raises(SMWServerError):
+            http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+        assert smw_stub.requests == 1
+
+    def test_pooled_client_conditional_get(self, smw_stub):
+        """Test that conditional requests are retried as well."""
+        smw_stub.failures = [504]
+        with PooledHTTPClient(retry=NO_WAIT) as http_client:
+            result = http_client.conditional_get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+            assert result.data is not None
+            assert http_client.last_retries == 1
+
+    def test_without_policy(self, smw_stub):
+        """Test that failures are raised at once without a retry policy."""
+        smw_stub.failures = [502]
+        with PooledHTTPClient() as http_client, pytest.raises(SMWServerError):
+            http_client.get(smw_stub.api_url, params={"action": "ask", "query": "[[C]]"})
+
+    @patch("urllib.request.urlopen")
+    def test_requests_client_retries_url_error(self, mock_urlopen):
+        """Test that RequestsHTTPClient retries connection errors."""
+        mock_urlopen.side_effect = urllib.error.URLError("Connection reset")
+        http_client = RequestsHTTPClient(retry=RetryPolicy(max_retries=2, backoff=0))
+
+        with pytest.raises(SMWConnectionError):
+            http_client.get("https://example.org/w/api.php")
+
+        assert mock_urlopen.call_count == 3
+        assert http_client.last_retries == 2
+
+    @patch("urllib.request.urlopen")
+    def test_requests_client_does_not_retry_post(self, mock_urlopen):
+        """Test that POST requests are not retried by default."""
+        mock_urlopen.side_effect = urllib.error.HTTPError("https://example.org/w/api.php", 502, "Bad", Message(), None)
+        http_client = RequestsHTTPClient(retry=NO_WAIT)
+
+        with pytest.raises(SMWServerError):
+            http_client.post("https://example.org/w/api.php", data={"action": "ask"})
+
+        assert mock_urlopen.call_count == 1
+
+    @patch("urllib.request.urlopen")
+    def test_requests_client_does_not_retry_malformed_body(self, mock_urlopen):
+        """Test that a body that is not JSON fails at once instead of being retried as a connection error."""
+        response = MagicMock(status=200)
+        response.read.return_value = b"<html>Database error</html>"
+        mock_urlopen.return_value.__enter__.return_value = response
+        http_client = RequestsHTTPClient(retry=NO_WAIT)
+
+        with pytest.raises(SMWServerError, match="Invalid JSON"):
+            http_client.get("https://example.org/w/api.php")
+
+        assert mock_urlopen.call_count == 1
@@ -0,0 +1,82 @@
+"""Tests for incremental JSON parsing."""
+
+import json
+
+import pytest
+
+from smw_reader.exceptions import SMWServerError
+from smw_reader.streaming import JSONStream
+
+PATH = ("query", "results")
+
+
+def chunked(document, size=1):
+    """Serialize a document and split it into chunks of the given size."""
+    payload = json.dumps(document, ensure_ascii=False).encode("utf-8")
+    return [payload[i : i + size] for i in range(0, len(payload), size)]
+
+
+class TestJSONStream:
+    """Test cases for JSONStream class."""
+
+    @pytest.mark.parametrize("size", [1, 2, 7, 4096])
+    def test_object_members(self, size):
+        """Test that members are yielded regardless of how the body is split."""
+        results = {"Köln": {"printouts": {"Population": [1084831]}}, "Zürich": {"printouts": {"Population": [-1.5e3]}}}
+        document = {"query-continue-offset": 2, "query": {"printrequests": [], "results": results, "meta": {"n": 2}}}
+        stream = JSONStream(chunked(document, size), PATH)
+
+        assert dict(stream) == results
+        assert stream.document == {
+            "query-continue-offset": 2,
+            "query": {"printrequests": [], "results": {}, "meta": {"n": 2}},
+        }
+
+    def test_array_members(self):
+        """Test that array elements are yielded without a key."""
+        stream = JSONStream(chunked({"query": {"results": [{"a": 1}, 22, "x"]}}, 3), PATH)
+
+        assert list(stream) == [(None, {"a": 1}), (None, 22), (None, "x")]
+        assert stream.document == {"query": {"results": []}}
+
+    def test_number_split_across_chunks(self):
+        """Test that a number at a chunk boundary is not cut short."""
+        stream = JSONStream([b'{"query": {"results": [12', b"34]}}"], PATH)
+
+        assert list(stream) == [(None, 1234)]
+
+    def test_empty_and_missing_container(self):
+        """Test documents without members at the path."""
+        assert list(JSONStream(chunked({"query": {"results": []}}), PATH)) == []
+        stream = JSONStream(chunked({"error": {"code": "badvalue"}}), PATH)
+        assert list(stream) == []
+        assert stream.document == {"error": {"code": "badvalue"}}
+
+    def test_path_through_non_object(self):
+        """Test that a non-object on the path is kept as a plain value."""
+        stream = JSONStream(chunked({"query": [1, 2]}), PATH)
+
+        assert list(stream) == []
+        assert stream.document == {"query": [1, 2]}
+
+    def test_members_are_yielded_before_the_body_ends(self):
+        """Test that parsing keeps pace with the incoming chunks."""
+        received = []
+
+        def chunks():
+            yield b'{"query": {"results": {"A": 1, '
+            received.append("first")
+            yield b'"B": 2}}}'
+
+        stream = iter(JSONStream(chunks(), PATH))
+        assert next(stream) == ("A", 1)
+        assert received == []
+
+    @pytest.mark.parametrize(
+        "payload",
+        [b"[1, 2]", b'{"query": {"results": {"A": 1', b'{"query": {"results": {"A": 1}}} x', b'{"a" 1}', b"\xff"],
+    )
+    def test_invalid_json(self, payload):
+        """Test that malformed or truncated bodies raise a server error."""
+        with pytest.raises(SMWServerError):
+            list(JSONStream([payload], PATH))